@@ -1,23 +1,180 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from http import HTTPStatus
 
 from fastapi import FastAPI
-from fastapi.responses import HTMLResponse, FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse
 
-from api.control.routers import auth, users, todos, teams
+from sqlalchemy.orm import Session
+
+from api.control.bots.runtime import BotRuntime
+from api.control.database.database import (
+    dispose_engines,
+    get_async_engine,
+    get_engine,
+    get_replica_router,
+    warm_up_engine,
+)
+from api.control.graph.client import close_graph_client, get_graph_client
+from api.control.metrics.instrumentation import (
+    InstrumentationMiddleware,
+    instrument_engine,
+)
+from api.control.metrics.registry import registry
+from api.control.profiling.profiler import ProfilingMiddleware
+from api.control.responses.caching import get_response_cache
+from api.control.responses.responses import get_response_class
+from api.control.routers import (
+    auth,
+    bots,
+    documents,
+    metrics,
+    profiling,
+    users,
+    todos,
+    teams,
+)
 from api.control.schemas.utils_schemas import Message
+from api.control.security.identity_cache import get_identity_cache
+from api.control.settings.settings import get_settings
+from api.control.webhooks.queue import WebhookWorkerPool
 
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Engines, pools e clientes nascem aqui (ou no primeiro uso), não no
+    # import: cada worker monta os seus depois do fork
+    settings = get_settings()
+    replica_router = get_replica_router()
+    webhook_workers = None
+
+    if settings.METRICS_ENABLED:
+        for db_engine in (
+            get_engine(),
+            get_async_engine().sync_engine,
+            *(replica.sync_engine for replica in replica_router.engines),
+        ):
+            instrument_engine(db_engine)
+
+    if settings.DB_WARMUP:
+        try:
+            await warm_up_engine(settings.DB_WARMUP_TIMEOUT_SECONDS)
+        except Exception as e:
+            # Sobe mesmo assim: o pool tenta de novo na primeira requisição
+            logger.warning('Banco indisponível na partida: %r', e)
+
+    if settings.WEBHOOK_WORKERS > 0:
+        webhook_workers = WebhookWorkerPool(
+            lambda: Session(get_engine()),
+            get_graph_client,
+            teams.service_token,
+            workers=settings.WEBHOOK_WORKERS,
+            batch_size=settings.WEBHOOK_BATCH_SIZE,
+            poll_interval=settings.WEBHOOK_POLL_INTERVAL_SECONDS,
+            visibility_timeout=settings.WEBHOOK_VISIBILITY_TIMEOUT_SECONDS,
+            max_attempts=settings.WEBHOOK_MAX_ATTEMPTS,
+            backoff=settings.WEBHOOK_RETRY_BACKOFF_SECONDS,
+        )
+        webhook_workers.start()
+
+    app.state.bot_runtime = BotRuntime(
+        lambda: Session(get_engine()),
+        max_processes=settings.BOTS_MAX_PROCESSES,
+        poll_interval=settings.BOTS_POLL_INTERVAL_SECONDS,
+        lease=settings.BOTS_LEASE_SECONDS,
+    )
+    await app.state.bot_runtime.start()
+
+    stop_health_checks = asyncio.Event()
+    health_checks = None
+    if replica_router.engines:
+        health_checks = asyncio.create_task(
+            replica_router.run_health_checks(
+                settings.DB_REPLICA_HEALTH_CHECK_SECONDS, stop_health_checks
+            )
+        )
+
+    yield
+
+    if health_checks is not None:
+        stop_health_checks.set()
+        await health_checks
+
+    if webhook_workers is not None:
+        await webhook_workers.stop()
+    await app.state.bot_runtime.stop()
+    await close_graph_client()
+    await dispose_engines()
+    teams.close_token_manager()
+
+
+app = FastAPI(
+    lifespan=lifespan, default_response_class=get_response_class()
+)
+
+if get_settings().METRICS_ENABLED:
+    registry.callback(
+        'identity_cache_hits_total',
+        'Acertos do cache de identidade.',
+        'counter',
+        lambda: get_identity_cache().stats()['hits'],
+    )
+    registry.callback(
+        'identity_cache_misses_total',
+        'Faltas do cache de identidade.',
+        'counter',
+        lambda: get_identity_cache().stats()['misses'],
+    )
+    registry.callback(
+        'response_cache_hits_total',
+        'Listagens servidas do cache de respostas.',
+        'counter',
+        lambda: get_response_cache().stats()['hits'],
+    )
+    registry.callback(
+        'response_cache_misses_total',
+        'Listagens montadas com a query no banco.',
+        'counter',
+        lambda: get_response_cache().stats()['misses'],
+    )
+    registry.callback(
+        'response_not_modified_total',
+        'Listagens respondidas com 304 (If-None-Match).',
+        'counter',
+        lambda: get_response_cache().stats()['not_modified'],
+    )
+    registry.callback(
+        'response_cache_hit_ratio',
+        'Fração das listagens servidas sem a query (304 ou cache).',
+        'gauge',
+        lambda: get_response_cache().hit_ratio(),
+    )
+
+    app.add_middleware(InstrumentationMiddleware)
+    app.include_router(metrics.router)
 
 app.include_router(teams.router)
 app.include_router(users.router)
 app.include_router(auth.router)
 app.include_router(todos.router)
+app.include_router(profiling.router)
+app.include_router(documents.router)
+app.include_router(bots.router)
+
+# Só age com PROFILING_ENABLED e um token de administrador
+app.add_middleware(
+    ProfilingMiddleware,
+    is_enabled=profiling.profiling_enabled,
+    is_admin=profiling.is_profiling_admin,
+)
 
 @app.get("/", status_code=HTTPStatus.OK, response_model=Message)
 def read_root():
@@ -36,10 +193,3 @@ def render_page():
             </body>
         </html>
         """
-
-app.mount("/pdfs", StaticFiles(directory="api/bots/bot_boa_vindas/bot/pdf_output"), name="pdfs")
-
-@app.get("/pdf/{pdf_name}")
-def get_pdf(pdf_name: str):
-    pdf_path = f"api/pdf_output/{pdf_name}"
-    return FileResponse(pdf_path)
\ No newline at end of file
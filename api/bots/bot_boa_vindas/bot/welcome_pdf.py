@@ -0,0 +1,83 @@
+"""
+Bot de boas-vindas: gera o PDF de boas-vindas de um novo colaborador.
+
+Roda num processo do runtime de bots (`api/control/bots`), fora do
+caminho da requisição. O arquivo vai para `pdf_output`, servido em
+`/pdfs/{arquivo}`.
+"""
+import os
+import re
+import tempfile
+import unicodedata
+from pathlib import Path
+
+OUTPUT_DIR = Path(__file__).parent / 'pdf_output'
+
+
+def _escape(text: str) -> str:
+    return (
+        text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    )
+
+
+def render_pdf(lines: list[str]) -> bytes:
+    """PDF de uma página só com texto, em Helvetica."""
+    content = ['BT', '/F1 14 Tf', '18 TL', '72 770 Td']
+    content += [f'({_escape(line)}) Tj T*' for line in lines]
+    content.append('ET')
+    stream = '\n'.join(content).encode('cp1252', 'replace')
+
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842]'
+        b' /Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica'
+        b' /Encoding /WinAnsiEncoding >>',
+        b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream),
+    ]
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+
+    xref = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n' % (
+        len(objects) + 1,
+        xref,
+    )
+    output += b'%%EOF\n'
+    return bytes(output)
+
+
+def write_welcome_pdf(name: str, output_dir: Path) -> dict:
+    ascii_name = (
+        unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode()
+    )
+    slug = re.sub(r'[^a-z0-9]+', '-', ascii_name.lower()).strip('-')
+    filename = f'boas-vindas-{slug or "colaborador"}.pdf'
+    pdf = render_pdf([
+        f'Boas-vindas, {name}!',
+        '',
+        'Estamos felizes em ter você no time.',
+        'Seus acessos e o roteiro da primeira semana chegam pelo Teams.',
+    ])
+
+    # Grava e renomeia: quem baixa nunca vê um PDF pela metade
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=output_dir, suffix='.tmp', delete=False
+    ) as tmp:
+        tmp.write(pdf)
+    os.chmod(tmp.name, 0o644)
+    os.replace(tmp.name, output_dir / filename)
+
+    return {'file': filename, 'url': f'/pdfs/{filename}', 'size': len(pdf)}
+
+
+def run(name: str) -> dict:
+    return write_welcome_pdf(name, OUTPUT_DIR)
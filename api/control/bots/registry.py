@@ -0,0 +1,46 @@
+from typing import NamedTuple
+
+
+class BotSpec(NamedTuple):
+    name: str
+    # `modulo:funcao`, importado dentro do processo do bot
+    entry_point: str
+    max_concurrency: int = 1
+    # Segundos até o processo ser morto; None = sem limite
+    timeout: float | None = 300
+
+
+_bots: dict[str, BotSpec] = {}
+
+
+def register_bot(
+    name: str,
+    entry_point: str,
+    max_concurrency: int = 1,
+    timeout: float | None = 300,
+) -> BotSpec:
+    """
+    Registra um bot executável por `/bots/{name}/run`.
+
+    A função do `entry_point` recebe os `params` do job como argumentos
+    nomeados e devolve um dict serializável em JSON (vai para o banco).
+    """
+    spec = BotSpec(name, entry_point, max_concurrency, timeout)
+    _bots[name] = spec
+    return spec
+
+
+def get_bot(name: str) -> BotSpec | None:
+    return _bots.get(name)
+
+
+def list_bots() -> list[BotSpec]:
+    return sorted(_bots.values())
+
+
+register_bot(
+    'boas_vindas_pdf',
+    'api.bots.bot_boa_vindas.bot.welcome_pdf:run',
+    max_concurrency=2,
+    timeout=120,
+)
@@ -0,0 +1,257 @@
+import asyncio
+import importlib
+import logging
+import multiprocessing
+from collections.abc import Callable
+from datetime import timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from api.control.bots.registry import BotSpec
+from api.control.models.models import BotJob, BotJobStatus
+
+logger = logging.getLogger(__name__)
+
+# Chave do advisory lock que serializa a reserva de vagas entre processos
+BOT_SLOTS_LOCK = 0x626F7473
+
+LOST_JOB_ERROR = 'Bot runtime stopped renewing the job lease.'
+
+
+def run_entry_point(entry_point: str, params: dict, conn):
+    """Roda dentro do processo do bot e devolve (ok, resultado) pelo pipe."""
+    try:
+        module_name, _, function_name = entry_point.partition(':')
+        function = getattr(importlib.import_module(module_name), function_name)
+        conn.send((True, function(**params)))
+    except Exception as e:
+        conn.send((False, f'{type(e).__name__}: {e}'))
+    finally:
+        conn.close()
+
+
+def reap_stale_jobs(session: Session, lease: float) -> int:
+    """Marca como `failed` os jobs cujo runtime parou de renovar o lease."""
+    result = session.execute(
+        update(BotJob)
+        .where(
+            BotJob.status.in_((BotJobStatus.queued, BotJobStatus.running)),
+            func.coalesce(BotJob.heartbeat_at, BotJob.created_at)
+            < func.now() - timedelta(seconds=lease),
+        )
+        .values(
+            status=BotJobStatus.failed,
+            error=LOST_JOB_ERROR,
+            finished_at=func.now(),
+        )
+    )
+    return result.rowcount
+
+
+def claim_slot(
+    session: Session,
+    job_id: str,
+    spec: BotSpec,
+    max_processes: int,
+    lease: float,
+) -> bool:
+    """
+    Passa o job para `running` se houver vaga, contando os jobs `running`
+    de todos os processos em `bot_jobs` (os perdidos são liberados antes).
+
+    O advisory lock da transação faz a contagem e a troca de status
+    acontecerem sem outro processo no meio.
+    """
+    session.execute(select(func.pg_advisory_xact_lock(BOT_SLOTS_LOCK)))
+    reap_stale_jobs(session, lease)
+    running = dict(
+        session.execute(
+            select(BotJob.bot, func.count())
+            .where(BotJob.status == BotJobStatus.running)
+            .group_by(BotJob.bot)
+        ).all()
+    )
+
+    if (
+        sum(running.values()) >= max_processes
+        or running.get(spec.name, 0) >= spec.max_concurrency
+    ):
+        session.commit()
+        return False
+
+    result = session.execute(
+        update(BotJob)
+        .where(BotJob.id == job_id, BotJob.status == BotJobStatus.queued)
+        .values(
+            status=BotJobStatus.running,
+            started_at=func.now(),
+            heartbeat_at=func.now(),
+        )
+    )
+    session.commit()
+
+    if result.rowcount != 1:
+        raise RuntimeError('Job is no longer queued.')
+    return True
+
+
+def process_context():
+    # O forkserver já nasce com este módulo importado: cada job só faz um
+    # fork barato, sem herdar as threads e conexões do processo da API
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+class BotRuntime:
+    """
+    Executa jobs de bots em processos separados, fora do event loop.
+
+    Cada job ganha o próprio processo para que o `timeout` do bot possa
+    matá-lo de fato (um `ProcessPoolExecutor` não cancela uma tarefa já em
+    execução). Os limites valem para todos os workers da API: a vaga é
+    reservada em `bot_jobs` (`claim_slot`), até `max_processes` jobs
+    `running` no total e `max_concurrency` por bot; quem espera vaga fica
+    `queued` e tenta de novo a cada `poll_interval`.
+
+    Enquanto o job é dele, o runtime renova `heartbeat_at`. Jobs sem
+    renovação há mais de `lease` segundos (o worker morreu) viram `failed`
+    na partida e a cada reserva, e deixam de ocupar vaga.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        max_processes: int = 4,
+        poll_interval: float = 1.0,
+        lease: float = 60,
+    ):
+        self.session_factory = session_factory
+        self.max_processes = max_processes
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._tasks: set[asyncio.Task] = set()
+        self._context = process_context()
+
+    def _reap(self) -> int:
+        with self.session_factory() as session:
+            reaped = reap_stale_jobs(session, self.lease)
+            session.commit()
+        if reaped:
+            logger.warning('%s jobs de bots perdidos viraram failed', reaped)
+        return reaped
+
+    async def start(self):
+        """Libera as vagas de jobs deixados para trás por workers mortos."""
+        try:
+            await asyncio.to_thread(self._reap)
+        except Exception as e:
+            # A reserva de vaga tenta de novo; não impede a partida
+            logger.warning('Falha ao limpar jobs de bots: %r', e)
+
+    def submit(self, job_id: str, spec: BotSpec, params: dict):
+        task = asyncio.create_task(self._run_job(job_id, spec, params))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _update(self, job_id: str, **values):
+        with self.session_factory() as session:
+            session.execute(
+                update(BotJob).where(BotJob.id == job_id).values(**values)
+            )
+            session.commit()
+
+    async def _finish(self, job_id, status, result=None, error=None):
+        await asyncio.to_thread(
+            self._update,
+            job_id,
+            status=status,
+            result=result,
+            error=error,
+            finished_at=func.now(),
+        )
+
+    def _claim(self, job_id: str, spec: BotSpec) -> bool:
+        with self.session_factory() as session:
+            return claim_slot(
+                session, job_id, spec, self.max_processes, self.lease
+            )
+
+    async def _keep_alive(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                await asyncio.to_thread(
+                    self._update, job_id, heartbeat_at=func.now()
+                )
+            except Exception as e:
+                logger.warning('Falha ao renovar o job %s: %r', job_id, e)
+
+    async def _run_job(self, job_id: str, spec: BotSpec, params: dict):
+        keep_alive = asyncio.create_task(self._keep_alive(job_id))
+
+        try:
+            while not await asyncio.to_thread(self._claim, job_id, spec):
+                await asyncio.sleep(self.poll_interval)
+
+            status, result, error = await self._execute(spec, params)
+            await self._finish(job_id, status, result, error)
+        except asyncio.CancelledError:
+            await self._finish(
+                job_id, BotJobStatus.failed, error='Bot runtime stopped.'
+            )
+            raise
+        except Exception as e:
+            logger.exception('Erro ao executar o job %s', job_id)
+            await self._finish(job_id, BotJobStatus.failed, error=repr(e))
+        finally:
+            keep_alive.cancel()
+
+    async def _execute(self, spec: BotSpec, params: dict):
+        receiver, sender = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=run_entry_point,
+            args=(spec.entry_point, params, sender),
+            name=f'bot-{spec.name}',
+            daemon=True,
+        )
+        await asyncio.to_thread(process.start)
+        sender.close()
+
+        try:
+            # O pipe fica pronto com a resposta ou quando o processo morre
+            if not await asyncio.to_thread(receiver.poll, spec.timeout):
+                return (
+                    BotJobStatus.timed_out,
+                    None,
+                    f'Timed out after {spec.timeout} seconds.',
+                )
+
+            try:
+                ok, value = await asyncio.to_thread(receiver.recv)
+            except EOFError:
+                await asyncio.to_thread(process.join)
+                return (
+                    BotJobStatus.failed,
+                    None,
+                    f'Bot process exited with code {process.exitcode}.',
+                )
+
+            if ok:
+                return BotJobStatus.succeeded, value, None
+            return BotJobStatus.failed, None, value
+        finally:
+            if process.is_alive():
+                process.kill()
+            await asyncio.to_thread(process.join)
+            receiver.close()
+
+    async def stop(self):
+        """Cancela os jobs em andamento; os processos são mortos."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
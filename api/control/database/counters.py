@@ -0,0 +1,55 @@
+from collections import Counter
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.control.models.models import TodoCount, TodoState
+
+
+def state_changes(
+    added: Iterable[TodoState] = (), removed: Iterable[TodoState] = ()
+) -> Counter:
+    """Variação por estado: +1 para cada todo novo, -1 para cada removido."""
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    return deltas
+
+
+async def adjust_todo_counts(
+    session: AsyncSession, user_id: str, deltas: Counter
+):
+    """
+    Aplica `deltas` às contagens do usuário num único upsert, sem commit.
+
+    As linhas saem sempre na mesma ordem de estado, então duas escritas
+    concorrentes do mesmo usuário travam as contagens na mesma sequência.
+    """
+    values = [
+        {'user_id': user_id, 'state': state, 'count': delta}
+        for state, delta in sorted(deltas.items())
+        if delta
+    ]
+    if not values:
+        return
+
+    statement = insert(TodoCount).values(values)
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[TodoCount.user_id, TodoCount.state],
+            set_={'count': TodoCount.count + statement.excluded.count},
+        )
+    )
+
+
+async def get_todo_counts(
+    session: AsyncSession, user_id: str
+) -> dict[TodoState, int]:
+    """Contagem de todos os estados, com zero nos que não têm linha."""
+    rows = await session.execute(
+        select(TodoCount.state, TodoCount.count).where(
+            TodoCount.user_id == user_id
+        )
+    )
+    return {state: 0 for state in TodoState} | dict(rows.tuples().all())
@@ -1,11 +1,178 @@
-from sqlalchemy import create_engine
+import asyncio
+import os
+import threading
+
+from fastapi import Depends, Request
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session
 
-from api.control.settings.settings import Settings
+from api.control.database.replicas import ReplicaRouter
+from api.control.models.ids import set_id_generator
+from api.control.settings.settings import Settings, get_settings
+
+set_id_generator(get_settings().ID_GENERATOR)
+
+
+def pool_options(settings: Settings) -> dict:
+    """Parâmetros do pool de conexões, iguais para os dois engines."""
+    return {
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT_SECONDS,
+        'pool_recycle': settings.DB_POOL_RECYCLE_SECONDS,
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+    }
+
+
+# Engines criados no primeiro uso: importar o app não abre pool nenhum, e
+# cada worker (depois do fork) monta o seu
+_engines: dict = {}
+_engines_lock = threading.Lock()
+
+
+def _get_or_create(key: str, factory):
+    engine = _engines.get(key)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(key)
+            if engine is None:
+                engine = _engines[key] = factory(get_settings())
+    return engine
+
+
+def get_engine() -> Engine:
+    return _get_or_create(
+        'sync',
+        lambda settings: create_engine(
+            settings.DATABASE_URL, **pool_options(settings)
+        ),
+    )
+
+
+def get_async_engine() -> AsyncEngine:
+    # O dialeto psycopg usa a API assíncrona do driver com a mesma URL
+    return _get_or_create(
+        'async',
+        lambda settings: create_async_engine(
+            settings.DATABASE_URL, **pool_options(settings)
+        ),
+    )
+
+
+def get_replica_router() -> ReplicaRouter:
+    return _get_or_create(
+        'replicas',
+        lambda settings: ReplicaRouter(
+            [
+                create_async_engine(url, **pool_options(settings))
+                for url in settings.DATABASE_REPLICA_URLS
+            ],
+            retry_after=settings.DB_REPLICA_HEALTH_CHECK_SECONDS,
+        ),
+    )
+
+
+def _forget_engines_after_fork():
+    # O filho não pode usar (nem fechar) as conexões herdadas do pai: solta
+    # os pools sem fechar e cria engines novos no primeiro uso
+    for key, value in _engines.items():
+        if key == 'sync':
+            value.dispose(close=False)
+        elif key == 'async':
+            value.sync_engine.dispose(close=False)
+        else:
+            for replica in value.engines:
+                replica.sync_engine.dispose(close=False)
+    _engines.clear()
+    _engines_lock.release()
+
+
+# O lock fica preso durante o fork para o filho não herdá-lo no meio de
+# uma criação de engine
+os.register_at_fork(
+    before=_engines_lock.acquire,
+    after_in_parent=_engines_lock.release,
+    after_in_child=_forget_engines_after_fork,
+)
+
+
+async def warm_up_engine(timeout: float):
+    """Abre a primeira conexão do pool antes das requisições chegarem."""
+    async with asyncio.timeout(timeout):
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text('SELECT 1'))
+
+
+async def dispose_engines():
+    """Fecha os pools; um uso posterior cria engines novos."""
+    with _engines_lock:
+        engines = dict(_engines)
+        _engines.clear()
+
+    if 'sync' in engines:
+        engines['sync'].dispose()
+    if 'async' in engines:
+        await engines['async'].dispose()
+    if 'replicas' in engines:
+        await engines['replicas'].dispose()
+
+
+# Força a leitura no primário (ex.: logo depois de uma escrita)
+READ_YOUR_WRITES_HEADER = 'X-Read-Your-Writes'
 
-engine = create_engine(Settings().DATABASE_URL)
 
 # Fecha a session corretamente
 def get_session():  # pragma: no cover
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
+
+
+async def get_async_session():  # pragma: no cover
+    # Sem expirar no commit: a resposta usa os valores já em memória
+    async with AsyncSession(
+        get_async_engine(), expire_on_commit=False
+    ) as session:
+        yield session
+
+
+async def get_read_session(
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Session para rotas só de leitura: usa uma réplica quando houver.
+
+    Sem réplica saudável, ou com o header `X-Read-Your-Writes`, devolve a
+    mesma session do primário usada pelo resto da requisição.
+    """
+    router = get_replica_router()
+    engine = None
+    if not request.headers.get(READ_YOUR_WRITES_HEADER):
+        engine = router.pick()
+
+    if engine is None:
+        yield session
+        return
+
+    async with AsyncSession(engine) as replica_session:
+        # Conecta antes da rota: uma réplica fora do ar sai do rodízio e a
+        # requisição segue no primário em vez de virar 500
+        try:
+            await replica_session.connection()
+        except (InterfaceError, OperationalError):
+            router.mark_down(engine)
+        else:
+            try:
+                yield replica_session
+            except (InterfaceError, OperationalError):
+                router.mark_down(engine)
+                raise
+            return
+
+    yield session
@@ -0,0 +1,65 @@
+from base64 import b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import Select
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def encode_cursor(key: str) -> str:
+    return urlsafe_b64encode(key.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        raw = b64decode(cursor + padding, altchars=b'-_', validate=True)
+        return raw.decode()
+    except (BinasciiError, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Invalid cursor.'
+        )
+
+
+def paginate(
+    query: Select,
+    key: InstrumentedAttribute,
+    after: str | None = None,
+    offset: int | None = None,
+    limit: int | None = None,
+) -> Select:
+    """
+    Aplica a paginação à query, sempre ordenada pela chave indexada.
+
+    Com `after` usa keyset (`key > cursor`), que não descarta linhas das
+    páginas anteriores. Sem cursor mantém o modo offset. Quando há `limit`,
+    uma linha a mais é buscada para saber se existe próxima página.
+    """
+    query = query.order_by(key)
+
+    if after:
+        query = query.where(key > decode_cursor(after))
+    elif offset:
+        query = query.offset(offset)
+
+    if limit is not None:
+        query = query.limit(limit + 1)
+
+    return query
+
+
+def next_page(rows, key_name: str, limit: int | None):
+    """Corta a linha extra e devolve `(rows, next_cursor)`."""
+    rows = list(rows)
+
+    if limit is None:
+        return rows, None
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if not has_more or not rows:
+        return rows, None
+
+    return rows, encode_cursor(getattr(rows[-1], key_name))
@@ -0,0 +1,73 @@
+import asyncio
+import itertools
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRouter:
+    """
+    Distribui as leituras entre as réplicas em round-robin.
+
+    Uma réplica que falha (no health check ou numa requisição) sai do
+    rodízio por `retry_after` segundos. Sem réplica disponível `pick`
+    devolve None e a leitura vai para o primário.
+    """
+
+    def __init__(
+        self,
+        engines: list[AsyncEngine],
+        retry_after: float = 5,
+        check_timeout: float = 2,
+    ):
+        self.engines = list(engines)
+        self.retry_after = retry_after
+        self.check_timeout = check_timeout
+        self._down_until: dict[AsyncEngine, float] = {}
+        self._counter = itertools.count()
+
+    def pick(self) -> AsyncEngine | None:
+        now = time.monotonic()
+
+        for _ in self.engines:
+            engine = self.engines[next(self._counter) % len(self.engines)]
+            if self._down_until.get(engine, 0) <= now:
+                return engine
+
+        return None
+
+    def mark_down(self, engine: AsyncEngine):
+        logger.warning('Réplica %s fora do rodízio', engine.url)
+        self._down_until[engine] = time.monotonic() + self.retry_after
+
+    def mark_up(self, engine: AsyncEngine):
+        self._down_until.pop(engine, None)
+
+    async def check(self):
+        """Testa cada réplica com um `SELECT 1`."""
+        for engine in self.engines:
+            try:
+                async with asyncio.timeout(self.check_timeout):
+                    async with engine.connect() as conn:
+                        await conn.execute(text('SELECT 1'))
+            except Exception:
+                self.mark_down(engine)
+            else:
+                self.mark_up(engine)
+
+    async def run_health_checks(self, interval: float, stop: asyncio.Event):
+        while not stop.is_set():
+            await self.check()
+
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+            except TimeoutError:
+                pass
+
+    async def dispose(self):
+        for engine in self.engines:
+            await engine.dispose()
@@ -0,0 +1,57 @@
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.control.models.models import ChangeVersion, users_version_seq
+
+# Versão da listagem pública de usuários (`GET /users/`)
+USERS_KEY = 'users'
+
+
+def todos_key(user_id: str) -> str:
+    """Versão dos todos de um usuário (`GET /todos/`)."""
+    return f'todos:{user_id}'
+
+
+async def bump_version(session: AsyncSession, key: str):
+    """
+    Incrementa a versão de `key` na transação corrente, sem commit.
+
+    Chame junto da escrita, antes do commit: assim nenhuma leitura vê o
+    dado novo com a versão antiga.
+    """
+    await session.execute(
+        insert(ChangeVersion)
+        .values(key=key, version=1)
+        .on_conflict_do_update(
+            index_elements=[ChangeVersion.key],
+            set_={'version': ChangeVersion.version + 1},
+        )
+    )
+
+
+async def bump_users_version(session: AsyncSession):
+    """
+    Incrementa a versão de `USERS_KEY`. Chame depois do commit da escrita.
+
+    A versão é uma sequence, fora da transação: avançar antes do commit
+    deixaria uma leitura guardar a página antiga com a versão nova. Depois
+    do commit, quem leu a versão antiga e a página nova só guarda uma
+    página mais nova que o ETag, e o próximo `nextval` a descarta.
+    """
+    await session.execute(select(users_version_seq.next_value()))
+
+
+async def get_version(session: AsyncSession, key: str) -> int:
+    if key == USERS_KEY:
+        return await session.scalar(
+            text(
+                'SELECT CASE WHEN is_called THEN last_value ELSE 0 END'
+                f' FROM {users_version_seq.name}'
+            )
+        )
+
+    version = await session.scalar(
+        select(ChangeVersion.version).where(ChangeVersion.key == key)
+    )
+    return version or 0
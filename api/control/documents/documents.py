@@ -0,0 +1,319 @@
+import mimetypes
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from http import HTTPStatus
+from pathlib import Path
+from typing import NamedTuple
+
+import anyio
+from fastapi import HTTPException
+from starlette.responses import PlainTextResponse, Response
+
+# Tamanho de cada leitura quando o servidor não oferece sendfile
+CHUNK_SIZE = 64 * 1024
+
+
+class DocumentMeta(NamedTuple):
+    path: str
+    size: int
+    etag: str
+    last_modified: str
+    mtime: float
+    media_type: str
+
+
+class DocumentStore:
+    """
+    Resolve nomes de documentos dentro de `root`, com cache LRU dos metadados.
+
+    Numa entrada quente não há `stat()` nem `realpath()`: o caminho já
+    validado, o tamanho e o ETag vêm do cache. A entrada expira em `ttl`
+    segundos; antes disso, a `DocumentResponse` confere o arquivo aberto e
+    troca a entrada se o bot regerou o PDF.
+    """
+
+    def __init__(self, root: str, maxsize: int = 1024, ttl: float = 5):
+        self.root = Path(root).resolve()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[DocumentMeta, float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> DocumentMeta:
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(name)
+                return entry[0]
+
+        meta = self._load(name)
+        self.put(name, meta)
+        return meta
+
+    def put(self, name: str, meta: DocumentMeta):
+        with self._lock:
+            self._entries[name] = (meta, time.monotonic() + self.ttl)
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, name: str):
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self, name: str) -> DocumentMeta:
+        path = (self.root / name).resolve()
+
+        # `..` ou links simbólicos não podem sair da pasta de documentos
+        if not path.is_relative_to(self.root) or path == self.root:
+            raise not_found()
+
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            raise not_found()
+
+        if not stat.S_ISREG(stat_result.st_mode):
+            raise not_found()
+
+        return build_meta(str(path), stat_result)
+
+
+def document_etag(stat_result: os.stat_result) -> str:
+    return (
+        f'"{stat_result.st_ino:x}-{stat_result.st_mtime_ns:x}'
+        f'-{stat_result.st_size:x}"'
+    )
+
+
+def build_meta(path: str, stat_result: os.stat_result) -> DocumentMeta:
+    return DocumentMeta(
+        path=path,
+        size=stat_result.st_size,
+        etag=document_etag(stat_result),
+        last_modified=formatdate(stat_result.st_mtime, usegmt=True),
+        mtime=stat_result.st_mtime,
+        media_type=(
+            mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        ),
+    )
+
+
+def not_found() -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.NOT_FOUND, detail='Document not found.'
+    )
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """`If-None-Match` usa comparação fraca: ignora o prefixo `W/`."""
+    if header.strip() == '*':
+        return True
+
+    tags = (tag.strip().removeprefix('W/') for tag in header.split(','))
+    return etag in tags
+
+
+def not_modified(headers, meta: DocumentMeta) -> bool:
+    if_none_match = headers.get('if-none-match')
+    if if_none_match is not None:
+        return etag_matches(if_none_match, meta.etag)
+
+    if_modified_since = headers.get('if-modified-since')
+    if if_modified_since is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+    return int(meta.mtime) <= since
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Intervalo `bytes=` único, como (início, fim) inclusivo.
+
+    Devolve None para cabeçalhos que ignoramos (outra unidade, vários
+    intervalos ou sintaxe inválida): a resposta vira 200 com o arquivo
+    inteiro, o que a RFC 9110 permite. Levanta ValueError se o intervalo
+    for válido mas estiver fora do arquivo (416).
+    """
+    unit, _, spec = header.partition('=')
+    first, sep, last = spec.strip().partition('-')
+    valid = (
+        unit.strip().lower() == 'bytes'
+        and sep
+        and (first or last)
+        and (not first or first.isdigit())
+        and (not last or last.isdigit())
+    )
+    if not valid:
+        return None
+
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise ValueError('unsatisfiable range')
+        return max(size - suffix, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise ValueError('unsatisfiable range')
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+class DocumentResponse(Response):
+    """
+    Resposta de arquivo com ETag forte, 304, `Range`/206 e `Cache-Control`.
+
+    Usa `http.response.zerocopysend` (sendfile) quando o servidor ASGI
+    anuncia a extensão; senão lê o arquivo em blocos de `CHUNK_SIZE`.
+    """
+
+    def __init__(
+        self,
+        store: DocumentStore,
+        name: str,
+        meta: DocumentMeta,
+        cache_control: str,
+    ):
+        self.store = store
+        self.name = name
+        self.meta = meta
+        self.media_type = meta.media_type
+        self.background = None
+        self.init_headers({
+            'etag': meta.etag,
+            'last-modified': meta.last_modified,
+            'cache-control': cache_control,
+            'accept-ranges': 'bytes',
+        })
+
+    async def __call__(self, scope, receive, send):
+        request_headers = {
+            key.decode('latin-1'): value.decode('latin-1')
+            for key, value in scope['headers']
+        }
+
+        try:
+            file = await anyio.open_file(self.meta.path, 'rb')
+        except OSError:
+            # Apagado ainda dentro do TTL do cache
+            self.store.invalidate(self.name)
+            response = PlainTextResponse(
+                'Document not found.', status_code=HTTPStatus.NOT_FOUND
+            )
+            await response(scope, receive, send)
+            return
+
+        async with file:
+            meta = self._current_meta(file)
+            await self._respond(scope, send, request_headers, file, meta)
+
+    def _current_meta(self, file) -> DocumentMeta:
+        """
+        Confere o cache com o arquivo aberto: regerado dentro do TTL, o
+        documento ganha metadados novos a partir do `fstat` do descritor.
+        """
+        stat_result = os.fstat(file.wrapped.fileno())
+        if document_etag(stat_result) == self.meta.etag:
+            return self.meta
+
+        meta = build_meta(self.meta.path, stat_result)
+        self.store.put(self.name, meta)
+        self.headers['etag'] = meta.etag
+        self.headers['last-modified'] = meta.last_modified
+        return meta
+
+    async def _respond(  # noqa: PLR0913, PLR0917
+        self, scope, send, request_headers, file, meta: DocumentMeta
+    ):
+        if not_modified(request_headers, meta):
+            await self._send_head(send, HTTPStatus.NOT_MODIFIED)
+            return
+
+        start, end = 0, meta.size - 1
+        status = HTTPStatus.OK
+        range_header = request_headers.get('range')
+        if_range = request_headers.get('if-range')
+
+        # `If-Range` de outra versão (ou com data) manda o arquivo inteiro
+        if range_header and (if_range is None or if_range == meta.etag):
+            try:
+                requested = parse_range(range_header, meta.size)
+            except ValueError:
+                self.headers['content-range'] = f'bytes */{meta.size}'
+                await self._send_head(
+                    send, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+                )
+                return
+
+            if requested is not None:
+                start, end = requested
+                status = HTTPStatus.PARTIAL_CONTENT
+                self.headers['content-range'] = (
+                    f'bytes {start}-{end}/{meta.size}'
+                )
+
+        count = end - start + 1
+        self.headers['content-length'] = str(count)
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': self.raw_headers,
+        })
+
+        if scope['method'] == 'HEAD' or count <= 0:
+            await send({'type': 'http.response.body', 'body': b''})
+        elif 'http.response.zerocopysend' in scope.get('extensions', {}):
+            await send({
+                'type': 'http.response.zerocopysend',
+                'file': file.wrapped.fileno(),
+                'offset': start,
+                'count': count,
+            })
+        else:
+            await self._send_chunks(send, file, start, count)
+
+    async def _send_head(self, send, status: int):
+        # O 304 não descreve um corpo; o 416 tem corpo vazio
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.headers['content-length'] = '0'
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': self.raw_headers,
+        })
+        await send({'type': 'http.response.body', 'body': b''})
+
+    @staticmethod
+    async def _send_chunks(send, file, start: int, count: int):
+        await file.seek(start)
+        while count > 0:
+            chunk = await file.read(min(CHUNK_SIZE, count))
+            if not chunk:
+                # O arquivo encolheu durante o envio: o corpo fecha mesmo
+                # assim, curto, e o cliente vê o Content-Length incompleto
+                await send({'type': 'http.response.body', 'body': b''})
+                return
+            count -= len(chunk)
+            await send({
+                'type': 'http.response.body',
+                'body': chunk,
+                'more_body': count > 0,
+            })
@@ -0,0 +1,312 @@
+import asyncio
+import logging
+import random
+from http import HTTPStatus
+
+import httpx
+
+from api.control.settings.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+}
+
+# Máximo de requisições por chamada ao endpoint $batch do Graph
+GRAPH_BATCH_LIMIT = 20
+
+# Código de erro dos itens de um lote que não teve resposta (rede/timeout)
+TRANSPORT_ERROR_CODE = 'transportError'
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    HTTP2_AVAILABLE = False
+
+
+class GraphError(Exception):
+    """Resposta de erro do Microsoft Graph."""
+
+    def __init__(self, status_code: int, payload):
+        super().__init__(f'Graph API error {status_code}: {payload}')
+        self.status_code = status_code
+        self.payload = payload
+
+
+def _payload(response: httpx.Response):
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+class GraphClient:
+    """
+    Cliente assíncrono compartilhado para o Microsoft Graph.
+
+    Mantém um único `httpx.AsyncClient` (keep-alive e HTTP/2 quando o `h2`
+    está instalado), então as chamadas reaproveitam a conexão TLS. Respostas
+    429/503/504 são repetidas com backoff exponencial, respeitando o
+    `Retry-After` enviado pelo Graph.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        base_url: str = 'https://graph.microsoft.com/v1.0',
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        http2: bool = True,
+        max_connections: int = 100,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            http2=http2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+
+    def _retry_delay(self, response: httpx.Response | None, attempt: int):
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+
+        delay = self.backoff * 2**attempt
+        return min(delay + random.uniform(0, self.backoff), self.max_backoff)
+
+    async def request(
+        self, method: str, url: str, token: str, **kwargs
+    ) -> httpx.Response:
+        headers = {
+            'Authorization': token,
+            'Content-Type': 'application/json',
+            **kwargs.pop('headers', {}),
+        }
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = await self._client.request(
+                    method, url, headers=headers, **kwargs
+                )
+            except httpx.TransportError:
+                # Só repete erros de rede em leituras (idempotentes)
+                if method != 'GET' or attempt == self.max_retries:
+                    raise
+            else:
+                if (
+                    response.status_code not in RETRY_STATUSES
+                    or attempt == self.max_retries
+                ):
+                    return response
+
+            delay = self._retry_delay(response, attempt)
+            logger.warning(
+                'Graph %s %s falhou (tentativa %s), repetindo em %.2fs',
+                method,
+                url,
+                attempt + 1,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+        return response  # pragma: no cover
+
+    async def call(
+        self,
+        method: str,
+        url: str,
+        token: str,
+        expected: int = HTTPStatus.OK,
+        **kwargs,
+    ):
+        response = await self.request(method, url, token, **kwargs)
+
+        if response.status_code != expected:
+            raise GraphError(response.status_code, _payload(response))
+
+        return _payload(response)
+
+    async def get(self, url: str, token: str, **kwargs):
+        return await self.call('GET', url, token, **kwargs)
+
+    async def post(
+        self, url: str, token: str, expected=HTTPStatus.CREATED, **kwargs
+    ):
+        return await self.call('POST', url, token, expected=expected, **kwargs)
+
+    async def pages(self, url: str, token: str, first_page: dict = None):
+        """
+        Gerador assíncrono que segue o `@odata.nextLink` página a página.
+
+        Só uma página fica em memória por vez. `first_page` permite reusar
+        uma página já buscada (ex.: para validar erros antes de responder).
+        """
+        page = first_page if first_page is not None else await self.get(
+            url, token
+        )
+
+        while True:
+            yield page
+
+            next_link = page.get('@odata.nextLink')
+            if not next_link:
+                return
+
+            page = await self.get(next_link, token)
+
+    async def _send_batch(self, token: str, chunk: list[dict], limit):
+        async with limit:
+            try:
+                payload = await self.call(
+                    'POST', '/$batch', token, json={'requests': chunk}
+                )
+            except GraphError as e:
+                return [
+                    {
+                        'id': item['id'],
+                        'status': e.status_code,
+                        'body': e.payload,
+                    }
+                    for item in chunk
+                ]
+            except httpx.TransportError as e:
+                # O lote pode ter sido entregue em parte: cada item sai com
+                # o erro, sem derrubar os outros lotes nem ser reenviado
+                status = (
+                    HTTPStatus.GATEWAY_TIMEOUT
+                    if isinstance(e, httpx.TimeoutException)
+                    else HTTPStatus.BAD_GATEWAY
+                )
+                return [
+                    {
+                        'id': item['id'],
+                        'status': status,
+                        'body': {
+                            'error': {
+                                'code': TRANSPORT_ERROR_CODE,
+                                'message': f'{type(e).__name__}: {e}',
+                            }
+                        },
+                    }
+                    for item in chunk
+                ]
+
+        return payload.get('responses', [])
+
+    @staticmethod
+    def _retryable(item: dict) -> bool:
+        body = item.get('body')
+        failed_in_transit = (
+            isinstance(body, dict)
+            and isinstance(body.get('error'), dict)
+            and body['error'].get('code') == TRANSPORT_ERROR_CODE
+        )
+        return item.get('status') in RETRY_STATUSES and not failed_in_transit
+
+    def _batch_retry_delay(self, item: dict, attempt: int) -> float:
+        retry_after = str(item.get('headers', {}).get('Retry-After', ''))
+        if retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+
+        return min(self.backoff * 2**attempt, self.max_backoff)
+
+    async def batch(
+        self, token: str, requests: list[dict], concurrency: int = 4
+    ) -> list[dict]:
+        """
+        Executa várias requisições pelo endpoint JSON `$batch`.
+
+        `requests` recebe dicts com `method`, `url` e, opcionalmente,
+        `body`. Elas são agrupadas de 20 em 20 e até `concurrency` lotes
+        rodam ao mesmo tempo. Itens devolvidos com 429/503/504 são
+        reenviados num novo lote, respeitando o `Retry-After` de cada um.
+        Um lote que falha na rede devolve 502 (ou 504 no timeout) para os
+        seus itens e não é reenviado: o Graph pode já ter executado parte.
+
+        Devolve uma resposta por requisição, na mesma ordem, no formato do
+        Graph (`status`, `body` e `headers`).
+        """
+        pending = []
+        for index, request in enumerate(requests):
+            item = {'id': str(index), **request}
+            if 'body' in item:
+                item.setdefault(
+                    'headers', {'Content-Type': 'application/json'}
+                )
+            pending.append(item)
+
+        by_id = {item['id']: item for item in pending}
+        results: dict[str, dict] = {}
+        limit = asyncio.Semaphore(concurrency)
+
+        for attempt in range(self.max_retries + 1):
+            chunks = [
+                pending[i : i + GRAPH_BATCH_LIMIT]
+                for i in range(0, len(pending), GRAPH_BATCH_LIMIT)
+            ]
+            responses = await asyncio.gather(*(
+                self._send_batch(token, chunk, limit) for chunk in chunks
+            ))
+
+            pending, delay = [], 0.0
+            for item in (item for chunk in responses for item in chunk):
+                if self._retryable(item) and attempt < self.max_retries:
+                    pending.append(by_id[item['id']])
+                    delay = max(delay, self._batch_retry_delay(item, attempt))
+                else:
+                    results[item['id']] = item
+
+            if not pending:
+                break
+
+            await asyncio.sleep(delay)
+
+        missing = {'status': HTTPStatus.BAD_GATEWAY, 'body': None}
+        return [
+            results.get(str(index), {'id': str(index), **missing})
+            for index in range(len(requests))
+        ]
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+_shared: dict[str, GraphClient] = {}
+
+
+def get_graph_client() -> GraphClient:
+    """Dependência que entrega o cliente compartilhado (criado no 1º uso)."""
+    if 'client' not in _shared:
+        settings = get_settings()
+        _shared['client'] = GraphClient(
+            base_url=settings.GRAPH_BASE_URL,
+            timeout=settings.GRAPH_TIMEOUT_SECONDS,
+            max_retries=settings.GRAPH_MAX_RETRIES,
+            http2=settings.GRAPH_HTTP2,
+        )
+
+    return _shared['client']
+
+
+async def close_graph_client():
+    client = _shared.pop('client', None)
+
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,155 @@
+import logging
+import os
+import threading
+import time
+
+import msal
+from cryptography.fernet import Fernet
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentTokenCache(msal.SerializableTokenCache):
+    """
+    Cache de tokens do MSAL gravado em arquivo.
+
+    Com `encryption_key` (chave Fernet) o conteúdo é cifrado em disco.
+    Sem `path` o cache fica só em memória.
+    """
+
+    def __init__(self, path: str | None = None, encryption_key=None):
+        super().__init__()
+        self.path = path
+        self._fernet = Fernet(encryption_key) if encryption_key else None
+        # O TokenCache do MSAL já usa `_lock` internamente
+        self._save_lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'rb') as cache_file:
+            data = cache_file.read()
+
+        if self._fernet:
+            data = self._fernet.decrypt(data)
+
+        self.deserialize(data.decode())
+
+    def save(self):
+        if not self.path or not self.has_state_changed:
+            return
+
+        with self._save_lock:
+            data = self.serialize().encode()
+            if self._fernet:
+                data = self._fernet.encrypt(data)
+
+            tmp_path = f'{self.path}.tmp'
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+            fd = os.open(tmp_path, flags, 0o600)
+            with os.fdopen(fd, 'wb') as cache_file:
+                cache_file.write(data)
+            os.replace(tmp_path, self.path)
+            self.has_state_changed = False
+
+
+class TokenManager:
+    """
+    Entrega o token da conta de serviço do /mc a partir do cache.
+
+    O token fica em memória até `refresh_margin` segundos antes de expirar.
+    Quem pede nesse intervalo recebe o token atual; a renovação acontece
+    uma única vez (single-flight) mesmo com vários chamadores ao mesmo
+    tempo, e um timer em background renova antes da expiração.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        msal_app,
+        token_cache: PersistentTokenCache,
+        scopes: list[str],
+        username: str,
+        password: str,
+        refresh_margin: float = 300,
+    ):
+        self.msal_app = msal_app
+        self.token_cache = token_cache
+        self.scopes = scopes
+        self.username = username
+        self.password = password
+        self.refresh_margin = refresh_margin
+
+        self._result: dict | None = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._result is not None
+            and time.time() < self._expires_at - self.refresh_margin
+        )
+
+    def get_token(self) -> dict:
+        if self._is_fresh():
+            return self._result
+
+        with self._lock:
+            # Outro chamador pode ter renovado enquanto esperávamos
+            if self._is_fresh():
+                return self._result
+
+            return self._acquire()
+
+    def refresh(self):
+        with self._lock:
+            return self._acquire(force_refresh=True)
+
+    def _acquire(self, force_refresh: bool = False) -> dict:
+        result = None
+        accounts = self.msal_app.get_accounts(username=self.username)
+
+        if accounts:
+            result = self.msal_app.acquire_token_silent(
+                self.scopes, account=accounts[0], force_refresh=force_refresh
+            )
+
+        if not result:
+            result = self.msal_app.acquire_token_by_username_password(
+                scopes=self.scopes,
+                username=self.username,
+                password=self.password,
+            )
+
+        self.token_cache.save()
+
+        if 'access_token' in result:
+            self._result = result
+            self._expires_at = time.time() + int(result.get('expires_in', 0))
+            self._schedule_refresh()
+
+        return result
+
+    def _schedule_refresh(self):
+        if self._timer:
+            self._timer.cancel()
+
+        remaining = self._expires_at - time.time()
+        # Tokens mais curtos que a margem são renovados na metade da vida
+        delay = max(remaining - self.refresh_margin, remaining / 2, 1)
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception('Falha ao renovar o token do MSAL')
+
+    def close(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,120 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from api.control.metrics.registry import MetricsRegistry, registry
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_time: float = 0.0
+
+
+_current: ContextVar[RequestStats | None] = ContextVar(
+    'request_stats', default=None
+)
+
+
+def current_stats() -> RequestStats | None:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, *args):
+    conn.info['query_started_at'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, *args):
+    started_at = conn.info.pop('query_started_at', None)
+    stats = _current.get()
+
+    if stats is not None and started_at is not None:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started_at
+
+
+def instrument_engine(engine: Engine):
+    """
+    Conta queries e tempo de banco da requisição corrente.
+
+    Para um `AsyncEngine`, passe `async_engine.sync_engine`. Fora de uma
+    requisição (workers, scripts) os hooks não registram nada.
+    """
+    if event.contains(engine, 'after_cursor_execute', _after_cursor_execute):
+        return
+
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def server_timing(stats: RequestStats, elapsed: float) -> str:
+    return (
+        f'app;dur={elapsed * 1000:.1f}, '
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"'
+    )
+
+
+class InstrumentationMiddleware:
+    """
+    Middleware ASGI de latência por rota e queries por requisição.
+
+    Grava o histograma de latência pelo template da rota (`/todos/{id}`,
+    não o caminho real) e adiciona o header `Server-Timing`. O custo por
+    requisição é uma ContextVar, alguns `perf_counter` e um lock curto.
+    """
+
+    def __init__(self, app, metrics: MetricsRegistry = registry):
+        self.app = app
+        self.latency = metrics.histogram(
+            'http_request_duration_seconds',
+            'Latência das requisições HTTP.',
+            ('method', 'route', 'status'),
+        )
+        self.queries = metrics.counter(
+            'http_request_db_queries_total',
+            'Queries executadas pelas requisições HTTP.',
+            ('method', 'route'),
+        )
+        self.db_time = metrics.counter(
+            'http_request_db_duration_seconds_total',
+            'Tempo de banco gasto pelas requisições HTTP.',
+            ('method', 'route'),
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started_at = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    'Server-Timing',
+                    server_timing(stats, time.perf_counter() - started_at),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - started_at
+            route = getattr(scope.get('route'), 'path', 'unmatched')
+            method = scope['method']
+
+            self.latency.observe(elapsed, method, route, status)
+            if stats.queries:
+                self.queries.inc(stats.queries, method, route)
+                self.db_time.inc(stats.db_time, method, route)
@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+import uuid
+from typing import Callable
+
+# Crockford base32, usado pelo formato ULID
+_CROCKFORD = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+
+_lock = threading.Lock()
+_last_ms = 0
+_last_random = 0
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def new_ulid() -> str:
+    """
+    Gera um ULID (26 caracteres, ordenável por tempo).
+
+    Dentro do mesmo milissegundo a parte aleatória é incrementada, então os
+    IDs gerados por um processo são estritamente crescentes.
+    """
+    global _last_ms, _last_random
+
+    with _lock:
+        ms = _now_ms()
+        if ms <= _last_ms:
+            ms = _last_ms
+            random_part = _last_random + 1
+            if random_part > _RANDOM_MAX:
+                ms += 1
+                random_part = int.from_bytes(os.urandom(10))
+        else:
+            random_part = int.from_bytes(os.urandom(10))
+        _last_ms, _last_random = ms, random_part
+
+    value = (ms << _RANDOM_BITS) | random_part
+    return ''.join(
+        _CROCKFORD[(value >> shift) & 0x1F] for shift in range(125, -1, -5)
+    )
+
+
+def new_uuid7() -> str:
+    """Gera um UUIDv7 (RFC 9562) no formato canônico com hífens."""
+    ms = _now_ms() & ((1 << 48) - 1)
+    rand = int.from_bytes(os.urandom(10))
+    rand_a = rand >> 68
+    rand_b = rand & ((1 << 62) - 1)
+    value = (ms << 80) | (0x7 << 76) | (rand_a << 64) | (0b10 << 62) | rand_b
+    return str(uuid.UUID(int=value))
+
+
+ID_GENERATORS: dict[str, Callable[[], str]] = {
+    'ulid': new_ulid,
+    'uuid7': new_uuid7,
+}
+
+_active = {'generator': new_ulid}
+
+
+def set_id_generator(generator: str | Callable[[], str]) -> None:
+    """Define o gerador usado por `generate_id` (nome registrado ou função)."""
+    if isinstance(generator, str):
+        try:
+            generator = ID_GENERATORS[generator]
+        except KeyError:
+            raise ValueError(f'Unknown ID generator: {generator!r}') from None
+
+    _active['generator'] = generator
+
+
+def generate_id() -> str:
+    """Default de inserção das chaves primárias (sem ida ao banco)."""
+    return _active['generator']()
@@ -1,11 +1,35 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import (
+    DDL,
+    JSON,
+    BigInteger,
+    Computed,
+    ForeignKey,
+    Index,
+    Sequence,
+    event,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, registry, relationship
 
+from api.control.models.ids import generate_id
+
 table_registry = registry()
 
+# Configuração de texto usada pela busca full-text dos todos
+TODO_SEARCH_CONFIG = 'simple'
+
+event.listen(
+    table_registry.metadata,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(
+        dialect='postgresql'
+    ),
+)
+
 class TodoState(str, Enum):
     draft = 'draft'
     todo = 'todo'
@@ -13,11 +37,30 @@ class TodoState(str, Enum):
     done = 'done'
     trash = 'trash'
 
+
+class WebhookStatus(str, Enum):
+    pending = 'pending'
+    processing = 'processing'
+    done = 'done'
+    dead = 'dead'
+
+
+class BotJobStatus(str, Enum):
+    queued = 'queued'
+    running = 'running'
+    succeeded = 'succeeded'
+    failed = 'failed'
+    timed_out = 'timed_out'
+
 @table_registry.mapped_as_dataclass
 class User:
     __tablename__ = 'users'
+    # `created_at` volta no RETURNING do INSERT, sem um SELECT depois
+    __mapper_args__ = {'eager_defaults': True}
 
-    id: Mapped[str] = mapped_column(unique=True, primary_key=True)
+    id: Mapped[str] = mapped_column(
+        primary_key=True, init=False, insert_default=generate_id
+    )
     username: Mapped[str] = mapped_column(unique=True)
     password: Mapped[str]
     email: Mapped[str] = mapped_column(unique=True)
@@ -32,12 +75,155 @@ class User:
 @table_registry.mapped_as_dataclass
 class Todo:
     __tablename__ = 'todos'
+    __table_args__ = (
+        Index('ix_todos_user_id_state', 'user_id', 'state'),
+        Index('ix_todos_user_id_id', 'user_id', 'id'),
+        Index(
+            'ix_todos_title_trgm',
+            'title',
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_todos_description_trgm',
+            'description',
+            postgresql_using='gin',
+            postgresql_ops={'description': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_todos_search_vector', 'search_vector', postgresql_using='gin'
+        ),
+    )
 
-    id: Mapped[str] = mapped_column(unique=True, primary_key=True)
+    id: Mapped[str] = mapped_column(
+        primary_key=True, init=False, insert_default=generate_id
+    )
     title: Mapped[str]
     description: Mapped[str]
     state: Mapped[TodoState]
 
     user_id: Mapped[str] = mapped_column(ForeignKey('users.id'))
 
-    user: Mapped[User] = relationship(init=False, back_populates='todos')
\ No newline at end of file
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"to_tsvector('{TODO_SEARCH_CONFIG}', "
+            "coalesce(title, '') || ' ' || coalesce(description, ''))",
+            persisted=True,
+        ),
+        init=False,
+        deferred=True,
+    )
+
+    user: Mapped[User] = relationship(init=False, back_populates='todos')
+
+
+@table_registry.mapped_as_dataclass
+class WebhookEvent:
+    """
+    Notificação de webhook recebida e ainda não (ou já) processada.
+
+    `next_attempt_at` marca quando o evento pode ser pego por um worker:
+    a próxima tentativa de um `pending` ou o fim do prazo de um
+    `processing` cujo worker morreu no meio.
+    """
+
+    __tablename__ = 'webhook_events'
+    __table_args__ = (
+        Index(
+            'ix_webhook_events_status_next_attempt_at',
+            'status',
+            'next_attempt_at',
+        ),
+    )
+
+    id: Mapped[str] = mapped_column(
+        primary_key=True, init=False, insert_default=generate_id
+    )
+    notification_id: Mapped[str] = mapped_column(unique=True)
+    payload: Mapped[dict] = mapped_column(JSON)
+    status: Mapped[WebhookStatus] = mapped_column(
+        default=WebhookStatus.pending
+    )
+    attempts: Mapped[int] = mapped_column(default=0)
+    last_error: Mapped[str | None] = mapped_column(default=None)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+
+
+@table_registry.mapped_as_dataclass
+class BotJob:
+    """
+    Execução de um bot do registro, acompanhada por `/jobs/{id}`.
+
+    `heartbeat_at` é renovado pelo runtime dono do job enquanto ele está
+    `queued` ou `running`; sem renovação o job é dado como perdido.
+    """
+
+    __tablename__ = 'bot_jobs'
+    __table_args__ = (Index('ix_bot_jobs_status_bot', 'status', 'bot'),)
+    __mapper_args__ = {'eager_defaults': True}
+
+    id: Mapped[str] = mapped_column(
+        primary_key=True, init=False, insert_default=generate_id
+    )
+    bot: Mapped[str]
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE'), index=True
+    )
+    params: Mapped[dict] = mapped_column(JSON)
+    status: Mapped[BotJobStatus] = mapped_column(default=BotJobStatus.queued)
+    result: Mapped[dict | None] = mapped_column(JSON, default=None)
+    error: Mapped[str | None] = mapped_column(default=None)
+    created_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+    started_at: Mapped[datetime | None] = mapped_column(default=None)
+    finished_at: Mapped[datetime | None] = mapped_column(default=None)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        default=None, server_default=func.now()
+    )
+
+
+# Versão da listagem de usuários: `nextval` não trava linha, então as
+# escritas de usuários não disputam uma linha de `change_versions`
+users_version_seq = Sequence(
+    'users_version_seq', metadata=table_registry.metadata
+)
+
+
+@table_registry.mapped_as_dataclass
+class ChangeVersion:
+    """
+    Contador de alterações de um recurso listado (`todos:<user_id>`, `users`).
+
+    Sobe na mesma transação de cada escrita; as listagens usam o valor no
+    ETag e na chave do cache de respostas.
+    """
+
+    __tablename__ = 'change_versions'
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=1)
+
+
+@table_registry.mapped_as_dataclass
+class TodoCount:
+    """
+    Quantidade de todos de um usuário em cada estado.
+
+    Mantida pelas rotas de escrita de `/todos`, na mesma transação da
+    alteração: `/todos/summary` lê no máximo uma linha por estado.
+    """
+
+    __tablename__ = 'todo_counts'
+
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE'), primary_key=True
+    )
+    state: Mapped[TodoState] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(default=0)
@@ -0,0 +1,160 @@
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import parse_qs
+
+# Linhas do relatório do cProfile devolvido com `?profile=1`
+PROFILE_REPORT_LIMIT = 60
+
+
+def collapse_stack(frame, thread_name: str) -> str:
+    """Pilha no formato "collapsed" do flamegraph: raiz;...;folha."""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        frames.append(
+            f'{code.co_qualname} ({filename}:{code.co_firstlineno})'
+        )
+        frame = frame.f_back
+
+    frames.append(thread_name)
+    return ';'.join(reversed(frames))
+
+
+class SamplingProfiler:
+    """
+    Amostra as pilhas de todas as threads em intervalos fixos.
+
+    Roda numa thread própria e só lê `sys._current_frames()`, então o
+    custo nas requisições é praticamente nulo. O resultado é gravado no
+    formato "collapsed stack" (uma pilha por linha + contagem), aceito
+    pelo flamegraph.pl e pelo speedscope.
+    """
+
+    def __init__(self):
+        self._thread: threading.Thread | None = None
+        self.path: str | None = None
+        self.samples = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: float, interval: float, path: str) -> bool:
+        if self.running:
+            return False
+
+        self.path = path
+        self.samples = 0
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(duration, interval, path),
+            name='sampling-profiler',
+            daemon=True,
+        )
+        self._thread.start()
+        return True
+
+    def _run(self, duration: float, interval: float, path: str):
+        own = threading.get_ident()
+        stacks = Counter()
+        deadline = time.monotonic() + duration
+
+        while time.monotonic() < deadline:
+            names = {
+                thread.ident: thread.name for thread in threading.enumerate()
+            }
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own:
+                    stacks[
+                        collapse_stack(frame, names.get(thread_id, 'thread'))
+                    ] += 1
+            self.samples += 1
+            time.sleep(interval)
+
+        with open(path, 'w', encoding='utf-8') as output:
+            for stack, count in stacks.most_common():
+                output.write(f'{stack} {count}\n')
+
+    def join(self, timeout: float | None = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def profile_report(profiler: cProfile.Profile) -> str:
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+        PROFILE_REPORT_LIMIT
+    )
+    return output.getvalue()
+
+
+class ProfilingMiddleware:
+    """
+    Atende `?profile=1` devolvendo o relatório do cProfile no lugar da
+    resposta da rota.
+
+    Só vale com o profiling habilitado e para um administrador
+    (`is_admin` recebe o header Authorization); nos outros casos a
+    requisição segue normalmente. O cProfile mede a thread do event loop:
+    trabalho em threads (rotas síncronas, hashing) aparece só como espera.
+    Um perfil por vez, já que o cProfile é global no interpretador.
+    """
+
+    def __init__(self, app, is_enabled, is_admin):
+        self.app = app
+        self.is_enabled = is_enabled
+        self.is_admin = is_admin
+        self._lock = asyncio.Lock()
+
+    def _wants_profile(self, scope) -> bool:
+        if scope['type'] != 'http' or not self.is_enabled():
+            return False
+
+        query = parse_qs(scope.get('query_string', b'').decode())
+        if query.get('profile') != ['1']:
+            return False
+
+        headers = dict(scope['headers'])
+        return self.is_admin(headers.get(b'authorization', b'').decode())
+
+    async def __call__(self, scope, receive, send):
+        if not self._wants_profile(scope) or self._lock.locked():
+            await self.app(scope, receive, send)
+            return
+
+        async with self._lock:
+            status = {}
+
+            async def discard(message):
+                if message['type'] == 'http.response.start':
+                    status['code'] = message['status']
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, discard)
+            finally:
+                profiler.disable()
+
+        body = (
+            f'# status da rota: {status.get("code")}\n'
+            + profile_report(profiler)
+        ).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/plain; charset=utf-8'),
+                (b'content-length', str(len(body)).encode()),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': body})
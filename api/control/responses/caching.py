@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import OrderedDict
+from hashlib import blake2b
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
+
+from api.control.database.versions import get_version
+from api.control.documents.documents import etag_matches
+from api.control.settings.settings import get_settings
+
+# O cliente sempre revalida; o corpo depende do token nas rotas privadas
+CACHE_HEADERS = {'cache-control': 'private, no-cache', 'vary': 'Authorization'}
+
+
+class ResponseCache:
+    """
+    Corpos de listagens já serializados, em LRU com expiração curta.
+
+    A chave inclui a versão do recurso, então uma escrita pela API nunca
+    devolve um corpo velho: o TTL só limita a memória e o atraso de
+    alterações feitas direto no banco. Com `ttl <= 0` nada é guardado.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._entries: OrderedDict[tuple, tuple[bytes, float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[1] <= time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: tuple, body: bytes):
+        if self.ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (body, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def count_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.not_modified = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'size': len(self._entries),
+            }
+
+    def hit_ratio(self) -> float:
+        """Fração das leituras respondidas sem a query (304 ou cache)."""
+        stats = self.stats()
+        served = stats['hits'] + stats['not_modified']
+        total = served + stats['misses']
+        return served / total if total else 0.0
+
+
+_caches: dict[str, ResponseCache] = {}
+
+
+def get_response_cache() -> ResponseCache:
+    if 'responses' not in _caches:
+        settings = get_settings()
+        _caches['responses'] = ResponseCache(
+            maxsize=settings.RESPONSE_CACHE_SIZE,
+            ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+    return _caches['responses']
+
+
+class ConditionalPage:
+    """
+    GET condicional de uma listagem versionada.
+
+    O ETag fraco junta a versão do recurso e um resumo da chave e dos
+    parâmetros da query. Com `If-None-Match` igual a rota responde 304 sem
+    rodar a listagem; senão tenta o cache de respostas e, na falta, a rota
+    monta a página e a entrega a `store`.
+    """
+
+    def __init__(self, request: Request, key: str, version: int):
+        params = urlencode(sorted(request.query_params.multi_items()))
+        digest = blake2b(
+            f'{request.url.path}?{params}|{key}'.encode(), digest_size=8
+        ).hexdigest()
+
+        self.request = request
+        self.cache_key = (key, version, request.url.path, params)
+        self.opaque_tag = f'"{version}-{digest}"'
+        self.headers = {'etag': f'W/{self.opaque_tag}', **CACHE_HEADERS}
+
+    @classmethod
+    async def load(cls, request: Request, session: AsyncSession, key: str):
+        # A versão vem antes da listagem: a página nunca é mais velha que
+        # o ETag que a acompanha
+        return cls(request, key, await get_version(session, key))
+
+    def cached(self) -> Response | None:
+        cache = get_response_cache()
+
+        if_none_match = self.request.headers.get('if-none-match')
+        if if_none_match is not None and etag_matches(
+            if_none_match, self.opaque_tag
+        ):
+            cache.count_not_modified()
+            return Response(
+                status_code=HTTPStatus.NOT_MODIFIED, headers=self.headers
+            )
+
+        body = cache.get(self.cache_key)
+        if body is None:
+            return None
+
+        return Response(
+            body, media_type='application/json', headers=self.headers
+        )
+
+    def store(self, response: Response) -> Response:
+        get_response_cache().set(self.cache_key, response.body)
+        response.headers.update(self.headers)
+        return response
@@ -0,0 +1,40 @@
+from collections.abc import Sequence
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import Row
+
+from api.control.settings.settings import get_settings
+
+RESPONSE_CLASSES: dict[str, type[JSONResponse]] = {
+    'orjson': ORJSONResponse,
+    'json': JSONResponse,
+}
+
+
+def get_response_class() -> type[JSONResponse]:
+    """Classe padrão das respostas JSON, escolhida em `JSON_RESPONSE_CLASS`."""
+    return RESPONSE_CLASSES[get_settings().JSON_RESPONSE_CLASS]
+
+
+def row_dicts(rows: Sequence[Row]) -> list[dict]:
+    """Linhas de `select(coluna, ...)` como dicts, na ordem das colunas."""
+    if not rows:
+        return []
+
+    fields = rows[0]._fields
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def page_response(key: str, rows: Sequence[Row], next_cursor) -> JSONResponse:
+    """
+    Página de listagem montada direto das tuplas do banco.
+
+    Devolver a `Response` pronta pula a validação do `response_model` (o
+    schema continua documentando a rota): as colunas selecionadas já têm
+    os nomes e tipos do schema público, então não há o que validar nem
+    entidades ORM para hidratar.
+    """
+    return get_response_class()({
+        key: row_dicts(rows),
+        'next_cursor': next_cursor,
+    })
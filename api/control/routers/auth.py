@@ -4,26 +4,26 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.control.database.database import get_session
+from api.control.database.database import get_async_session
 from api.control.models.models import User
-from api.control.schemas.auth_schemas import Token
+from api.control.schemas.auth_schemas import Token, UserIdentity
 from api.control.security.security import (
     create_access_token, 
-    get_current_user, 
-    verify_password
+    get_current_identity, 
+    verify_and_update_password_async
     )
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 OAuth2Form = Annotated[OAuth2PasswordRequestForm, Depends()]
-T_Session = Annotated[Session, Depends(get_session)]
+T_Session = Annotated[AsyncSession, Depends(get_async_session)]
 
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(form_data: OAuth2Form, session: T_Session):
-    user = session.scalar(select(User).where(User.email == form_data.username))
+async def login_for_access_token(form_data: OAuth2Form, session: T_Session):
+    user = await session.scalar(select(User).where(User.email == form_data.username))
 
     if not user:
         raise HTTPException(
@@ -31,20 +31,29 @@ def login_for_access_token(form_data: OAuth2Form, session: T_Session):
             detail="Incorrect email or password",
         )
 
-    if not verify_password(form_data.password, user.password):
+    valid, new_hash = await verify_and_update_password_async(
+        form_data.password, user.password
+    )
+
+    if not valid:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail="Incorrect email or password",
         )
 
+    # Parâmetros do Argon2 mudaram: regrava o hash de forma transparente
+    if new_hash:
+        user.password = new_hash
+        await session.commit()
+
     access_token = create_access_token(data={"sub": user.email})
 
     return {"access_token": access_token, "token_type": "Bearer"}
 
 
 @router.post('/refresh_token', response_model=Token)
-def refresh_access_token(
-    user: User = Depends(get_current_user)
+async def refresh_access_token(
+    user: UserIdentity = Depends(get_current_identity)
 ):
     new_access_token = create_access_token(data={'sub': user.email})
 
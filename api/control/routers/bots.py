@@ -0,0 +1,77 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.control.bots.registry import get_bot, list_bots
+from api.control.bots.runtime import BotRuntime
+from api.control.database.database import get_async_session
+from api.control.models.models import BotJob
+from api.control.schemas.auth_schemas import UserIdentity
+from api.control.schemas.bots_schemas import (
+    BotJobPublic,
+    BotList,
+    BotPublic,
+    BotRun,
+)
+from api.control.security.security import get_current_identity
+
+router = APIRouter(tags=['bots'])
+
+T_Session = Annotated[AsyncSession, Depends(get_async_session)]
+CurrentUser = Annotated[UserIdentity, Depends(get_current_identity)]
+
+
+def get_bot_runtime(request: Request) -> BotRuntime:
+    return request.app.state.bot_runtime
+
+
+@router.get('/bots', response_model=BotList)
+async def read_bots(user: CurrentUser):
+    return {
+        'bots': [BotPublic(**spec._asdict()) for spec in list_bots()]
+    }
+
+
+@router.post(
+    '/bots/{name}/run',
+    status_code=HTTPStatus.ACCEPTED,
+    response_model=BotJobPublic,
+)
+async def run_bot(
+    name: str,
+    user: CurrentUser,
+    session: T_Session,
+    runtime: Annotated[BotRuntime, Depends(get_bot_runtime)],
+    run: BotRun | None = None,
+):
+    """Enfileira o bot e responde na hora; acompanhe por `/jobs/{id}`."""
+    spec = get_bot(name)
+    if spec is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Bot not found.'
+        )
+
+    params = run.params if run else {}
+    job = BotJob(bot=name, user_id=user.id, params=params)
+    session.add(job)
+    await session.commit()
+
+    runtime.submit(job.id, spec, params)
+    return job
+
+
+@router.get('/jobs/{job_id}', response_model=BotJobPublic)
+async def read_job(job_id: str, user: CurrentUser, session: T_Session):
+    job = await session.scalar(
+        select(BotJob).where(BotJob.id == job_id, BotJob.user_id == user.id)
+    )
+
+    if not job:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Job not found.'
+        )
+
+    return job
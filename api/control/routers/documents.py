@@ -0,0 +1,37 @@
+from fastapi import APIRouter
+
+from api.control.documents.documents import DocumentResponse, DocumentStore
+from api.control.settings.settings import get_settings
+
+settings = get_settings()
+store = DocumentStore(
+    settings.DOCUMENTS_DIR,
+    maxsize=settings.DOCUMENTS_CACHE_SIZE,
+    ttl=settings.DOCUMENTS_METADATA_TTL_SECONDS,
+)
+
+router = APIRouter(tags=['documents'])
+
+
+def serve_document(name: str) -> DocumentResponse:
+    return DocumentResponse(
+        store,
+        name,
+        store.get(name),
+        f'public, max-age={settings.DOCUMENTS_MAX_AGE_SECONDS}',
+    )
+
+
+@router.api_route('/pdfs/{name:path}', methods=['GET', 'HEAD'])
+def read_document(name: str):
+    """PDFs gerados pelos bots, com ETag, 304 e download por intervalos."""
+    return serve_document(name)
+
+
+@router.api_route(
+    '/pdf/{name:path}', methods=['GET', 'HEAD'], include_in_schema=False
+)
+def read_document_legacy(name: str):
+    # Antes servia `api/pdf_output`, pasta que nenhum bot usa; agora é só
+    # um alias de `/pdfs` sobre `DOCUMENTS_DIR`
+    return serve_document(name)
@@ -0,0 +1,108 @@
+import os
+import time
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from api.control.profiling.profiler import SamplingProfiler
+from api.control.schemas.auth_schemas import UserIdentity
+from api.control.security.security import decode_token, get_current_identity
+from api.control.settings.settings import get_settings
+
+settings = get_settings()
+sampler = SamplingProfiler()
+
+
+def profiling_enabled() -> bool:
+    return settings.PROFILING_ENABLED
+
+
+def is_profiling_admin(authorization: str) -> bool:
+    scheme, _, token = authorization.partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return False
+
+    try:
+        token_data, _ = decode_token(token)
+    except HTTPException:
+        return False
+
+    return token_data.username in settings.PROFILING_ADMINS
+
+
+def require_profiling_enabled():
+    # Desligado, a superfície de profiling nem aparece
+    if not profiling_enabled():
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Not Found'
+        )
+
+
+def require_profiling_admin(
+    identity: UserIdentity = Depends(get_current_identity),
+):
+    if identity.email not in settings.PROFILING_ADMINS:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN, detail='Not enough permissions'
+        )
+
+
+router = APIRouter(
+    prefix='/admin/profiling',
+    tags=['profiling'],
+    dependencies=[
+        Depends(require_profiling_enabled),
+        Depends(require_profiling_admin),
+    ],
+)
+
+
+def sampling_status():
+    return {
+        'running': sampler.running,
+        'file': sampler.path,
+        'samples': sampler.samples,
+    }
+
+
+@router.post('/sampling', status_code=HTTPStatus.ACCEPTED)
+def start_sampling(
+    seconds: float = Query(30, gt=0, le=600),
+    interval_ms: float = Query(5, ge=1, le=1000),
+):
+    """Inicia uma sessão de amostragem de todas as requisições."""
+    path = os.path.join(
+        settings.PROFILING_OUTPUT_DIR,
+        f'profile-{time.strftime("%Y%m%d-%H%M%S")}.collapsed',
+    )
+
+    if not sampler.start(seconds, interval_ms / 1000, path):
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail='A sampling session is already running.',
+        )
+
+    return sampling_status()
+
+
+@router.get('/sampling')
+def read_sampling():
+    return sampling_status()
+
+
+@router.get('/sampling/file')
+def download_sampling():
+    if sampler.running or not sampler.path or not os.path.exists(
+        sampler.path
+    ):
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='No finished sampling session.',
+        )
+
+    return FileResponse(
+        sampler.path,
+        media_type='text/plain',
+        filename=os.path.basename(sampler.path),
+    )
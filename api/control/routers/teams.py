@@ -1,23 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    RedirectResponse,
+    StreamingResponse,
+)
 from fastapi.security import OAuth2AuthorizationCodeBearer
 from sqlalchemy.orm import Session
-from typing import Annotated
+from typing import Annotated, Any
 from http import HTTPStatus
 
 from api.control.database.database import get_session
+from api.control.graph.client import GraphClient, GraphError, get_graph_client
+from api.control.graph.token_manager import PersistentTokenCache, TokenManager
 from api.control.schemas.utils_schemas import Message
-from api.control.settings.settings import Settings
+from api.control.settings.settings import get_settings
+from api.control.webhooks.queue import (
+    enqueue_webhook,
+    validate_webhook_payload,
+)
 
 
 import msal
-import requests
+import json
+import threading
 import logging
 import datetime
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-settings = Settings()
 
 SCOPE = [
     "User.Read",
@@ -28,13 +39,62 @@ SCOPE = [
     "TeamsActivity.Read"
 ]
 
-tenauthority = settings.AUTHORITY + settings.TENANT_ID
+tenauthority = get_settings().AUTHORITY + get_settings().TENANT_ID
 
-msal_app = msal.ConfidentialClientApplication(
-    client_id = settings.CLIENT_ID,
-    client_credential = settings.CLIENT_SECRET,
-    authority = tenauthority,
-)
+_msal: dict[str, TokenManager] = {}
+_msal_lock = threading.Lock()
+
+
+def get_token_manager() -> TokenManager:
+    """
+    Gerenciador de tokens da conta de serviço, criado no primeiro uso.
+
+    O construtor do MSAL pode consultar a authority pela rede: fora do
+    import, subir o app (ou coletar os testes) não paga por isso.
+    """
+    with _msal_lock:
+        if 'token_manager' not in _msal:
+            settings = get_settings()
+            token_cache = PersistentTokenCache(
+                path=settings.MSAL_CACHE_PATH,
+                encryption_key=settings.MSAL_CACHE_ENCRYPTION_KEY,
+            )
+            msal_app = msal.ConfidentialClientApplication(
+                client_id=settings.CLIENT_ID,
+                client_credential=settings.CLIENT_SECRET,
+                authority=tenauthority,
+                token_cache=token_cache,
+            )
+            _msal['token_manager'] = TokenManager(
+                msal_app,
+                token_cache,
+                scopes=SCOPE,
+                username=settings.USER_MC,
+                password=settings.USER_PASSWORD_MC,
+                refresh_margin=settings.MSAL_REFRESH_MARGIN_SECONDS,
+            )
+
+        return _msal['token_manager']
+
+
+def close_token_manager():
+    with _msal_lock:
+        token_manager = _msal.pop('token_manager', None)
+
+    if token_manager is not None:
+        token_manager.close()
+
+
+def service_token() -> str:
+    """Token "Bearer" da conta de serviço, usado fora de uma requisição."""
+    result = get_token_manager().get_token()
+
+    if "access_token" not in result:
+        raise RuntimeError(
+            f"Falha ao obter token: {result.get('error_description')}"
+        )
+
+    return f"Bearer {result['access_token']}"
 
 oauth2_scheme = OAuth2AuthorizationCodeBearer(
     authorizationUrl=f"{tenauthority}/oauth2/v2.0/authorize",
@@ -44,24 +104,91 @@ oauth2_scheme = OAuth2AuthorizationCodeBearer(
 router = APIRouter(prefix='/mc', tags=['mc'])
 
 T_Session = Annotated[Session, Depends(get_session)]
+T_Graph = Annotated[GraphClient, Depends(get_graph_client)]
 
-@router.get("/login")
-def login():
 
-    auth_by_account = msal_app.acquire_token_by_username_password(
-        scopes=SCOPE,
-        username=settings.USER_MC,
-        password=settings.USER_PASSWORD_MC
+def graph_token(request: Request) -> str:
+    """Lê o header Authorization e devolve no formato `Bearer <token>`."""
+    token = request.headers.get("Authorization")
+
+    if not token:
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail="Token de acesso ausente ou malformado."
+        )
+
+    if not token.startswith("Bearer "):
+        token = f"Bearer {token}"
+
+    return token
+
+
+T_Token = Annotated[str, Depends(graph_token)]
+
+
+def graph_exception(error: GraphError, message: str):
+    return HTTPException(
+        status_code=error.status_code,
+        detail=f"{message}: {error.payload}"
     )
 
+
+async def graph_list(  # noqa: PLR0913
+    graph: GraphClient,
+    url: str,
+    token: str,
+    message: str,
+    *,
+    stream: bool = False,
+    max_items: int | None = None,
+):
+    """
+    Busca uma listagem do Graph.
+
+    Sem `stream` devolve só a primeira página, como antes. Com `stream`
+    segue o `@odata.nextLink` e envia cada item como uma linha NDJSON,
+    até `max_items`. Um erro no meio do stream vira uma linha `error`.
+    """
+    try:
+        first_page = await graph.get(url, token)
+    except GraphError as e:
+        raise graph_exception(e, message)
+
+    if not stream:
+        return first_page
+
+    async def lines():
+        sent = 0
+        try:
+            async for page in graph.pages(url, token, first_page=first_page):
+                for item in page.get("value", []):
+                    if max_items is not None and sent >= max_items:
+                        return
+                    yield json.dumps(item) + "\n"
+                    sent += 1
+        except GraphError as e:
+            logger.error("%s: %s", message, e.payload)
+            error = {"status": e.status_code, "detail": e.payload}
+            yield json.dumps({"error": error}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+T_Stream = Annotated[bool, Query()]
+T_MaxItems = Annotated[int | None, Query(ge=1)]
+
+@router.get("/login")
+def login():
+    auth_by_account = get_token_manager().get_token()
+
     return {"message": "Autenticação bem-sucedida.", "access_token": auth_by_account}
 
 @router.get("/callback")
 def callback(session: T_Session, code: str):
-    result = msal_app.acquire_token_by_authorization_code(
+    result = get_token_manager().msal_app.acquire_token_by_authorization_code(
         code,
         scopes=SCOPE,
-        redirect_uri=settings.REDIRECT_URI
+        redirect_uri=get_settings().REDIRECT_URI
     )
 
     if "access_token" in result:
@@ -74,202 +201,182 @@ def callback(session: T_Session, code: str):
         )
 
 @router.get("/me")
-def get_user_info(request: Request):
-    token = request.headers.get("Authorization")
-
-    if not token:
-        raise HTTPException(
-            status_code=HTTPStatus.UNAUTHORIZED,
-            detail="Token de acesso ausente"
-        )
-    
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get("https://graph.microsoft.com/v1.0/me", headers=headers)
-
-    if response.status_code == 200:
-        return response.json()
-    else:
-        return HTTPException(
-            status_code=response.status_code,
-            detail=f"Erro ao acessar a API: {response.json()}"
-        )
+async def get_user_info(token: T_Token, graph: T_Graph):
+    try:
+        return await graph.get("/me", token)
+    except GraphError as e:
+        raise graph_exception(e, "Erro ao acessar a API")
 
 
 @router.get("/list-chats")
-def list_chats(request: Request):
-    token = request.headers.get("Authorization")
-
-    if not token or not token.startswith("Bearer "):
-        raise HTTPException(
-            status_code=HTTPStatus.UNAUTHORIZED,
-            detail="Token de acesso ausente ou malformado."
-        )
-
-    headers = {
-        "Authorization": token,
-        "Content-Type": "application/json"
-    }
-
-    response = requests.get(
-        "https://graph.microsoft.com/v1.0/me/chats",
-        headers=headers
+async def list_chats(
+    token: T_Token,
+    graph: T_Graph,
+    stream: T_Stream = False,
+    max_items: T_MaxItems = None,
+):
+    return await graph_list(
+        graph,
+        "/me/chats",
+        token,
+        "Erro ao listar chats",
+        stream=stream,
+        max_items=max_items,
     )
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        error_detail = response.json()
-        raise HTTPException(
-            status_code=response.status_code,
-            detail=f"Erro ao listar chats: {error_detail}"
-        )
-
 @router.get("/list-teams")
-def list_teams(request: Request):
-    token = request.headers.get("Authorization")
-
-    if not token:
-        raise HTTPException(
-            status_code=HTTPStatus.UNAUTHORIZED,
-            detail="Token de acesso ausente"
-        )
-
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(
-        "https://graph.microsoft.com/v1.0/me/joinedTeams",
-        headers=headers
+async def list_teams(
+    token: T_Token,
+    graph: T_Graph,
+    stream: T_Stream = False,
+    max_items: T_MaxItems = None,
+):
+    return await graph_list(
+        graph,
+        "/me/joinedTeams",
+        token,
+        "Erro ao listar equipes",
+        stream=stream,
+        max_items=max_items,
     )
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise HTTPException(
-            status_code=response.status_code,
-            detail=f"Erro ao listar equipes: {response.json()}"
-        )
-
 @router.get("/list-channels")
-def list_channels(request: Request, team_id: str):
-    token = request.headers.get("Authorization")
-
-    if not token:
-        raise HTTPException(
-            status_code=HTTPStatus.UNAUTHORIZED,
-            detail="Token de acesso ausente"
-        )
-
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(
-        f"https://graph.microsoft.com/v1.0/teams/{team_id}/channels",
-        headers=headers
+async def list_channels(
+    token: T_Token,
+    graph: T_Graph,
+    team_id: str,
+    stream: T_Stream = False,
+    max_items: T_MaxItems = None,
+):
+    return await graph_list(
+        graph,
+        f"/teams/{team_id}/channels",
+        token,
+        "Erro ao listar canais",
+        stream=stream,
+        max_items=max_items,
     )
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise HTTPException(
-            status_code=response.status_code,
-            detail=f"Erro ao listar canais: {response.json()}"
-        )
-
 from pydantic import BaseModel
 
 class ReceiveMessageRequest(BaseModel):
     chat_id: str
 
 @router.get("/receive-messages")
-def receive_messages(request: Request, data: ReceiveMessageRequest):
-    token = request.headers.get("Authorization")
-
-    if not token or not token.startswith("Bearer "):
-        raise HTTPException(
-            status_code=HTTPStatus.UNAUTHORIZED,
-            detail="Token de acesso ausente ou malformado."
-        )
-
-    headers = {
-        "Authorization": token,
-        "Content-Type": "application/json"
-    }
-
-    response = requests.get(
-        f"https://graph.microsoft.com/v1.0/chats/{data.chat_id}/messages",
-        headers=headers
+async def receive_messages(
+    token: T_Token,
+    graph: T_Graph,
+    data: ReceiveMessageRequest,
+    stream: T_Stream = False,
+    max_items: T_MaxItems = None,
+):
+    return await graph_list(
+        graph,
+        f"/chats/{data.chat_id}/messages",
+        token,
+        "Erro ao receber mensagens",
+        stream=stream,
+        max_items=max_items,
     )
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        return HTTPException(
-            status_code=response.status_code,
-            detail=f"Erro ao receber mensagens: {response.json()}"
-        )
-
 class SendMessageRequest(BaseModel):
     chat_id: str
     message: str
 
 @router.post("/send-message")
-def send_message(request: Request, data: SendMessageRequest):
+async def send_message(
+    token: T_Token, graph: T_Graph, data: SendMessageRequest
+):
     """
     Envia uma mensagem para um chat no Microsoft Teams.
 
     Args:
-        request (Request): O objeto de requisição contendo o token de autenticação.
+        token (str): Token de acesso do header Authorization.
+        graph (GraphClient): Cliente compartilhado do Microsoft Graph.
         data (SendMessageRequest): Dados contendo o ID do chat e a mensagem a ser enviada.
 
     Returns:
         dict: Confirmação do envio da mensagem ou erro.
     """
-    token = request.headers.get("Authorization")
-
-    if not token or not token.startswith("Bearer "):
-        raise HTTPException(
-            status_code=HTTPStatus.UNAUTHORIZED,
-            detail="Token de acesso ausente ou malformado."
-        )
-
-    headers = {
-        "Authorization": token,
-        "Content-Type": "application/json"
-    }
-
     payload = {
         "body": {
             "content": data.message
         }
     }
 
-    response = requests.post(
-        f"https://graph.microsoft.com/v1.0/chats/{data.chat_id}/messages",
-        headers=headers,
-        json=payload
-    )
+    try:
+        await graph.post(f"/chats/{data.chat_id}/messages", token, json=payload)
+    except GraphError as e:
+        raise graph_exception(e, "Erro ao enviar a mensagem")
 
-    if response.status_code == 201:
-        return {"message": "Mensagem enviada com sucesso."}
-    else:
-        error_detail = response.json()
-        raise HTTPException(
-            status_code=response.status_code,
-            detail=f"Erro ao enviar a mensagem: {error_detail}"
-        )
+    return {"message": "Mensagem enviada com sucesso."}
 
-@router.post("/create-subscription")
-async def create_subscription(request: Request):
-    GRAPH_API_ENDPOINT = "https://graph.microsoft.com/v1.0/subscriptions"
-    access_token = request.headers.get("Authorization")
-    if not access_token or not access_token.startswith("Bearer "):
-        raise HTTPException(
-            status_code=HTTPStatus.UNAUTHORIZED,
-            detail="Token de acesso ausente ou malformado."
-        )
+class BatchReceiveMessagesRequest(BaseModel):
+    chat_ids: list[str]
 
-    headers = {
-        "Authorization": access_token,
-        "Content-Type": "application/json"
-    }
+class BatchSendMessageRequest(BaseModel):
+    chat_ids: list[str]
+    message: str
 
+class BatchItemResult(BaseModel):
+    chat_id: str
+    status: int
+    body: Any = None
+    error: Any = None
+
+class BatchResult(BaseModel):
+    results: list[BatchItemResult]
+
+def batch_results(chat_ids: list[str], responses: list[dict]):
+    results = []
+    for chat_id, response in zip(chat_ids, responses):
+        status = response["status"]
+        ok = HTTPStatus.OK <= status < HTTPStatus.MULTIPLE_CHOICES
+        results.append({
+            "chat_id": chat_id,
+            "status": status,
+            "body": response.get("body") if ok else None,
+            "error": None if ok else response.get("body"),
+        })
+
+    return {"results": results}
+
+@router.post("/batch/receive-messages", response_model=BatchResult)
+async def batch_receive_messages(
+    token: T_Token, graph: T_Graph, data: BatchReceiveMessagesRequest
+):
+    """Lê as mensagens de vários chats usando o `$batch` do Graph."""
+    requests = [
+        {"method": "GET", "url": f"/chats/{chat_id}/messages"}
+        for chat_id in data.chat_ids
+    ]
+    responses = await graph.batch(
+        token, requests, concurrency=get_settings().GRAPH_BATCH_CONCURRENCY
+    )
+
+    return batch_results(data.chat_ids, responses)
+
+@router.post("/batch/send-message", response_model=BatchResult)
+async def batch_send_message(
+    token: T_Token, graph: T_Graph, data: BatchSendMessageRequest
+):
+    """Envia a mesma mensagem para vários chats usando o `$batch`."""
+    requests = [
+        {
+            "method": "POST",
+            "url": f"/chats/{chat_id}/messages",
+            "body": {"body": {"content": data.message}},
+        }
+        for chat_id in data.chat_ids
+    ]
+    responses = await graph.batch(
+        token, requests, concurrency=get_settings().GRAPH_BATCH_CONCURRENCY
+    )
+
+    return batch_results(data.chat_ids, responses)
+
+@router.post("/create-subscription")
+async def create_subscription(token: T_Token, graph: T_Graph):
     chat_id = 'CHAT ID'
 
     payload = {
@@ -277,73 +384,50 @@ async def create_subscription(request: Request):
         "notificationUrl": "http://localhost:8000/mc/webhook",
         "resource": f"/chats/{chat_id}/messages",
         "expirationDateTime": "2024-09-11T00:00:00Z",
-        "clientState": "secretClientState"
+        "clientState": get_settings().WEBHOOK_CLIENT_STATE
     }
-    response = requests.post(GRAPH_API_ENDPOINT, headers=headers, json=payload)
 
-    if response.status_code == 201:
-        logger.info("Assinatura de webhook criada com sucesso.")
-        return JSONResponse(content={"status": "Subscription created", "subscriptionId": response.json().get("id")})
-    else:
-        logger.error("Erro ao criar assinatura de webhook: %s", response.json())
+    try:
+        subscription = await graph.post("/subscriptions", token, json=payload)
+    except GraphError as e:
+        logger.error("Erro ao criar assinatura de webhook: %s", e.payload)
         raise HTTPException(
             status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
             detail="Erro ao criar assinatura de webhook"
         )
 
+    logger.info("Assinatura de webhook criada com sucesso.")
+    return JSONResponse(content={"status": "Subscription created", "subscriptionId": subscription.get("id")})
+
 class WbSendMessageRequest(BaseModel):
     webhook: str
     chat_id: str
 
 
-@router.post("/webhook")
-async def handle_webhook(request: Request):
-    try:
-        payload = await request.json()
-        logger.info("Recebido webhook: %s", payload)
-        print(payload)
-        
-        if "message" in payload and "body" in payload["message"]:
-            message_body = payload["message"]["body"]["content"]
-            if message_body == "Ativar Boas Vindas":
-                chat_id = payload["conversation"]["id"]
-                token = request.headers.get("Authorization")
-                send_welcome_message(token, chat_id)
-                
-        return JSONResponse(content={"status": "success"})
-    
-    except Exception as e:
-        logger.error("Erro ao processar o webhook: %s", str(e))
+@router.post("/webhook", status_code=HTTPStatus.ACCEPTED)
+def handle_webhook(
+    session: T_Session,
+    payload: Annotated[dict[str, Any] | None, Body()] = None,
+    validation_token: Annotated[str | None, Query(alias="validationToken")] = None,
+):
+    # Handshake de criação da assinatura: o Graph espera o token de volta
+    if validation_token is not None:
+        return PlainTextResponse(validation_token)
+
+    if not payload:
         raise HTTPException(
-            status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
-            detail="Erro ao processar o webhook"
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Payload do webhook ausente."
         )
 
-def send_welcome_message(token: str, chat_id: str):
-    if not token or not token.startswith("Bearer "):
+    try:
+        validate_webhook_payload(payload, get_settings().WEBHOOK_CLIENT_STATE)
+    except ValueError as e:
         raise HTTPException(
-            status_code=HTTPStatus.UNAUTHORIZED,
-            detail="Token de acesso ausente ou malformado."
+            status_code=HTTPStatus.BAD_REQUEST, detail=str(e)
         )
 
-    headers = {
-        "Authorization": token,
-        "Content-Type": "application/json"
-    }
-    
-    payload = {
-        "body": {
-            "content": "Iniciando Automação Boas Vindas..."
-        }
-    }
-    
-    response = requests.post(
-        f"https://graph.microsoft.com/v1.0/chats/{chat_id}/messages",
-        headers=headers,
-        json=payload
-    )
-    
-    if response.status_code == 201:
-        logger.info("Mensagem de boas-vindas enviada com sucesso.")
-    else:
-        logger.error("Erro ao enviar mensagem de boas-vindas: %s", response.json())
\ No newline at end of file
+    created = enqueue_webhook(session, payload)
+    logger.info("Webhook %s", "enfileirado" if created else "duplicado")
+
+    return {"status": "queued" if created else "duplicate"}
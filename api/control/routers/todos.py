@@ -1,79 +1,365 @@
+import csv
+import io
+import json
+from enum import Enum
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (
+  String,
+  any_,
+  bindparam,
+  cast,
+  delete,
+  func,
+  insert,
+  select,
+  update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.control.database.database import get_session
-from api.control.models.models import Todo, User
+from api.control.database.counters import (
+  adjust_todo_counts,
+  get_todo_counts,
+  state_changes,
+)
+from api.control.database.database import (
+  get_async_session,
+  get_read_session,
+)
+from api.control.database.pagination import next_page, paginate
+from api.control.database.versions import bump_version, todos_key
+from api.control.models.models import TODO_SEARCH_CONFIG, Todo, TodoState
+from api.control.responses.caching import ConditionalPage
+from api.control.responses.responses import get_response_class, page_response
+from api.control.schemas.auth_schemas import UserIdentity
 from api.control.schemas.todos_schemas import (
+  TodoBulkCreate,
+  TodoBulkDelete,
+  TodoBulkResult,
+  TodoBulkStatus,
+  TodoBulkUpdate,
   TodoList,
   TodoPublic,
   TodoSchema,
+  TodoSummary,
   TodoUpdate
 ) 
 from api.control.schemas.utils_schemas import Message
-from api.control.security.security import get_current_user
+from api.control.security.security import get_current_identity
 
 router = APIRouter(prefix='/todos', tags=['todos'])
 
-T_Session = Annotated[Session, Depends(get_session)]
-CurrentUser = Annotated[User, Depends(get_current_user)]
+T_Session = Annotated[AsyncSession, Depends(get_async_session)]
+T_ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
+CurrentUser = Annotated[UserIdentity, Depends(get_current_identity)]
+
+# Colunas de `TodoPublic`: listagens e rotas em lote não hidratam entidades
+TODO_COLUMNS = (Todo.id, Todo.title, Todo.description, Todo.state)
+
+
+async def todos_changed(session, user_id: str, deltas=None):
+  """Contagens por estado e versão da listagem, na transação da escrita."""
+  if deltas:
+    await adjust_todo_counts(session, user_id, deltas)
+  await bump_version(session, todos_key(user_id))
+
 
 @router.post('/', response_model=TodoPublic)
-def create_todo(
+async def create_todo(
   todo: TodoSchema,
   user: CurrentUser,
   session: T_Session
 ):
-  
-  todo_id = len(session.scalars(select(Todo).offset(0).limit(100)).all()) + 1
   db_todo: Todo = Todo(
-    id=todo_id,
     title=todo.title,
     description=todo.description,
     state=todo.state,
     user_id=user.id,
   )
   session.add(db_todo)
-  session.commit()
-  session.refresh(db_todo)
+  await todos_changed(session, user.id, state_changes(added=[todo.state]))
+  await session.commit()
 
   return db_todo
 
+def filter_todos(query, title=None, description=None, state=None):
+  if title:
+    query = query.filter(Todo.title.contains(title))
+
+  if description:
+    query = query.filter(Todo.description.contains(description))
+
+  if state:
+    query = query.filter(Todo.state == state)
+
+  return query
+
+
 @router.get('/', response_model=TodoList)
-def list_todos(
-  session: T_Session,
+async def list_todos(  # noqa: PLR0913, PLR0917
+  request: Request,
+  session: T_ReadSession,
   user: CurrentUser,
   title: str = Query(None),
   description: str = Query(None),
   state: str = Query(None),
   offset: int = Query(None),
   limit: int = Query(None),
+  after: str = Query(None),
+  q: str = Query(None),
 ):
-  query = select(Todo).where(Todo.user_id == user.id)
+  page = await ConditionalPage.load(request, session, todos_key(user.id))
+  if (cached := page.cached()) is not None:
+    return cached
 
-  if title:
-    query = query.filter(Todo.title.contains(title))
+  query = select(*TODO_COLUMNS).where(Todo.user_id == user.id)
 
-  if description:
-    query = query.filter(Todo.description.contains(description))
+  if q:
+    # Busca full-text ordenada por relevância; o cursor é baseado no id,
+    # então nesse modo só a paginação por offset faz sentido.
+    if after:
+      raise HTTPException(
+        status_code=HTTPStatus.BAD_REQUEST,
+        detail='Cursor pagination is not available with q.'
+      )
 
-  if state:
-    query = query.filter(Todo.state == state)
+    ts_query = func.websearch_to_tsquery(
+      cast(TODO_SEARCH_CONFIG, REGCONFIG), q
+    )
+    query = query.filter(Todo.search_vector.op('@@')(ts_query)).order_by(
+      func.ts_rank(Todo.search_vector, ts_query).desc()
+    )
+
+  query = filter_todos(query, title, description, state)
+  query = paginate(query, Todo.id, after=after, offset=offset, limit=limit)
+  todos, next_cursor = next_page(
+    await session.execute(query), 'id', limit
+  )
 
-  todos = session.scalars(query.offset(offset).limit(limit)).all()
+  if q:
+    next_cursor = None
 
-  return {'todos': todos}
+  return page.store(page_response('todos', todos, next_cursor))
   
 
+@router.get('/summary', response_model=TodoSummary)
+async def todo_summary(
+  request: Request, session: T_ReadSession, user: CurrentUser
+):
+  """Quantidade de todos por estado, lida de `todo_counts`: O(estados)."""
+  page = await ConditionalPage.load(request, session, todos_key(user.id))
+  if (cached := page.cached()) is not None:
+    return cached
+
+  counts = await get_todo_counts(session, user.id)
+  return page.store(get_response_class()({
+    'counts': {state.value: count for state, count in counts.items()},
+    'total': sum(counts.values()),
+  }))
+
+
+class ExportFormat(str, Enum):
+  ndjson = 'ndjson'
+  csv = 'csv'
+
+
+EXPORT_MEDIA_TYPES = {
+  ExportFormat.ndjson: 'application/x-ndjson',
+  ExportFormat.csv: 'text/csv',
+}
+
+# Linhas buscadas por vez no cursor do servidor
+EXPORT_CHUNK_SIZE = 1000
+
+
+def export_lines(rows, export_format: ExportFormat) -> str:
+  if export_format == ExportFormat.ndjson:
+    return ''.join(
+      json.dumps({
+        'id': row.id,
+        'title': row.title,
+        'description': row.description,
+        'state': row.state.value,
+      }) + '\n'
+      for row in rows
+    )
+
+  buffer = io.StringIO()
+  writer = csv.writer(buffer)
+  writer.writerows(
+    (row.id, row.title, row.description, row.state.value) for row in rows
+  )
+  return buffer.getvalue()
+
+
+@router.get('/export')
+async def export_todos(  # noqa: PLR0913, PLR0917
+  session: T_ReadSession,
+  user: CurrentUser,
+  title: str = Query(None),
+  description: str = Query(None),
+  state: TodoState | None = Query(None),
+  export_format: ExportFormat = Query(ExportFormat.ndjson, alias='format'),
+):
+  """
+  Exporta todos os todos do usuário em NDJSON ou CSV.
+
+  As linhas saem de um cursor do servidor, em blocos de
+  `EXPORT_CHUNK_SIZE`, e são escritas à medida que chegam: a memória não
+  cresce com o tamanho do backlog.
+  """
+  query = filter_todos(
+    select(*TODO_COLUMNS).where(Todo.user_id == user.id),
+    title,
+    description,
+    state,
+  ).order_by(Todo.id)
+  # A session da dependência fecha antes do corpo ser enviado; o stream
+  # abre a própria conexão no mesmo engine (primário ou réplica)
+  engine = session.bind
+
+  async def content():
+    if export_format == ExportFormat.csv:
+      yield 'id,title,description,state\n'
+
+    async with engine.connect() as conn:
+      result = await conn.stream(
+        query.execution_options(max_row_buffer=EXPORT_CHUNK_SIZE)
+      )
+      async for rows in result.partitions(EXPORT_CHUNK_SIZE):
+        yield export_lines(rows, export_format)
+
+  return StreamingResponse(
+    content(),
+    media_type=EXPORT_MEDIA_TYPES[export_format],
+    headers={
+      'Content-Disposition': (
+        f'attachment; filename="todos.{export_format.value}"'
+      )
+    },
+  )
+
+
+def ids_param(ids: list[str]):
+  # Um único parâmetro array (`id = ANY(:ids)`) em vez de um por id
+  return any_(bindparam('ids', ids, type_=ARRAY(String)))
+
+
+def bulk_results(ids: list[str], found: dict, status: TodoBulkStatus):
+  """
+  Resultado por item, na ordem recebida.
+
+  `found` mapeia os ids afetados para o todo devolvido (ou None); os demais
+  não existem ou são de outro usuário e saem como `not_found`.
+  """
+  return {
+    'results': [
+      {'id': todo_id, 'status': status, 'todo': found[todo_id]}
+      if todo_id in found
+      else {'id': todo_id, 'status': TodoBulkStatus.not_found}
+      for todo_id in ids
+    ]
+  }
+
+
+@router.post('/bulk', response_model=TodoBulkResult)
+async def bulk_create_todos(
+  data: TodoBulkCreate, user: CurrentUser, session: T_Session
+):
+  result = await session.execute(
+    insert(Todo).returning(*TODO_COLUMNS, sort_by_parameter_order=True),
+    [{**todo.model_dump(), 'user_id': user.id} for todo in data.todos],
+  )
+  rows = result.mappings().all()
+  await todos_changed(
+    session, user.id, state_changes(added=[row['state'] for row in rows])
+  )
+  await session.commit()
+
+  return {
+    'results': [
+      {'id': row['id'], 'status': TodoBulkStatus.created, 'todo': row}
+      for row in rows
+    ]
+  }
+
+
+@router.patch('/bulk', response_model=TodoBulkResult)
+async def bulk_update_todos(
+  data: TodoBulkUpdate, user: CurrentUser, session: T_Session
+):
+  changes = data.changes.model_dump(exclude_unset=True)
+
+  if not changes:
+    raise HTTPException(
+      status_code=HTTPStatus.BAD_REQUEST,
+      detail='No changes to apply.'
+    )
+
+  # O estado anterior vem de um subselect travado no mesmo UPDATE: outra
+  # escrita concorrente não troca o estado entre a leitura e a contagem
+  previous = (
+    select(Todo.id, Todo.state.label('previous_state'))
+    .where(Todo.user_id == user.id, Todo.id == ids_param(data.ids))
+    .with_for_update()
+    .subquery()
+  )
+  result = await session.execute(
+    update(Todo)
+    .where(Todo.id == previous.c.id)
+    .values(**changes)
+    .returning(*TODO_COLUMNS, previous.c.previous_state)
+    .execution_options(synchronize_session=False)
+  )
+  found = {row['id']: row for row in result.mappings()}
+  if found:
+    await todos_changed(
+      session,
+      user.id,
+      state_changes(
+        added=[row['state'] for row in found.values()],
+        removed=[row['previous_state'] for row in found.values()],
+      ),
+    )
+  await session.commit()
+
+  return bulk_results(data.ids, found, TodoBulkStatus.updated)
+
+
+@router.delete('/bulk', response_model=TodoBulkResult)
+async def bulk_delete_todos(
+  data: TodoBulkDelete, user: CurrentUser, session: T_Session
+):
+  result = await session.execute(
+    delete(Todo)
+    .where(Todo.user_id == user.id, Todo.id == ids_param(data.ids))
+    .returning(Todo.id, Todo.state)
+    .execution_options(synchronize_session=False)
+  )
+  removed = dict(result.tuples().all())
+  found = dict.fromkeys(removed)
+  if found:
+    await todos_changed(
+      session, user.id, state_changes(removed=removed.values())
+    )
+  await session.commit()
+
+  return bulk_results(data.ids, found, TodoBulkStatus.deleted)
+
+
 @router.patch('/{todo_id}', response_model=TodoPublic)
-def patch_todo(
+async def patch_todo(
   todo_id: str, session: T_Session, user: CurrentUser, todo: TodoUpdate
 ):
-  db_todo = session.scalar(
-    select(Todo).where(Todo.user_id == user.id, Todo.id == todo_id)
+  # FOR UPDATE: o estado lido aqui é o que a contagem vai descontar
+  db_todo = await session.scalar(
+    select(Todo)
+    .where(Todo.user_id == user.id, Todo.id == todo_id)
+    .with_for_update()
   )
 
   if not db_todo:
@@ -82,20 +368,27 @@ def patch_todo(
       detail='Task not found.'
     )
   
+  previous_state = db_todo.state
   for key, value in todo.model_dump(exclude_unset=True).items():
     setattr(db_todo, key, value)
 
   session.add(db_todo)
-  session.commit()
-  session.refresh(db_todo)
+  await todos_changed(
+    session,
+    user.id,
+    state_changes(added=[db_todo.state], removed=[previous_state]),
+  )
+  await session.commit()
 
   return db_todo
 
 
 @router.delete('/{todo_id}', response_model=Message)
-def delete_todo(todo_id: str, session: T_Session, user: CurrentUser):
-  todo = session.scalar(
-    select(Todo).where(Todo.user_id == user.id, Todo.id == todo_id)
+async def delete_todo(todo_id: str, session: T_Session, user: CurrentUser):
+  todo = await session.scalar(
+    select(Todo)
+    .where(Todo.user_id == user.id, Todo.id == todo_id)
+    .with_for_update()
   )
 
   if not todo:
@@ -103,7 +396,8 @@ def delete_todo(todo_id: str, session: T_Session, user: CurrentUser):
       status_code=HTTPStatus.NOT_FOUND, detail='Task not found.'
     )
   
-  session.delete(todo)
-  session.commit()
+  await session.delete(todo)
+  await todos_changed(session, user.id, state_changes(removed=[todo.state]))
+  await session.commit()
 
   return {'message': 'Task has been deleted successfully.'}
\ No newline at end of file
@@ -1,12 +1,19 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.control.database.database import get_session
+from api.control.database.database import (
+    get_async_session,
+    get_read_session,
+)
+from api.control.database.pagination import next_page, paginate
+from api.control.database.versions import USERS_KEY, bump_users_version
 from api.control.models.models import User
+from api.control.responses.caching import ConditionalPage
+from api.control.responses.responses import page_response
 from api.control.schemas.users_schemas import (
     UserCreate,
     UserList,
@@ -14,16 +21,21 @@ from api.control.schemas.users_schemas import (
     UserUpdate,
 )
 from api.control.schemas.utils_schemas import Message
-from api.control.security.security import get_current_user, get_password_hash
+from api.control.security.identity_cache import get_identity_cache
+from api.control.security.security import (
+    get_current_user,
+    get_password_hash_async,
+)
 
 router = APIRouter(prefix="/users", tags=["users"])
-T_Session = Annotated[Session, Depends(get_session)]
+T_Session = Annotated[AsyncSession, Depends(get_async_session)]
+T_ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 # CRUD Users
 @router.post("/", status_code=HTTPStatus.CREATED, response_model=UserPublic)
-def create_user(user: UserCreate, session: T_Session):
-    db_user = session.scalar(
+async def create_user(user: UserCreate, session: T_Session):
+    db_user = await session.scalar(
         select(User).where(
             (User.username == user.username) | (User.email == user.email)
         )
@@ -41,30 +53,47 @@ def create_user(user: UserCreate, session: T_Session):
                 detail="Email already exists",
             )
 
-    hashed_password = get_password_hash(user.password)
-    user_id = len(session.scalars(select(User).offset(0).limit(100)).all()) + 1
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
-        id=f"{user_id}",
         email=user.email,
         username=user.username,
         password=hashed_password,
     )
 
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    await session.commit()
+    await bump_users_version(session)
 
     return db_user
 
 
 @router.get("/", response_model=UserList)
-def read_users(session: T_Session, skip: int = 0, limit: int = 100):
-    users = session.scalars(select(User).offset(skip).limit(limit)).all()
-    return {"users": users}
+async def read_users(
+    request: Request,
+    session: T_ReadSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+):
+    page = await ConditionalPage.load(request, session, USERS_KEY)
+    if (cached := page.cached()) is not None:
+        return cached
+
+    query = paginate(
+        select(User.id, User.username, User.email),
+        User.id,
+        after=after,
+        offset=skip,
+        limit=limit,
+    )
+    users, next_cursor = next_page(
+        await session.execute(query), "id", limit
+    )
+    return page.store(page_response("users", users, next_cursor))
 
 
 @router.put("/{user_id}", response_model=UserPublic)
-def update_user(
+async def update_user(
     user_id: str,
     user: UserUpdate,
     session: T_Session,
@@ -77,16 +106,17 @@ def update_user(
         )
     current_user.email = user.email
     current_user.username = user.username
-    current_user.password = get_password_hash(user.password)
-    session.commit()
-    session.refresh(current_user)
+    current_user.password = await get_password_hash_async(user.password)
+    await session.commit()
+    await bump_users_version(session)
+    get_identity_cache().invalidate_user(user_id)
 
     return current_user
 
 
 
 @router.delete("/{user_id}", response_model=Message)
-def delete_user(
+async def delete_user(
     user_id: str, 
     session: T_Session, 
     current_user: CurrentUser
@@ -96,7 +126,9 @@ def delete_user(
             status_code=HTTPStatus.FORBIDDEN, detail="Not enough permissions"
         )
 
-    session.delete(current_user)
-    session.commit()
+    await session.delete(current_user)
+    await session.commit()
+    await bump_users_version(session)
+    get_identity_cache().invalidate_user(user_id)
 
     return {"message": "User deleted."}
@@ -7,3 +7,9 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: str | None = None
+
+
+class UserIdentity(BaseModel):
+    id: str
+    email: str
+    username: str
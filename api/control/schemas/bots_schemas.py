@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from api.control.models.models import BotJobStatus
+
+
+class BotPublic(BaseModel):
+    name: str
+    max_concurrency: int
+    timeout: float | None
+
+
+class BotList(BaseModel):
+    bots: list[BotPublic]
+
+
+class BotRun(BaseModel):
+    params: dict = {}
+
+
+class BotJobPublic(BaseModel):
+    id: str
+    bot: str
+    status: BotJobStatus
+    params: dict
+    result: dict | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    model_config = ConfigDict(from_attributes=True)
@@ -1,7 +1,12 @@
-from pydantic import BaseModel
+from enum import Enum
+
+from pydantic import BaseModel, Field, field_validator
 
 from api.control.models.models import TodoState
 
+# Máximo de itens por requisição nas rotas /todos/bulk
+TODO_BULK_LIMIT = 5000
+
 class TodoSchema(BaseModel):
   title: str
   description: str
@@ -12,8 +17,45 @@ class TodoPublic(TodoSchema):
 
 class TodoList(BaseModel):
   todos: list[TodoPublic]
+  next_cursor: str | None = None
+
+class TodoSummary(BaseModel):
+  counts: dict[TodoState, int]
+  total: int
 
 class TodoUpdate(BaseModel):
   title: str | None = None
   description: str | None = None
-  state: TodoState | None = None
\ No newline at end of file
+  state: TodoState | None = None
+
+  # Campos omitidos ficam como estão; `null` explícito violaria o NOT NULL
+  @field_validator('title', 'description', 'state')
+  @classmethod
+  def reject_null(cls, value):
+    if value is None:
+      raise ValueError('must not be null')
+    return value
+
+class TodoBulkCreate(BaseModel):
+  todos: list[TodoSchema] = Field(min_length=1, max_length=TODO_BULK_LIMIT)
+
+class TodoBulkUpdate(BaseModel):
+  ids: list[str] = Field(min_length=1, max_length=TODO_BULK_LIMIT)
+  changes: TodoUpdate
+
+class TodoBulkDelete(BaseModel):
+  ids: list[str] = Field(min_length=1, max_length=TODO_BULK_LIMIT)
+
+class TodoBulkStatus(str, Enum):
+  created = 'created'
+  updated = 'updated'
+  deleted = 'deleted'
+  not_found = 'not_found'
+
+class TodoBulkItem(BaseModel):
+  id: str
+  status: TodoBulkStatus
+  todo: TodoPublic | None = None
+
+class TodoBulkResult(BaseModel):
+  results: list[TodoBulkItem]
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from pwdlib import PasswordHash
+
+
+class HashingBusy(Exception):
+    """A fila do pool de hashing está cheia."""
+
+
+class PasswordHasher:
+    """
+    Executa o Argon2 num pool dedicado e limitado.
+
+    O argon2-cffi libera o GIL durante o hash, então um pool de threads já
+    usa vários núcleos sem o custo de serializar para processos. O número
+    de tarefas aceitas (em execução + na fila) é limitado; acima disso
+    `HashingBusy` é levantada na hora, em vez de segurar a requisição.
+    """
+
+    def __init__(
+        self,
+        context: PasswordHash | None = None,
+        workers: int = 4,
+        queue_size: int = 32,
+    ):
+        self.context = context or PasswordHash.recommended()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='argon2'
+        )
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def _submit(self, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def hash(self, password: str) -> str:
+        return self._submit(self.context.hash, password).result()
+
+    def verify_and_update(
+        self, password: str, hashed: str
+    ) -> tuple[bool, str | None]:
+        return self._submit(
+            self.context.verify_and_update, password, hashed
+        ).result()
+
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(
+            self._submit(self.context.hash, password)
+        )
+
+    async def verify_and_update_async(
+        self, password: str, hashed: str
+    ) -> tuple[bool, str | None]:
+        return await asyncio.wrap_future(
+            self._submit(self.context.verify_and_update, password, hashed)
+        )
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
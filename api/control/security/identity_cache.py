@@ -0,0 +1,131 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from api.control.schemas.auth_schemas import UserIdentity
+
+
+class IdentityCache(ABC):
+    """
+    Interface do cache token -> identidade.
+
+    A implementação padrão fica em memória do processo; um backend
+    compartilhado (ex.: Redis) só precisa implementar estes métodos e ser
+    registrado com `set_identity_cache`. Um backend incompleto falha ao
+    ser instanciado, não na primeira requisição.
+    """
+
+    @abstractmethod
+    def get(self, token: str) -> UserIdentity | None:
+        ...
+
+    @abstractmethod
+    def set(self, token: str, identity: UserIdentity, expires_at: float):
+        ...
+
+    @abstractmethod
+    def invalidate_user(self, user_id: str):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+
+class TTLIdentityCache(IdentityCache):
+    """
+    Cache LRU limitado, com expiração por entrada (a do próprio token,
+    limitada a `ttl`).
+
+    Fica na memória do processo: `invalidate_user` só limpa o worker que
+    atendeu a escrita. Nos demais workers a identidade antiga vale até o
+    `ttl`, por isso o padrão é curto.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[UserIdentity, float]] = (
+            OrderedDict()
+        )
+        self._tokens_by_user: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> UserIdentity | None:
+        with self._lock:
+            entry = self._entries.get(token)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            identity, expires_at = entry
+            if expires_at <= time.time():
+                self._discard(token)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return identity
+
+    def set(self, token: str, identity: UserIdentity, expires_at: float):
+        expires_at = min(expires_at, time.time() + self.ttl)
+
+        with self._lock:
+            self._discard(token)
+            self._entries[token] = (identity, expires_at)
+            self._tokens_by_user.setdefault(identity.id, set()).add(token)
+
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+
+    def invalidate_user(self, user_id: str):
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_id, set()):
+                self._entries.pop(token, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+            }
+
+    def _discard(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+
+        tokens = self._tokens_by_user.get(entry[0].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[0].id]
+
+
+_backend: dict[str, IdentityCache] = {'cache': TTLIdentityCache()}
+
+
+def get_identity_cache() -> IdentityCache:
+    return _backend['cache']
+
+
+def set_identity_cache(cache: IdentityCache):
+    _backend['cache'] = cache
@@ -6,16 +6,34 @@ from fastapi.security import OAuth2PasswordBearer
 from jwt import DecodeError, ExpiredSignatureError, decode, encode
 from pwdlib import PasswordHash
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from zoneinfo import ZoneInfo
 
-from api.control.database.database import get_session
+from api.control.database.database import get_async_session
 from api.control.models.models import User
-from api.control.schemas.auth_schemas import TokenData
-from api.control.settings.settings import Settings
-
-settings = Settings()
+from api.control.schemas.auth_schemas import TokenData, UserIdentity
+from api.control.security.hashing import HashingBusy, PasswordHasher
+from api.control.security.identity_cache import (
+    TTLIdentityCache,
+    get_identity_cache,
+    set_identity_cache,
+)
+from api.control.settings.settings import get_settings
+
+settings = get_settings()
 pwd_context = PasswordHash.recommended()
+password_hasher = PasswordHasher(
+    pwd_context,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
+set_identity_cache(
+    TTLIdentityCache(
+        maxsize=settings.IDENTITY_CACHE_SIZE,
+        ttl=settings.IDENTITY_CACHE_TTL_SECONDS,
+    )
+)
 
 
 def create_access_token(data: dict):
@@ -31,44 +49,133 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 
+def _hashing_busy_exception():
+    return HTTPException(
+        status_code=HTTPStatus.TOO_MANY_REQUESTS,
+        detail="Too many requests, try again later",
+        headers={"Retry-After": "1"},
+    )
+
+
 def get_password_hash(password: str):
-    return pwd_context.hash(password)
+    try:
+        return password_hasher.hash(password)
+    except HashingBusy:
+        raise _hashing_busy_exception()
 
 
 def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
+    valid, _ = verify_and_update_password(plain_password, hashed_password)
+    return valid
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    """
+    Verifica a senha e devolve `(valid, new_hash)`.
 
-def get_current_user(
-    session: Session = Depends(get_session),
-    token: str = Depends(oauth2_scheme),
+    `new_hash` só vem preenchido quando os parâmetros do hash armazenado
+    estão desatualizados e a senha deve ser regravada.
+    """
+    try:
+        return password_hasher.verify_and_update(
+            plain_password, hashed_password
+        )
+    except HashingBusy:
+        raise _hashing_busy_exception()
+
+
+async def get_password_hash_async(password: str):
+    try:
+        return await password_hasher.hash_async(password)
+    except HashingBusy:
+        raise _hashing_busy_exception()
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
 ):
-    credentials_exception = HTTPException(
+    try:
+        return await password_hasher.verify_and_update_async(
+            plain_password, hashed_password
+        )
+    except HashingBusy:
+        raise _hashing_busy_exception()
+
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
+
+
+def _credentials_exception():
+    return HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def decode_token(token: str) -> tuple[TokenData, float]:
+    """Valida o JWT e devolve os dados do token e o `exp` (epoch)."""
     try:
         payload = decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         username: str = payload.get("sub")
         if not username:
-            raise credentials_exception
+            raise _credentials_exception()
         token_data = TokenData(username=username)
     except DecodeError:
-        raise credentials_exception
+        raise _credentials_exception()
     except ExpiredSignatureError:
-        raise credentials_exception
+        raise _credentials_exception()
+
+    return token_data, payload["exp"]
+
 
-    user = session.scalar(
+async def get_current_user(
+    session: AsyncSession = Depends(get_async_session),
+    token: str = Depends(oauth2_scheme),
+):
+    token_data, _ = decode_token(token)
+
+    user = await session.scalar(
         select(User).where(User.email == token_data.username)
     )
 
     if not user:
-        raise credentials_exception
+        raise _credentials_exception()
 
     return user
+
+
+async def get_current_identity(
+    session: AsyncSession = Depends(get_async_session),
+    token: str = Depends(oauth2_scheme),
+) -> UserIdentity:
+    """
+    Versão leve de `get_current_user` para as rotas que só precisam do id.
+
+    A identidade fica em cache até o token expirar, então requisições
+    seguidas com o mesmo token não decodificam o JWT nem consultam o banco.
+    """
+    cache = get_identity_cache()
+    identity = cache.get(token)
+
+    if identity is not None:
+        return identity
+
+    token_data, expires_at = decode_token(token)
+
+    result = await session.execute(
+        select(User.id, User.email, User.username).where(
+            User.email == token_data.username
+        )
+    )
+    row = result.first()
+
+    if not row:
+        raise _credentials_exception()
+
+    identity = UserIdentity(id=row.id, email=row.email, username=row.username)
+    cache.set(token, identity, expires_at)
+
+    return identity
@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -10,6 +13,44 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    ID_GENERATOR: str = "ulid"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DATABASE_REPLICA_URLS: list[str] = []
+    DB_REPLICA_HEALTH_CHECK_SECONDS: float = 5
+    IDENTITY_CACHE_SIZE: int = 10_000
+    # O cache é por processo: com vários workers, um usuário apagado ou
+    # alterado segue autenticando nos outros workers por até este prazo
+    IDENTITY_CACHE_TTL_SECONDS: int = 30
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    METRICS_ENABLED: bool = True
+    PROFILING_ENABLED: bool = False
+    PROFILING_ADMINS: list[str] = []
+    PROFILING_OUTPUT_DIR: str = "/tmp"
+    DOCUMENTS_DIR: str = "api/bots/bot_boa_vindas/bot/pdf_output"
+    DOCUMENTS_CACHE_SIZE: int = 1024
+    DOCUMENTS_METADATA_TTL_SECONDS: float = 5
+    DOCUMENTS_MAX_AGE_SECONDS: int = 3600
+    BOTS_MAX_PROCESSES: int = 4
+    BOTS_POLL_INTERVAL_SECONDS: float = 1.0
+    BOTS_LEASE_SECONDS: float = 60
+    JSON_RESPONSE_CLASS: Literal["orjson", "json"] = "orjson"
+    RESPONSE_CACHE_SIZE: int = 1024
+    RESPONSE_CACHE_TTL_SECONDS: float = 5
+    DB_WARMUP: bool = True
+    DB_WARMUP_TIMEOUT_SECONDS: float = 5
+
+    # Servidor (python -m api.server); o pool do banco é por worker
+    WEB_HOST: str = "0.0.0.0"
+    WEB_PORT: int = 8000
+    WEB_WORKERS: int = 1
+    WEB_BACKLOG: int = 2048
+    WEB_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    WEB_MAX_REQUESTS: int | None = None
     
     # Microsoft
     CLIENT_ID: str
@@ -18,4 +59,30 @@ class Settings(BaseSettings):
     AUTHORITY: str
     REDIRECT_URI: str
     USER_MC: str
-    USER_PASSWORD_MC: str
\ No newline at end of file
+    USER_PASSWORD_MC: str
+    MSAL_CACHE_PATH: str | None = None
+    MSAL_CACHE_ENCRYPTION_KEY: str | None = None
+    MSAL_REFRESH_MARGIN_SECONDS: int = 300
+
+    # Microsoft Graph
+    GRAPH_BASE_URL: str = "https://graph.microsoft.com/v1.0"
+    GRAPH_TIMEOUT_SECONDS: float = 10.0
+    GRAPH_MAX_RETRIES: int = 3
+    GRAPH_HTTP2: bool = True
+    GRAPH_BATCH_CONCURRENCY: int = 4
+
+    # Fila de webhooks
+    WEBHOOK_WORKERS: int = 2
+    WEBHOOK_BATCH_SIZE: int = 10
+    WEBHOOK_POLL_INTERVAL_SECONDS: float = 1.0
+    WEBHOOK_VISIBILITY_TIMEOUT_SECONDS: int = 60
+    WEBHOOK_MAX_ATTEMPTS: int = 5
+    WEBHOOK_RETRY_BACKOFF_SECONDS: float = 2.0
+    # Segredo da assinatura, conferido em cada notificação (sem padrão)
+    WEBHOOK_CLIENT_STATE: str
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Settings lidas uma vez por processo (env e `.env`)."""
+    return Settings()
@@ -0,0 +1,300 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+from collections.abc import Callable
+from datetime import timedelta
+from http import HTTPStatus
+from typing import NamedTuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from api.control.graph.client import RETRY_STATUSES, GraphClient, GraphError
+from api.control.models.models import WebhookEvent, WebhookStatus
+
+logger = logging.getLogger(__name__)
+
+WELCOME_TRIGGER = 'Ativar Boas Vindas'
+WELCOME_MESSAGE = 'Iniciando Automação Boas Vindas...'
+
+
+class ClaimedEvent(NamedTuple):
+    id: str
+    payload: dict
+    attempts: int
+
+
+def notification_id(payload: dict) -> str:
+    """Chave de deduplicação: o `id` do emissor ou o hash do corpo."""
+    if payload.get('id'):
+        return str(payload['id'])
+
+    body = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def validate_webhook_payload(payload: dict, client_state: str):
+    """
+    Recusa notificações que não vieram da nossa assinatura ou que o worker
+    não conseguiria processar. Levanta `ValueError` com o motivo.
+    """
+    received = payload.get('clientState')
+    if not isinstance(received, str) or not hmac.compare_digest(
+        received.encode(), client_state.encode()
+    ):
+        raise ValueError('clientState inválido.')
+
+    message = payload.get('message') or {}
+    if not isinstance(message, dict):
+        raise ValueError('Campo message inválido.')
+    body = message.get('body') or {}
+    if not isinstance(body, dict):
+        raise ValueError('Campo message.body inválido.')
+
+    if body.get('content') != WELCOME_TRIGGER:
+        return
+
+    conversation = payload.get('conversation')
+    chat_id = (
+        conversation.get('id') if isinstance(conversation, dict) else None
+    )
+    if not isinstance(chat_id, str) or not chat_id:
+        raise ValueError('Campo conversation.id ausente.')
+
+
+def enqueue_webhook(session: Session, payload: dict) -> bool:
+    """Grava a notificação na fila. Devolve False se ela já existia."""
+    stmt = (
+        insert(WebhookEvent)
+        .values(notification_id=notification_id(payload), payload=payload)
+        .on_conflict_do_nothing(index_elements=['notification_id'])
+        .returning(WebhookEvent.id)
+    )
+    created = session.execute(stmt).scalar() is not None
+    session.commit()
+
+    return created
+
+
+def claim_events(
+    session: Session, limit: int, visibility_timeout: float
+) -> list[ClaimedEvent]:
+    """
+    Reserva até `limit` eventos prontos para processar.
+
+    O `SKIP LOCKED` deixa vários workers consumirem a fila sem pegar o
+    mesmo evento. O evento reservado volta a ficar disponível depois de
+    `visibility_timeout` segundos, caso o worker morra sem concluir.
+    """
+    events = session.scalars(
+        select(WebhookEvent)
+        .where(
+            WebhookEvent.status.in_((
+                WebhookStatus.pending,
+                WebhookStatus.processing,
+            )),
+            WebhookEvent.next_attempt_at <= func.now(),
+        )
+        .order_by(WebhookEvent.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    claimed = []
+    for event in events:
+        event.status = WebhookStatus.processing
+        event.attempts += 1
+        event.next_attempt_at = func.now() + timedelta(
+            seconds=visibility_timeout
+        )
+        claimed.append(ClaimedEvent(event.id, event.payload, event.attempts))
+
+    session.commit()
+
+    return claimed
+
+
+def complete_event(session: Session, event_id: str):
+    session.execute(
+        update(WebhookEvent)
+        .where(WebhookEvent.id == event_id)
+        .values(status=WebhookStatus.done, last_error=None)
+    )
+    session.commit()
+
+
+def fail_event(  # noqa: PLR0913, PLR0917
+    session: Session,
+    event: ClaimedEvent,
+    error: str,
+    max_attempts: int,
+    backoff: float,
+    max_backoff: float,
+    retry: bool = True,
+):
+    """Agenda nova tentativa com backoff ou move o evento para `dead`."""
+    values = {'last_error': error}
+
+    if not retry or event.attempts >= max_attempts:
+        values['status'] = WebhookStatus.dead
+    else:
+        delay = min(backoff * 2 ** (event.attempts - 1), max_backoff)
+        values['status'] = WebhookStatus.pending
+        values['next_attempt_at'] = func.now() + timedelta(seconds=delay)
+
+    session.execute(
+        update(WebhookEvent)
+        .where(WebhookEvent.id == event.id)
+        .values(**values)
+    )
+    session.commit()
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Erros 4xx do Graph (fora 429) e payloads malformados não mudam numa
+    nova tentativa.
+    """
+    if isinstance(error, (KeyError, TypeError, ValueError)):
+        return False
+
+    if isinstance(error, GraphError):
+        return (
+            error.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+            or error.status_code in RETRY_STATUSES
+        )
+
+    return True
+
+
+async def handle_webhook_payload(graph: GraphClient, token: str, payload):
+    message = payload.get('message') or {}
+    body = message.get('body') or {}
+
+    if body.get('content') != WELCOME_TRIGGER:
+        return
+
+    chat_id = payload['conversation']['id']
+    await graph.post(
+        f'/chats/{chat_id}/messages',
+        token,
+        json={'body': {'content': WELCOME_MESSAGE}},
+    )
+    logger.info('Mensagem de boas-vindas enviada para o chat %s', chat_id)
+
+
+class WebhookWorkerPool:
+    """
+    Workers assíncronos que consomem a fila `webhook_events`.
+
+    Cada worker reserva um lote, processa evento a evento e volta a
+    consultar a fila; com a fila vazia espera `poll_interval`. As operações
+    de banco rodam em threads para não travar o event loop.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        session_factory: Callable[[], Session],
+        graph_factory: Callable[[], GraphClient],
+        token_provider: Callable[[], str],
+        *,
+        workers: int = 2,
+        batch_size: int = 10,
+        poll_interval: float = 1.0,
+        visibility_timeout: float = 60,
+        max_attempts: int = 5,
+        backoff: float = 2.0,
+        max_backoff: float = 300,
+    ):
+        self.session_factory = session_factory
+        self.graph_factory = graph_factory
+        self.token_provider = token_provider
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._stopping = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def _claim(self) -> list[ClaimedEvent]:
+        with self.session_factory() as session:
+            return claim_events(
+                session, self.batch_size, self.visibility_timeout
+            )
+
+    def _complete(self, event: ClaimedEvent):
+        with self.session_factory() as session:
+            complete_event(session, event.id)
+
+    def _fail(self, event: ClaimedEvent, error: Exception):
+        with self.session_factory() as session:
+            fail_event(
+                session,
+                event,
+                repr(error),
+                self.max_attempts,
+                self.backoff,
+                self.max_backoff,
+                retry=is_retryable(error),
+            )
+
+    async def _process(self, event: ClaimedEvent):
+        try:
+            token = await asyncio.to_thread(self.token_provider)
+            await handle_webhook_payload(
+                self.graph_factory(), token, event.payload
+            )
+        except Exception as e:
+            logger.warning(
+                'Falha no webhook %s (tentativa %s): %r',
+                event.id,
+                event.attempts,
+                e,
+            )
+            await asyncio.to_thread(self._fail, event, e)
+        else:
+            await asyncio.to_thread(self._complete, event)
+
+    async def run_once(self) -> int:
+        """Processa um lote da fila e devolve quantos eventos pegou."""
+        events = await asyncio.to_thread(self._claim)
+
+        for event in events:
+            await self._process(event)
+
+        return len(events)
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception('Erro ao consumir a fila de webhooks')
+                processed = 0
+
+            if not processed:
+                try:
+                    await asyncio.wait_for(
+                        self._stopping.wait(), self.poll_interval
+                    )
+                except TimeoutError:
+                    pass
+
+    def start(self):
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._run()) for _ in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Para de reservar eventos e espera o lote em andamento terminar."""
+        self._stopping.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
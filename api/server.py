@@ -0,0 +1,155 @@
+"""
+Launcher de produção: N workers uvicorn com o app pré-carregado.
+
+O processo mestre importa `api.app` e abre o socket uma vez; cada worker
+nasce de um `fork` e já começa com o código carregado (páginas
+compartilhadas, sem repetir o import). Engines, pools e clientes só são
+criados no lifespan de cada worker, depois do fork.
+
+O mestre reinicia workers que morrem e, com SIGTERM/SIGINT, repassa o
+sinal: cada worker para de aceitar conexões, termina as requisições em
+andamento (até `WEB_GRACEFUL_TIMEOUT_SECONDS`) e roda o shutdown do
+lifespan. Quem passar do prazo leva SIGKILL.
+
+Uso:
+    python -m api.server [--workers N] [--host HOST] [--port PORTA]
+"""
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+from api.control.settings.settings import Settings, get_settings
+
+logger = logging.getLogger('api.server')
+
+# Pausa mínima entre reinícios, para um worker que quebra na partida não
+# virar um loop de fork
+RESPAWN_DELAY_SECONDS = 1.0
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, settings: Settings):
+    # O uvicorn instala os próprios handlers de sinal no event loop
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    config = uvicorn.Config(
+        app,
+        lifespan='on',
+        backlog=settings.WEB_BACKLOG,
+        timeout_graceful_shutdown=settings.WEB_GRACEFUL_TIMEOUT_SECONDS,
+        limit_max_requests=settings.WEB_MAX_REQUESTS,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Supervisor:
+    def __init__(self, app, sock: socket.socket, settings: Settings):
+        self.app = app
+        self.sock = sock
+        self.settings = settings
+        self.workers: set[int] = set()
+        self.stopping = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(self.app, self.sock, self.settings)
+            except BaseException:
+                logger.exception('Worker %s falhou', os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+
+        self.workers.add(pid)
+        logger.info('Worker %s iniciado', pid)
+
+    def stop(self, signum, frame):
+        if self.stopping:
+            return
+        self.stopping = True
+        logger.info('Encerrando %s workers', len(self.workers))
+        for pid in self.workers:
+            os.kill(pid, signal.SIGTERM)
+
+    def reap(self) -> list[int]:
+        exited = []
+        while self.workers:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                break
+            self.workers.discard(pid)
+            exited.append(pid)
+        return exited
+
+    def run(self, workers: int):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        for _ in range(workers):
+            self.spawn()
+
+        deadline = None
+        while self.workers:
+            for pid in self.reap():
+                if not self.stopping:
+                    logger.warning('Worker %s saiu; reiniciando', pid)
+                    time.sleep(RESPAWN_DELAY_SECONDS)
+                    self.spawn()
+
+            if self.stopping and deadline is None:
+                # Prazo do uvicorn + folga para o shutdown do lifespan
+                deadline = (
+                    time.monotonic()
+                    + self.settings.WEB_GRACEFUL_TIMEOUT_SECONDS
+                    + 5
+                )
+            if deadline is not None and time.monotonic() > deadline:
+                for pid in self.workers:
+                    os.kill(pid, signal.SIGKILL)
+                deadline = float('inf')
+
+            time.sleep(0.1)
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(prog='python -m api.server')
+    parser.add_argument('--host', default=settings.WEB_HOST)
+    parser.add_argument('--port', type=int, default=settings.WEB_PORT)
+    parser.add_argument('--workers', type=int, default=settings.WEB_WORKERS)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format='%(asctime)s %(name)s %(message)s'
+    )
+
+    # Pré-carrega o app no mestre; nada aqui abre conexões ou threads
+    from api.app import app  # noqa: PLC0415
+
+    sock = bind_socket(args.host, args.port, settings.WEB_BACKLOG)
+    logger.info(
+        'Servindo em %s:%s com %s workers', args.host, args.port, args.workers
+    )
+    Supervisor(app, sock, settings).run(max(args.workers, 1))
+
+
+if __name__ == '__main__':
+    main()
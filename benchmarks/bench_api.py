@@ -0,0 +1,316 @@
+"""
+Suíte de carga da API: login, todos (criar/listar/editar) e usuários.
+
+Semeia `--users` usuários com `--todos` todos cada (factories de
+`tests/factories.py`) e roda cada cenário com `--concurrency` clientes
+até completar `--requests` chamadas, primeiro com o `app` em processo
+(ASGI) e depois via uvicorn numa thread. Reporta requisições/s e latência
+p50/p95/p99 por cenário e grava tudo em JSON para comparar execuções.
+
+Com `--compare` o resultado é confrontado com um JSON anterior; o script
+sai com código 1 se algum cenário perder mais que `--max-regression` de
+req/s ou ganhar isso em p95.
+
+Uso:
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.bench_api
+    python -m benchmarks.bench_api --compare benchmarks/results/base.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http import HTTPStatus
+from pathlib import Path
+
+import httpx
+import uvicorn
+from sqlalchemy.orm import Session
+
+from api.app import app
+from api.control.database.database import dispose_engines, get_engine
+from api.control.models.models import table_registry
+from api.control.security.security import (
+    create_access_token,
+    get_password_hash,
+)
+from tests.factories import TodoFactory, UserFactory
+
+PASSWORD = 'benchbench'
+LIMIT = 20
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+
+def seed(users: int, todos: int) -> list[dict]:
+    table_registry.metadata.drop_all(get_engine())
+    table_registry.metadata.create_all(get_engine())
+
+    password = get_password_hash(PASSWORD)
+    with Session(get_engine()) as session:
+        db_users = UserFactory.build_batch(users, password=password)
+        session.add_all(db_users)
+        session.flush()
+
+        accounts = []
+        for user in db_users:
+            db_todos = TodoFactory.build_batch(todos, user_id=user.id)
+            session.add_all(db_todos)
+            session.flush()
+            accounts.append({
+                'email': user.email,
+                'headers': {
+                    'Authorization': 'Bearer '
+                    + create_access_token(data={'sub': user.email})
+                },
+                'todo_ids': [todo.id for todo in db_todos],
+            })
+        session.commit()
+
+    return accounts
+
+
+def scenarios(accounts: list[dict]) -> dict:
+    """Cada cenário recebe o cliente e o índice da requisição."""
+
+    def account(i):
+        return accounts[i % len(accounts)]
+
+    def todo_id(i):
+        ids = account(i)['todo_ids']
+        return ids[(i // len(accounts)) % len(ids)]
+
+    return {
+        'login': lambda client, i: client.post(
+            '/auth/token',
+            data={'username': account(i)['email'], 'password': PASSWORD},
+        ),
+        'create_todo': lambda client, i: client.post(
+            '/todos/',
+            headers=account(i)['headers'],
+            json={'title': f'bench {i}', 'description': 'x', 'state': 'todo'},
+        ),
+        'list_todos': lambda client, i: client.get(
+            f'/todos/?limit={LIMIT}', headers=account(i)['headers']
+        ),
+        'patch_todo': lambda client, i: client.patch(
+            f'/todos/{todo_id(i)}',
+            headers=account(i)['headers'],
+            json={'state': 'doing' if i % 2 else 'done'},
+        ),
+        'list_users': lambda client, i: client.get(
+            f'/users/?limit={LIMIT}', headers=account(i)['headers']
+        ),
+    }
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+        'mean_ms': round(statistics.fmean(latencies), 2),
+        'p50_ms': round(statistics.median(latencies), 2),
+        'p95_ms': round(quantiles[94], 2),
+        'p99_ms': round(quantiles[98], 2),
+    }
+
+
+async def run_scenario(client, request, total, concurrency, warmup) -> dict:
+    for i in range(warmup):
+        await request(client, i)
+
+    counter = itertools.count(warmup)
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while (i := next(counter)) < total + warmup:
+            start = time.perf_counter()
+            response = await request(client, i)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= HTTPStatus.BAD_REQUEST:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run_suite(client, accounts, args) -> dict:
+    results = {}
+    for name, request in scenarios(accounts).items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = await run_scenario(
+            client, request, args.requests, args.concurrency, args.warmup
+        )
+        print_result(name, results[name])
+    return results
+
+
+async def run_asgi(accounts, args) -> dict:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+        base_url='http://bench',
+        timeout=None,
+    ) as client:
+        results = await run_suite(client, accounts, args)
+
+    # As conexões assíncronas ficam presas a este event loop
+    await dispose_engines()
+    return results
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(accounts, args) -> dict:
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=port, log_level='warning', lifespan='off')
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    try:
+        async with httpx.AsyncClient(
+            base_url=f'http://127.0.0.1:{port}',
+            limits=httpx.Limits(max_connections=args.concurrency),
+            timeout=None,
+        ) as client:
+            return await run_suite(client, accounts, args)
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def print_result(name: str, result: dict):
+    print(
+        f'  {name:<12} {result["rps"]:8.1f} req/s'
+        f' | p50 {result["p50_ms"]:7.2f}ms p95 {result["p95_ms"]:7.2f}ms'
+        f' p99 {result["p99_ms"]:7.2f}ms | erros {result["errors"]}'
+    )
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, max_regression: float) -> bool:
+    """Imprime as variações e diz se algum cenário regrediu."""
+    regressed = False
+    print(f'\nComparação com {baseline["commit"]} ({baseline["started_at"]})')
+
+    for transport, results in current['results'].items():
+        for name, result in results.items():
+            base = baseline['results'].get(transport, {}).get(name)
+            if base is None:
+                continue
+
+            rps = result['rps'] / base['rps'] - 1
+            p95 = result['p95_ms'] / base['p95_ms'] - 1
+            worse = rps < -max_regression or p95 > max_regression
+            regressed = regressed or worse
+            print(
+                f'  {transport:<8} {name:<12} req/s {rps:+7.1%}'
+                f' | p95 {p95:+7.1%}{"  REGRESSÃO" if worse else ""}'
+            )
+
+    return regressed
+
+
+async def run(args) -> dict:
+    accounts = seed(args.users, args.todos)
+    results = {}
+
+    try:
+        # O ASGI vem primeiro: ele descarta o pool antes do uvicorn
+        for transport in ('asgi', 'uvicorn'):
+            if transport not in args.transport:
+                continue
+            print(f'{transport}:')
+            runner = run_asgi if transport == 'asgi' else run_uvicorn
+            results[transport] = await runner(accounts, args)
+    finally:
+        table_registry.metadata.drop_all(get_engine())
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--todos', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument(
+        '--transport',
+        nargs='+',
+        choices=('asgi', 'uvicorn'),
+        default=['asgi', 'uvicorn'],
+    )
+    parser.add_argument(
+        '--only', nargs='+', help='cenários a rodar (padrão: todos)'
+    )
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--compare', type=Path)
+    parser.add_argument('--max-regression', type=float, default=0.10)
+    args = parser.parse_args()
+
+    # Uma linha de log por requisição distorce a medição
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+
+    started_at = datetime.now(timezone.utc)
+    report = {
+        'started_at': started_at.isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'params': {
+            'users': args.users,
+            'todos': args.todos,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'warmup': args.warmup,
+        },
+        'results': asyncio.run(run(args)),
+    }
+
+    output = args.output or RESULTS_DIR / (
+        f'{started_at:%Y%m%d-%H%M%S}-{report["commit"] or "local"}.json'
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f'\nResultados em {output}')
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+        if compare(report, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark de carga: rota síncrona (threadpool) x rota assíncrona.
+
+Semeia um usuário com `--todos` todos e dispara `--clients` clientes
+simultâneos, cada um fazendo `--requests` chamadas a `GET /todos/?limit=20`.
+O modo `async` usa a rota real (AsyncSession); o modo `sync` usa uma cópia
+da mesma consulta com `Session`, rodando no threadpool do Starlette.
+Reporta requisições/s e latência p50/p95/p99 de cada modo.
+
+Uso:
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.bench_async_load
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from http import HTTPStatus
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from api.app import app
+from api.control.database.database import get_engine
+from api.control.database.pagination import next_page, paginate
+from api.control.models.ids import generate_id
+from api.control.models.models import Todo, User, table_registry
+from api.control.schemas.auth_schemas import UserIdentity
+from api.control.schemas.todos_schemas import TodoList
+from api.control.security.security import (
+    create_access_token,
+    get_current_identity,
+)
+
+LIMIT = 20
+
+sync_app = FastAPI()
+
+
+@sync_app.get('/todos/', response_model=TodoList)
+def list_todos_sync(user: UserIdentity = Depends(get_current_identity)):
+    # A Session fica dentro da rota: com `Depends(get_session)` o fechamento
+    # também disputa o threadpool e, com 500 clientes, o pool trava
+    query = paginate(
+        select(Todo).where(Todo.user_id == user.id), Todo.id, limit=LIMIT
+    )
+    with Session(get_engine()) as session:
+        todos, next_cursor = next_page(session.scalars(query), 'id', LIMIT)
+        return {'todos': todos, 'next_cursor': next_cursor}
+
+
+def seed(todos: int) -> str:
+    table_registry.metadata.drop_all(get_engine())
+    table_registry.metadata.create_all(get_engine())
+
+    with Session(get_engine()) as session:
+        user = User(username='bench', password='x', email='bench@bench.com')
+        session.add(user)
+        session.commit()
+
+        session.execute(
+            insert(Todo),
+            [
+                {
+                    'id': generate_id(),
+                    'title': f'todo {i}',
+                    'description': 'bench',
+                    'state': 'todo',
+                    'user_id': user.id,
+                }
+                for i in range(todos)
+            ],
+        )
+        session.commit()
+
+    return create_access_token(data={'sub': 'bench@bench.com'})
+
+
+async def worker(client, requests, latencies, errors):
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await client.get(f'/todos/?limit={LIMIT}')
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code != HTTPStatus.OK:
+            errors.append(response.status_code)
+
+
+async def run_mode(label, target, token, clients, requests):
+    latencies: list[float] = []
+    errors: list[int] = []
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(
+            app=target, raise_app_exceptions=False
+        ),
+        base_url='http://bench',
+        headers={'Authorization': f'Bearer {token}'},
+        timeout=None,
+    ) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            worker(client, requests, latencies, errors)
+            for _ in range(clients)
+        ))
+        elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f'{label:>5}: {len(latencies) / elapsed:8.1f} req/s'
+        f' | p50 {statistics.median(latencies):7.2f}ms'
+        f' p95 {quantiles[94]:7.2f}ms p99 {quantiles[98]:7.2f}ms'
+        f' | erros {len(errors)}'
+    )
+
+
+async def run(clients: int, requests: int, todos: int):
+    token = seed(todos)
+
+    await run_mode('sync', sync_app, token, clients, requests)
+    await run_mode('async', app, token, clients, requests)
+
+    table_registry.metadata.drop_all(get_engine())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=10)
+    parser.add_argument('--todos', type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.clients, args.requests, args.todos))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark de rows/s: rotas por item x rotas /todos/bulk.
+
+Para `--rows` todos, mede criar, mover (PATCH do state) e apagar usando as
+rotas de um item (até `--concurrency` requisições simultâneas) e as rotas
+em lote (lotes de `--batch` itens).
+
+Uso:
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.bench_bulk_todos
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from sqlalchemy.orm import Session
+
+from api.app import app
+from api.control.database.database import get_engine
+from api.control.models.models import User, table_registry
+from api.control.security.security import create_access_token
+
+
+def seed() -> str:
+    table_registry.metadata.drop_all(get_engine())
+    table_registry.metadata.create_all(get_engine())
+
+    with Session(get_engine()) as session:
+        session.add(
+            User(username='bench', password='x', email='bench@bench.com')
+        )
+        session.commit()
+
+    return create_access_token(data={'sub': 'bench@bench.com'})
+
+
+def todo(i: int) -> dict:
+    return {'title': f'todo {i}', 'description': 'bench', 'state': 'todo'}
+
+
+def chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+async def per_item(client, rows: int, concurrency: int):
+    limit = asyncio.Semaphore(concurrency)
+
+    async def call(method, url, **kwargs):
+        async with limit:
+            response = await client.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response.json()
+
+    start = time.perf_counter()
+    created = await asyncio.gather(*(
+        call('POST', '/todos/', json=todo(i)) for i in range(rows)
+    ))
+    ids = [item['id'] for item in created]
+    timings = {'create': time.perf_counter() - start}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        call('PATCH', f'/todos/{todo_id}', json={'state': 'doing'})
+        for todo_id in ids
+    ))
+    timings['update'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        call('DELETE', f'/todos/{todo_id}') for todo_id in ids
+    ))
+    timings['delete'] = time.perf_counter() - start
+
+    return timings
+
+
+async def bulk(client, rows: int, batch: int):
+    ids = []
+
+    start = time.perf_counter()
+    for part in chunks([todo(i) for i in range(rows)], batch):
+        response = await client.post('/todos/bulk', json={'todos': part})
+        response.raise_for_status()
+        ids.extend(item['id'] for item in response.json()['results'])
+    timings = {'create': time.perf_counter() - start}
+
+    start = time.perf_counter()
+    for part in chunks(ids, batch):
+        response = await client.patch(
+            '/todos/bulk',
+            json={'ids': part, 'changes': {'state': 'doing'}},
+        )
+        response.raise_for_status()
+    timings['update'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for part in chunks(ids, batch):
+        response = await client.request(
+            'DELETE', '/todos/bulk', json={'ids': part}
+        )
+        response.raise_for_status()
+    timings['delete'] = time.perf_counter() - start
+
+    return timings
+
+
+async def run(rows: int, batch: int, concurrency: int):
+    token = seed()
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url='http://bench',
+        headers={'Authorization': f'Bearer {token}'},
+        timeout=None,
+    ) as client:
+        single = await per_item(client, rows, concurrency)
+        batched = await bulk(client, rows, batch)
+
+    print(f'{rows} todos, lotes de {batch}')
+    for operation in ('create', 'update', 'delete'):
+        print(
+            f'{operation:>6}: por item {rows / single[operation]:9.1f} rows/s'
+            f' | bulk {rows / batched[operation]:9.1f} rows/s'
+            f' ({single[operation] / batched[operation]:.1f}x)'
+        )
+
+    table_registry.metadata.drop_all(get_engine())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--batch', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.batch, args.concurrency))
+
+
+if __name__ == '__main__':
+    main()
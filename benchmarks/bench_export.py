@@ -0,0 +1,117 @@
+"""
+Benchmark de exportação: `GET /todos/` (lista inteira) x `/todos/export`.
+
+Semeia `--rows` todos, sobe a API com uvicorn numa thread e baixa as duas
+rotas em streaming, reportando tempo até o primeiro byte, tempo total e o
+pico de memória alocada no processo (tracemalloc) durante cada download.
+
+Uso:
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.bench_export
+"""
+import argparse
+import socket
+import threading
+import time
+import tracemalloc
+
+import httpx
+import uvicorn
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from api.app import app
+from api.control.database.database import get_engine
+from api.control.models.ids import generate_id
+from api.control.models.models import Todo, User, table_registry
+from api.control.security.security import create_access_token
+
+
+def seed(rows: int) -> str:
+    table_registry.metadata.drop_all(get_engine())
+    table_registry.metadata.create_all(get_engine())
+
+    with Session(get_engine()) as session:
+        user = User(username='bench', password='x', email='bench@bench.com')
+        session.add(user)
+        session.commit()
+
+        for start in range(0, rows, 10_000):
+            session.execute(
+                insert(Todo),
+                [
+                    {
+                        'id': generate_id(),
+                        'title': f'todo {i}',
+                        'description': 'bench ' * 10,
+                        'state': 'todo',
+                        'user_id': user.id,
+                    }
+                    for i in range(start, min(start + 10_000, rows))
+                ],
+            )
+        session.commit()
+
+    return create_access_token(data={'sub': 'bench@bench.com'})
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def download(client: httpx.Client, url: str):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_byte = None
+    size = 0
+
+    with client.stream('GET', url) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            size += len(chunk)
+
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f'{url:<26} TTFB {first_byte * 1000:8.1f}ms'
+        f' | total {total:6.2f}s | {size / 2**20:6.1f} MiB'
+        f' | pico de memória {peak / 2**20:7.1f} MiB'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    token = seed(args.rows)
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=port, log_level='warning', lifespan='off')
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    with httpx.Client(
+        base_url=f'http://127.0.0.1:{port}',
+        headers={'Authorization': f'Bearer {token}'},
+        timeout=None,
+    ) as client:
+        download(client, '/todos/')
+        download(client, '/todos/export')
+        download(client, '/todos/export?format=csv')
+
+    server.should_exit = True
+    thread.join()
+    table_registry.metadata.drop_all(get_engine())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark de throughput de inserção de usuários.
+
+Compara a estratégia antiga (carregar até 100 linhas e usar `len(...) + 1`)
+com o gerador de IDs em processo (`generate_id`).
+
+Uso:
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.bench_inserts
+"""
+import argparse
+import os
+import time
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from api.control.models.models import User, table_registry
+
+
+def insert_legacy(session: Session, n: int):
+    for i in range(n):
+        user_id = len(session.scalars(select(User).offset(0).limit(100)).all())
+        user = User(username=f'legacy{i}', password='x', email=f'l{i}@b.com')
+        # Mesmo cálculo do código antigo; o sufixo evita colisão após 100
+        # linhas, que no código antigo virava IntegrityError.
+        user.id = f'{user_id + 1}-{i}'
+        session.add(user)
+        session.commit()
+
+
+def insert_generated(session: Session, n: int):
+    for i in range(n):
+        user = User(username=f'gen{i}', password='x', email=f'g{i}@b.com')
+        session.add(user)
+        session.commit()
+
+
+def run(label, fn, engine, n):
+    table_registry.metadata.drop_all(engine)
+    table_registry.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        start = time.perf_counter()
+        fn(session, n)
+        elapsed = time.perf_counter() - start
+
+    print(f'{label:<10} {n} inserts em {elapsed:.3f}s ({n / elapsed:.0f}/s)')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ['DATABASE_URL'])
+
+    run('legacy', insert_legacy, engine, args.n)
+    run('generated', insert_generated, engine, args.n)
+
+    table_registry.metadata.drop_all(engine)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark do custo da instrumentação por requisição.
+
+Monta um app mínimo (uma rota JSON) e mede `--requests` chamadas
+sequenciais com e sem o `InstrumentationMiddleware`, reportando o custo
+médio adicionado por requisição.
+
+Uso:
+    python -m benchmarks.bench_instrumentation
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from api.control.metrics.instrumentation import InstrumentationMiddleware
+from api.control.metrics.registry import MetricsRegistry
+
+
+def build_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/items/{item_id}')
+    async def read_item(item_id: int):
+        return {'id': item_id}
+
+    if instrumented:
+        app.add_middleware(
+            InstrumentationMiddleware, metrics=MetricsRegistry()
+        )
+
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url='http://bench'
+    ) as client:
+        for i in range(100):
+            await client.get(f'/items/{i}')
+
+        start = time.perf_counter()
+        for i in range(requests):
+            await client.get(f'/items/{i}')
+        return (time.perf_counter() - start) / requests
+
+
+async def run(requests: int, rounds: int):
+    plain = min([
+        await measure(build_app(False), requests) for _ in range(rounds)
+    ])
+    instrumented = min([
+        await measure(build_app(True), requests) for _ in range(rounds)
+    ])
+
+    print(f'sem middleware: {plain * 1e6:8.1f}µs/req')
+    print(f'com middleware: {instrumented * 1e6:8.1f}µs/req')
+    print(
+        f'custo: {(instrumented - plain) * 1e6:8.1f}µs/req'
+        f' ({(instrumented / plain - 1) * 100:.1f}%)'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.requests, args.rounds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark de login concorrente com tráfego misto.
+
+Dispara `--logins` logins (até `--concurrency` simultâneos) contra
+`/auth/token` enquanto outro grupo de clientes consulta `GET /`, e reporta
+logins/s, quantos logins receberam 429 e a latência p50/p95 da rota leve
+durante a rajada.
+
+Uso:
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.bench_login
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from http import HTTPStatus
+
+import httpx
+from sqlalchemy.orm import Session
+
+from api.app import app
+from api.control.database.database import get_engine
+from api.control.models.models import User, table_registry
+from api.control.security.security import get_password_hash
+
+PASSWORD = 'benchbench'
+
+
+def seed(users: int) -> list[str]:
+    table_registry.metadata.drop_all(get_engine())
+    table_registry.metadata.create_all(get_engine())
+
+    password = get_password_hash(PASSWORD)
+    emails = [f'bench{i}@bench.com' for i in range(users)]
+    with Session(get_engine()) as session:
+        session.add_all(
+            User(username=f'bench{i}', password=password, email=email)
+            for i, email in enumerate(emails)
+        )
+        session.commit()
+
+    return emails
+
+
+async def login(client, email, statuses, limit):
+    async with limit:
+        response = await client.post(
+            '/auth/token', data={'username': email, 'password': PASSWORD}
+        )
+    statuses.append(response.status_code)
+
+
+async def poll_root(client, stop, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get('/')
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def run(logins: int, concurrency: int, pollers: int):
+    emails = seed(min(logins, 50))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://bench'
+    ) as client:
+        stop = asyncio.Event()
+        latencies: list[float] = []
+        statuses: list[int] = []
+        limit = asyncio.Semaphore(concurrency)
+
+        polling = [
+            asyncio.create_task(poll_root(client, stop, latencies))
+            for _ in range(pollers)
+        ]
+
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            login(client, emails[i % len(emails)], statuses, limit)
+            for i in range(logins)
+        ))
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        await asyncio.gather(*polling)
+
+    ok = statuses.count(HTTPStatus.OK)
+    rejected = statuses.count(HTTPStatus.TOO_MANY_REQUESTS)
+    quantiles = statistics.quantiles(latencies, n=20)
+
+    print(f'logins: {ok} ok, {rejected} 429 em {elapsed:.2f}s')
+    print(f'throughput: {ok / elapsed:.1f} logins/s')
+    print(
+        f'GET / durante a rajada: p50 {statistics.median(latencies):.2f}ms'
+        f' p95 {quantiles[18]:.2f}ms ({len(latencies)} reqs)'
+    )
+
+    table_registry.metadata.drop_all(get_engine())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--pollers', type=int, default=4)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.logins, args.concurrency, args.pollers))
+
+
+if __name__ == '__main__':
+    main()
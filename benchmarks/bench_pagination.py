@@ -0,0 +1,86 @@
+"""
+Benchmark de latência por página: offset x cursor (keyset).
+
+Semeia `pages * limit` todos para um usuário e mede a latência das páginas
+1, 10, 100, ... até `pages` nos dois modos.
+
+Uso:
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.bench_pagination
+"""
+import argparse
+import os
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from api.control.database.pagination import encode_cursor, paginate
+from api.control.models.ids import generate_id
+from api.control.models.models import Todo, User, table_registry
+
+
+def seed(session: Session, total: int) -> str:
+    user = User(username='bench', password='x', email='bench@bench.com')
+    session.add(user)
+    session.commit()
+
+    rows = [
+        {
+            'id': generate_id(),
+            'title': f'todo {i}',
+            'description': 'bench',
+            'state': 'todo',
+            'user_id': user.id,
+        }
+        for i in range(total)
+    ]
+    for start in range(0, total, 10_000):
+        session.execute(insert(Todo), rows[start : start + 10_000])
+    session.commit()
+
+    return user.id
+
+
+def time_page(session: Session, query) -> float:
+    start = time.perf_counter()
+    session.scalars(query).all()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=10_000)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ['DATABASE_URL'])
+    table_registry.metadata.drop_all(engine)
+    table_registry.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        user_id = seed(session, args.pages * args.limit)
+        base = select(Todo).where(Todo.user_id == user_id)
+        keys = session.scalars(select(Todo.id).order_by(Todo.id)).all()
+
+        print(f'{"page":>8} {"offset ms":>10} {"cursor ms":>10}')
+        page = 1
+        while page <= args.pages:
+            offset = (page - 1) * args.limit
+            after = encode_cursor(keys[offset - 1]) if offset else None
+
+            by_offset = paginate(
+                base, Todo.id, offset=offset, limit=args.limit
+            )
+            by_cursor = paginate(base, Todo.id, after=after, limit=args.limit)
+
+            print(
+                f'{page:>8} {time_page(session, by_offset):>10.3f}'
+                f' {time_page(session, by_cursor):>10.3f}'
+            )
+            page *= 10
+
+    table_registry.metadata.drop_all(engine)
+
+
+if __name__ == '__main__':
+    main()
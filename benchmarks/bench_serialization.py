@@ -0,0 +1,169 @@
+"""
+Microbenchmark da serialização de listagens: µs por 1.000 linhas.
+
+Compara o caminho antigo de `GET /todos/` (entidades ORM validadas por
+`TodoList` e codificadas pela classe de resposta) com o caminho rápido
+(tuplas de `select(*TODO_COLUMNS)` viradas em dicts e codificadas direto),
+com `json` e `orjson`. Os dados ficam em memória: mede só a serialização.
+
+Com `--db` também mede a busca de `--rows` linhas no Postgres, hidratando
+entidades (`select(Todo)`) ou só as colunas públicas.
+
+Uso:
+    python -m benchmarks.bench_serialization
+    DATABASE_URL=postgresql+psycopg://... python -m \
+        benchmarks.bench_serialization --db
+"""
+import argparse
+import timeit
+from collections import namedtuple
+
+import orjson
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from api.control.models.models import Todo, TodoState
+from api.control.responses.responses import row_dicts
+from api.control.routers.todos import TODO_COLUMNS
+from api.control.schemas.todos_schemas import TodoList
+
+ROWS_PER_REPORT = 1000
+
+# Mesma forma das `Row` do SQLAlchemy: tupla com `_fields`
+TodoRow = namedtuple('TodoRow', [column.key for column in TODO_COLUMNS])
+
+
+def build_todos(count: int) -> tuple[list[Todo], list[TodoRow]]:
+    states = list(TodoState)
+    rows = [
+        TodoRow(
+            f'01J{index:023d}',
+            f'Tarefa {index}',
+            'Descrição com acentuação e um pouco de texto ' * 2,
+            states[index % len(states)],
+        )
+        for index in range(count)
+    ]
+    entities = []
+    for row in rows:
+        # `id` fica fora do `__init__` do modelo (gerado no insert)
+        entity = Todo(
+            title=row.title,
+            description=row.description,
+            state=row.state,
+            user_id='bench',
+        )
+        entity.id = row.id
+        entities.append(entity)
+    return entities, rows
+
+
+def orm_path(response_class, entities):
+    # O que o FastAPI faz com o `response_model`: valida os atributos,
+    # serializa em modo JSON e entrega à classe de resposta
+    adapter = TypeAdapter(TodoList)
+
+    def run():
+        page = adapter.validate_python(
+            {'todos': entities, 'next_cursor': None}, from_attributes=True
+        )
+        return response_class(adapter.dump_python(page, mode='json')).body
+
+    return run
+
+
+def rows_path(response_class, rows):
+    def run():
+        return response_class({
+            'todos': row_dicts(rows),
+            'next_cursor': None,
+        }).body
+
+    return run
+
+
+def per_thousand(function, count: int, repeat: int) -> float:
+    """Melhor tempo entre `repeat` rodadas, em µs por 1.000 linhas."""
+    number = max(1, 20_000 // count)
+    best = min(timeit.repeat(function, number=number, repeat=repeat))
+    return best / number / count * ROWS_PER_REPORT * 1_000_000
+
+
+def serialization(count: int, repeat: int):
+    entities, rows = build_todos(count)
+    cases = {
+        'orm + TodoList + json': orm_path(JSONResponse, entities),
+        'orm + TodoList + orjson': orm_path(ORJSONResponse, entities),
+        'tuplas + json': rows_path(JSONResponse, rows),
+        'tuplas + orjson': rows_path(ORJSONResponse, rows),
+    }
+
+    # Os dois caminhos precisam gerar o mesmo JSON (a ordem das chaves muda)
+    assert orjson.loads(orm_path(ORJSONResponse, entities)()) == (
+        orjson.loads(rows_path(ORJSONResponse, rows)())
+    )
+
+    print(f'Serialização ({count} linhas, µs por {ROWS_PER_REPORT}):')
+    baseline = None
+    for name, function in cases.items():
+        elapsed = per_thousand(function, count, repeat)
+        baseline = baseline or elapsed
+        print(f'  {name:<26} {elapsed:10.0f}µs ({baseline / elapsed:4.1f}x)')
+
+
+def database(count: int, repeat: int):
+    from api.control.database.database import get_engine  # noqa: PLC0415
+    from api.control.models.models import table_registry  # noqa: PLC0415
+    from tests.factories import TodoFactory, UserFactory  # noqa: PLC0415
+
+    engine = get_engine()
+    table_registry.metadata.drop_all(engine)
+    table_registry.metadata.create_all(engine)
+
+    try:
+        with Session(engine) as session:
+            user = UserFactory()
+            session.add(user)
+            session.flush()
+            session.add_all(TodoFactory.build_batch(count, user_id=user.id))
+            session.commit()
+
+            entity_query = select(Todo).limit(count)
+            row_query = select(*TODO_COLUMNS).limit(count)
+            cases = {
+                'select(Todo)': lambda: (
+                    session.scalars(entity_query).all(),
+                    session.expunge_all(),
+                ),
+                'select(*TODO_COLUMNS)': lambda: session.execute(
+                    row_query
+                ).all(),
+            }
+
+            print(
+                f'\nBusca no banco ({count} linhas,'
+                f' µs por {ROWS_PER_REPORT}):'
+            )
+            for name, function in cases.items():
+                elapsed = per_thousand(function, count, repeat)
+                print(f'  {name:<26} {elapsed:10.0f}µs')
+    finally:
+        table_registry.metadata.drop_all(engine)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=ROWS_PER_REPORT)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--db', action='store_true')
+    args = parser.parse_args()
+
+    serialization(args.rows, args.repeat)
+    if args.db:
+        database(args.rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark de partida: tempo de import do app e até a primeira resposta.
+
+Para cada uma das `--runs` rodadas, em processos novos:
+
+- `python -X importtime -c "import api.app"`: tempo total do import e os
+  pacotes que mais pesam (soma do tempo próprio por pacote de topo);
+- `uvicorn api.app:app`: do `Popen` até o primeiro `GET /` com 200,
+  o que inclui interpretador, import, lifespan e bind da porta.
+
+Reporta a mediana das rodadas; `python -c pass` entra como piso.
+
+Uso:
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.bench_startup
+"""
+import argparse
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from http import HTTPStatus
+
+import httpx
+
+
+def import_times() -> tuple[float, Counter]:
+    """Import de `api.app` (ms) e o tempo próprio por pacote de topo."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import api.app'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total = 0.0
+    packages = Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line.removeprefix('import time:').split('|')
+        module = name.strip()
+        packages[module.split('.')[0]] += int(own) / 1000
+        if module == 'api.app':
+            total = int(cumulative) / 1000
+
+    return total, packages
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def first_response() -> float:
+    """Segundos do início do processo até o primeiro 200 em `GET /`."""
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'uvicorn',
+            'api.app:app',
+            '--port',
+            str(port),
+            '--log-level',
+            'warning',
+        ],
+    )
+
+    try:
+        with httpx.Client(base_url=f'http://127.0.0.1:{port}') as client:
+            while True:
+                try:
+                    if client.get('/').status_code == HTTPStatus.OK:
+                        return time.perf_counter() - start
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None:
+                    raise RuntimeError('uvicorn saiu antes de responder')
+                time.sleep(0.005)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def interpreter_startup() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'pass'], check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    imports = []
+    packages = Counter()
+    for _ in range(args.runs):
+        total, by_package = import_times()
+        imports.append(total)
+        packages.update(by_package)
+
+    baseline = statistics.median(
+        interpreter_startup() for _ in range(args.runs)
+    )
+    ready = statistics.median(first_response() for _ in range(args.runs))
+
+    print(f'python -c pass:         {baseline * 1000:8.1f}ms')
+    print(f'import api.app:         {statistics.median(imports):8.1f}ms')
+    print(f'primeira resposta:      {ready * 1000:8.1f}ms')
+    print(f'\nPacotes mais caros no import (média de {args.runs}):')
+    for package, own in packages.most_common(args.top):
+        print(f'  {package:<24} {own / args.runs:8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark do caminho de enfileiramento do webhook.
+
+Dispara `--requests` notificações distintas (até `--concurrency`
+simultâneas) contra `POST /mc/webhook`, sem workers consumindo a fila, e
+reporta webhooks/s e a latência p50/p95/p99 da resposta 202.
+
+Uso:
+    DATABASE_URL=postgresql+psycopg://... python -m \
+        benchmarks.bench_webhook_enqueue
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from http import HTTPStatus
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from api.app import app
+from api.control.database.database import get_engine
+from api.control.models.models import WebhookEvent, table_registry
+from api.control.settings.settings import get_settings
+
+
+async def send(client, index, latencies, statuses, limit):
+    payload = {
+        'id': f'bench-{index}',
+        'clientState': get_settings().WEBHOOK_CLIENT_STATE,
+        'message': {'body': {'content': 'Ativar Boas Vindas'}},
+        'conversation': {'id': str(index)},
+    }
+
+    async with limit:
+        start = time.perf_counter()
+        response = await client.post('/mc/webhook', json=payload)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    statuses.append(response.status_code)
+
+
+async def run(requests: int, concurrency: int):
+    table_registry.metadata.drop_all(get_engine())
+    table_registry.metadata.create_all(get_engine())
+
+    # O ASGITransport não roda o lifespan, então nenhum worker consome a fila
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    statuses: list[int] = []
+    limit = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://bench'
+    ) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            send(client, i, latencies, statuses, limit)
+            for i in range(requests)
+        ))
+        elapsed = time.perf_counter() - start
+
+    with Session(get_engine()) as session:
+        queued = session.scalar(select(func.count()).select_from(WebhookEvent))
+
+    accepted = statuses.count(HTTPStatus.ACCEPTED)
+    quantiles = statistics.quantiles(latencies, n=100)
+
+    print(f'webhooks: {accepted} aceitos, {queued} na fila em {elapsed:.2f}s')
+    print(f'throughput: {accepted / elapsed:.1f} webhooks/s')
+    print(
+        f'latência: p50 {statistics.median(latencies):.2f}ms'
+        f' p95 {quantiles[94]:.2f}ms p99 {quantiles[98]:.2f}ms'
+    )
+
+    table_registry.metadata.drop_all(get_engine())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == '__main__':
+    main()
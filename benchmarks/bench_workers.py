@@ -0,0 +1,182 @@
+"""
+Vazão do `python -m api.server` com 1, 2, 4 e 8 workers.
+
+Semeia `--users` usuários com `--todos` todos cada e, para cada contagem
+de `--workers`, sobe o launcher num processo novo, espera o `GET /`
+responder e dispara `--requests` chamadas a `GET /todos/?limit=20`
+a partir de `--clients` processos com `--concurrency` conexões cada (um
+cliente só em Python vira o gargalo antes do servidor). Reporta
+requisições/s e latência p50/p95/p99 por contagem de workers.
+
+O pool do banco é por worker: com 8 workers e `DB_POOL_SIZE=10` o
+Postgres precisa aceitar até 8 * (10 + DB_MAX_OVERFLOW) conexões.
+
+Uso:
+    DATABASE_URL=postgresql+psycopg://... python -m benchmarks.bench_workers
+    python -m benchmarks.bench_workers --workers 1 4 --clients 4
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from http import HTTPStatus
+
+import httpx
+
+from api.control.database.database import get_engine
+from api.control.models.models import table_registry
+from benchmarks.bench_api import LIMIT, free_port, seed, summarize
+
+STARTUP_TIMEOUT_SECONDS = 60
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = os.environ | {
+        # Fila de webhooks e métricas ficam fora da medição
+        'WEBHOOK_WORKERS': '0',
+        'METRICS_ENABLED': 'false',
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'api.server',
+            '--host',
+            '127.0.0.1',
+            '--port',
+            str(port),
+            '--workers',
+            str(workers),
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    with httpx.Client(base_url=f'http://127.0.0.1:{port}') as client:
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError('o servidor saiu antes de responder')
+            try:
+                if client.get('/').status_code == HTTPStatus.OK:
+                    return server
+            except httpx.TransportError:
+                pass
+            time.sleep(0.05)
+
+    stop_server(server)
+    raise RuntimeError('o servidor não respondeu a tempo')
+
+
+def stop_server(server: subprocess.Popen):
+    server.terminate()
+    try:
+        server.wait(timeout=STARTUP_TIMEOUT_SECONDS)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+async def drive(port, accounts, offset, total, concurrency):
+    """Latências (ms) e erros de um processo cliente."""
+    counter = itertools.count(offset)
+    latencies: list[float] = []
+    errors = 0
+
+    async with httpx.AsyncClient(
+        base_url=f'http://127.0.0.1:{port}',
+        limits=httpx.Limits(max_connections=concurrency),
+        timeout=None,
+    ) as client:
+
+        async def worker():
+            nonlocal errors
+            while (i := next(counter)) < offset + total:
+                headers = accounts[i % len(accounts)]['headers']
+                start = time.perf_counter()
+                response = await client.get(
+                    f'/todos/?limit={LIMIT}', headers=headers
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code >= HTTPStatus.BAD_REQUEST:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return latencies, errors
+
+
+def client_process(args):
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    return asyncio.run(drive(*args))
+
+
+def measure(port, accounts, args) -> dict:
+    per_client = args.requests // args.clients
+    jobs = [
+        (port, accounts, n * per_client, per_client, args.concurrency)
+        for n in range(args.clients)
+    ]
+    warmup = [(port, accounts, 0, args.warmup, args.concurrency)]
+
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(args.clients) as pool:
+        pool.map(client_process, warmup)
+        start = time.perf_counter()
+        results = pool.map(client_process, jobs)
+        elapsed = time.perf_counter() - start
+
+    latencies = [value for result, _ in results for value in result]
+    errors = sum(errors for _, errors in results)
+    return summarize(latencies, errors, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--todos', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=4000)
+    parser.add_argument('--clients', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--warmup', type=int, default=100)
+    args = parser.parse_args()
+
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    accounts = [
+        {'headers': account['headers']}
+        for account in seed(args.users, args.todos)
+    ]
+
+    try:
+        baseline = None
+        for workers in args.workers:
+            port = free_port()
+            server = start_server(workers, port)
+            try:
+                result = measure(port, accounts, args)
+            finally:
+                stop_server(server)
+
+            baseline = baseline or result['rps']
+            print(
+                f'  {workers} workers {result["rps"]:8.1f} req/s'
+                f' ({result["rps"] / baseline:4.2f}x)'
+                f' | p50 {result["p50_ms"]:7.2f}ms'
+                f' p95 {result["p95_ms"]:7.2f}ms'
+                f' p99 {result["p99_ms"]:7.2f}ms'
+                f' | erros {result["errors"]}'
+            )
+    finally:
+        table_registry.metadata.drop_all(get_engine())
+
+
+if __name__ == '__main__':
+    main()
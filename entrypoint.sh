@@ -6,5 +6,5 @@ set -e
 # Executa as migrações do banco de dados
 poetry run alembic upgrade head
 
-# Inicia a aplicação
-poetry run uvicorn --host 0.0.0.0 --port 8000 api.app:app
+# Inicia a aplicação (WEB_WORKERS workers, app pré-carregado)
+exec poetry run python -m api.server
@@ -0,0 +1,69 @@
+"""todo indexes and search vector
+
+Revision ID: 8d4e6b0f2c13
+Revises: 3f1c2a9d8b71
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4e6b0f2c13'
+down_revision: Union[str, None] = '3f1c2a9d8b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    op.add_column(
+        'todos',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple', "
+                "coalesce(title, '') || ' ' || coalesce(description, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+
+    op.create_index('ix_todos_user_id_state', 'todos', ['user_id', 'state'])
+    op.create_index('ix_todos_user_id_id', 'todos', ['user_id', 'id'])
+    op.create_index(
+        'ix_todos_title_trgm',
+        'todos',
+        ['title'],
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_todos_description_trgm',
+        'todos',
+        ['description'],
+        postgresql_using='gin',
+        postgresql_ops={'description': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_todos_search_vector',
+        'todos',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_todos_search_vector', table_name='todos')
+    op.drop_index('ix_todos_description_trgm', table_name='todos')
+    op.drop_index('ix_todos_title_trgm', table_name='todos')
+    op.drop_index('ix_todos_user_id_id', table_name='todos')
+    op.drop_index('ix_todos_user_id_state', table_name='todos')
+    op.drop_column('todos', 'search_vector')
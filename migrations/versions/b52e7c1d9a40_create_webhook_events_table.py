@@ -0,0 +1,64 @@
+"""create webhook events table
+
+Revision ID: b52e7c1d9a40
+Revises: 8d4e6b0f2c13
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b52e7c1d9a40'
+down_revision: Union[str, None] = '8d4e6b0f2c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'webhook_events',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('notification_id', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum(
+                'pending', 'processing', 'done', 'dead', name='webhookstatus'
+            ),
+            nullable=False,
+        ),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column(
+            'next_attempt_at',
+            sa.DateTime(),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column(
+            'created_at',
+            sa.DateTime(),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('notification_id'),
+    )
+    op.create_index(
+        'ix_webhook_events_status_next_attempt_at',
+        'webhook_events',
+        ['status', 'next_attempt_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_webhook_events_status_next_attempt_at',
+        table_name='webhook_events',
+    )
+    op.drop_table('webhook_events')
+    sa.Enum(name='webhookstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,46 @@
+"""create todo counts table
+
+Revision ID: c9e2b4d6f371
+Revises: a7d3f5b9c264
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e2b4d6f371'
+down_revision: Union[str, None] = 'a7d3f5b9c264'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'todo_counts',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column(
+            'state',
+            postgresql.ENUM(name='todostate', create_type=False),
+            nullable=False,
+        ),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['user_id'], ['users.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('user_id', 'state'),
+    )
+    # Ponto de partida com os todos que já existem; daqui em diante as
+    # rotas de escrita mantêm as contagens
+    op.execute(
+        'INSERT INTO todo_counts (user_id, state, count) '
+        'SELECT user_id, state, count(*) FROM todos GROUP BY user_id, state'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('todo_counts')
@@ -0,0 +1,36 @@
+"""add bot jobs heartbeat
+
+Revision ID: d5f8a1c3e927
+Revises: c9e2b4d6f371
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f8a1c3e927'
+down_revision: Union[str, None] = 'c9e2b4d6f371'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'bot_jobs',
+        sa.Column(
+            'heartbeat_at',
+            sa.DateTime(),
+            server_default=sa.text('now()'),
+            nullable=True,
+        ),
+    )
+    op.create_index('ix_bot_jobs_status_bot', 'bot_jobs', ['status', 'bot'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bot_jobs_status_bot', table_name='bot_jobs')
+    op.drop_column('bot_jobs', 'heartbeat_at')
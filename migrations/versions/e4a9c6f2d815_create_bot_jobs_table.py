@@ -0,0 +1,61 @@
+"""create bot jobs table
+
+Revision ID: e4a9c6f2d815
+Revises: b52e7c1d9a40
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a9c6f2d815'
+down_revision: Union[str, None] = 'b52e7c1d9a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'bot_jobs',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('bot', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum(
+                'queued',
+                'running',
+                'succeeded',
+                'failed',
+                'timed_out',
+                name='botjobstatus',
+            ),
+            nullable=False,
+        ),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column(
+            'created_at',
+            sa.DateTime(),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ['user_id'], ['users.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_bot_jobs_user_id', 'bot_jobs', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bot_jobs_user_id', table_name='bot_jobs')
+    op.drop_table('bot_jobs')
+    sa.Enum(name='botjobstatus').drop(op.get_bind(), checkfirst=True)
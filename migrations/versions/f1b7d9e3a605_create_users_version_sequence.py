@@ -0,0 +1,28 @@
+"""create users version sequence
+
+Revision ID: f1b7d9e3a605
+Revises: d5f8a1c3e927
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b7d9e3a605'
+down_revision: Union[str, None] = 'd5f8a1c3e927'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(sa.Sequence('users_version_seq')))
+    # A versão de `users` sai da tabela compartilhada
+    op.execute("DELETE FROM change_versions WHERE key = 'users'")
+
+
+def downgrade() -> None:
+    op.execute(sa.schema.DropSequence(sa.Sequence('users_version_seq')))
@@ -0,0 +1,15 @@
+"""Entry points de bots usados pelos testes do runtime."""
+import time
+
+
+def echo(**params) -> dict:
+    return params
+
+
+def sleep(seconds: float) -> dict:
+    time.sleep(seconds)
+    return {'slept': seconds}
+
+
+def fail():
+    raise ValueError('boom')
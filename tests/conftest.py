@@ -1,13 +1,20 @@
+import httpx
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
 from testcontainers.postgres import PostgresContainer
 
 from api.app import app
-from api.control.database.database import get_session
+from api.control.database.database import get_async_session, get_session
+from api.control.graph.client import GraphClient, get_graph_client
 from api.control.models.models import table_registry
+from api.control.responses.caching import get_response_cache
+from api.control.security.identity_cache import get_identity_cache
 from api.control.security.security import get_password_hash
+from api.control.settings.settings import get_settings
 from tests.factories import UserFactory
 
 
@@ -15,24 +22,71 @@ from tests.factories import UserFactory
 def engine():
     with PostgresContainer('postgres:16', driver='psycopg') as postgres:
 
-        _engine = create_engine(postgres.get_connection_url())
+        # As tabelas são recriadas a cada teste: sem prepared statements
+        # presos aos tipos (enums) antigos
+        _engine = create_engine(
+            postgres.get_connection_url(),
+            connect_args={'prepare_threshold': None},
+        )
 
         with _engine.begin():
             yield _engine
 
 
+@pytest.fixture(scope='session')
+def async_engine(engine):
+    # Cada TestClient tem o próprio event loop: sem pool entre os testes
+    return create_async_engine(
+        engine.url,
+        poolclass=NullPool,
+        connect_args={'prepare_threshold': None},
+    )
+
+
 @pytest.fixture
-def client(session):
+def client(session, async_engine, monkeypatch):
     def get_session_override():
         return session
 
+    async def get_async_session_override():
+        async with AsyncSession(
+            async_engine, expire_on_commit=False
+        ) as async_session:
+            yield async_session
+
+    get_identity_cache().clear()
+    get_response_cache().clear()
+    # Os testes da fila chamam o pool diretamente
+    monkeypatch.setattr(get_settings(), 'WEBHOOK_WORKERS', 0)
+    # O app usa o banco dos testes pelas dependências, não o DATABASE_URL
+    monkeypatch.setattr(get_settings(), 'DB_WARMUP', False)
+    monkeypatch.setattr(
+        get_settings(), 'WEBHOOK_CLIENT_STATE', 'test-client-state'
+    )
+
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_async_session] = (
+            get_async_session_override
+        )
         yield client
 
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def queries(async_engine):
+    """SQL executado pela API durante o teste (limpe antes da requisição)."""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, 'before_cursor_execute', record)
+    yield statements
+    event.remove(async_engine.sync_engine, 'before_cursor_execute', record)
+
+
 @pytest.fixture
 def session(engine):
     table_registry.metadata.create_all(engine)
@@ -79,3 +133,38 @@ def token(client, user):
         data={'username': user.email, 'password': user.clean_password},
     )
     return response.json()['access_token']
+
+
+class MockGraph:
+    """Servidor Graph falso: respostas registradas por método e caminho."""
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+
+    def add(self, method, path, *responses):
+        self.routes[method, path] = list(responses)
+
+    def handler(self, request: httpx.Request):
+        self.requests.append(request)
+        responses = self.routes.get((request.method, request.url.path))
+
+        if not responses:
+            return httpx.Response(404, json={'error': 'not mocked'})
+
+        # A última resposta registrada se repete; funções recebem o request
+        response = responses.pop(0) if len(responses) > 1 else responses[0]
+        return response(request) if callable(response) else response
+
+
+@pytest.fixture
+def graph(client):
+    mock = MockGraph()
+    graph_client = GraphClient(
+        base_url='https://graph.test',
+        backoff=0,
+        transport=httpx.MockTransport(mock.handler),
+    )
+    app.dependency_overrides[get_graph_client] = lambda: graph_client
+
+    return mock
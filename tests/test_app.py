@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from http import HTTPStatus
 
 
@@ -6,3 +8,43 @@ def test_root_deve_retornar_ok_e_ola_mundo(client):
 
     assert response.status_code == HTTPStatus.OK
     assert response.json() == {"message": "🤖 Headquarters started! 🤖"}
+
+
+def test_import_does_not_build_engines_or_msal():
+    code = (
+        'import api.app\n'
+        'from api.control.database import database\n'
+        'from api.control.routers import teams\n'
+        'print(len(database._engines), len(teams._msal))\n'
+    )
+
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.split() == ['0', '0']
+
+
+def test_forked_worker_builds_its_own_engines():
+    code = (
+        'import os\n'
+        'from api.control.database import database\n'
+        'parent = database.get_engine()\n'
+        'if os.fork() == 0:\n'
+        '    child = database.get_engine()\n'
+        '    print(child is not parent, flush=True)\n'
+        '    os._exit(0)\n'
+        'os.wait()\n'
+    )
+
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.split() == ['True']
@@ -0,0 +1,202 @@
+import asyncio
+import time
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from api.app import app
+from api.bots.bot_boa_vindas.bot.welcome_pdf import write_welcome_pdf
+from api.control.bots import registry
+from api.control.bots.registry import BotSpec
+from api.control.bots.runtime import LOST_JOB_ERROR, BotRuntime
+from api.control.models.models import BotJob, BotJobStatus
+from api.control.routers.bots import get_bot_runtime
+
+FINISHED = {'succeeded', 'failed', 'timed_out'}
+
+
+@pytest.fixture
+def runtime(client, engine, monkeypatch):
+    for spec in (
+        BotSpec('echo', 'tests.bots:echo'),
+        BotSpec('sleep', 'tests.bots:sleep', timeout=0.5),
+        BotSpec('slow', 'tests.bots:sleep', max_concurrency=1),
+        BotSpec('fail', 'tests.bots:fail'),
+    ):
+        monkeypatch.setitem(registry._bots, spec.name, spec)
+
+    runtime = make_runtime(engine)
+    app.dependency_overrides[get_bot_runtime] = lambda: runtime
+    return runtime
+
+
+def make_runtime(engine):
+    return BotRuntime(
+        lambda: Session(engine), max_processes=2, poll_interval=0.05
+    )
+
+
+def stale_job(session, user, bot):
+    job = BotJob(
+        bot=bot, user_id=user.id, params={}, status=BotJobStatus.running
+    )
+    session.add(job)
+    session.commit()
+    session.execute(
+        update(BotJob)
+        .where(BotJob.id == job.id)
+        .values(heartbeat_at=func.now() - timedelta(hours=1))
+    )
+    session.commit()
+    return job
+
+
+def run_bot(client, token, name, params=None):
+    response = client.post(
+        f'/bots/{name}/run',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'params': params or {}},
+    )
+    assert response.status_code == HTTPStatus.ACCEPTED
+    return response.json()
+
+
+def read_job(client, token, job_id):
+    return client.get(
+        f'/jobs/{job_id}', headers={'Authorization': f'Bearer {token}'}
+    ).json()
+
+
+def wait_for(client, token, job_id, statuses=FINISHED, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = read_job(client, token, job_id)
+        if job['status'] in statuses:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f'job {job_id} ainda {job["status"]}')
+
+
+def test_run_bot_stores_result(client, token, runtime):
+    job = run_bot(client, token, 'echo', {'name': 'Ana'})
+
+    assert job['status'] == 'queued'
+    finished = wait_for(client, token, job['id'])
+    assert finished['status'] == 'succeeded'
+    assert finished['result'] == {'name': 'Ana'}
+    assert finished['started_at'] is not None
+    assert finished['finished_at'] is not None
+
+
+def test_failing_bot(client, token, runtime):
+    job = run_bot(client, token, 'fail')
+
+    finished = wait_for(client, token, job['id'])
+
+    assert finished['status'] == 'failed'
+    assert finished['error'] == 'ValueError: boom'
+
+
+def test_bot_timeout_kills_the_process(client, token, runtime):
+    seconds = 30
+    started_at = time.monotonic()
+    job = run_bot(client, token, 'sleep', {'seconds': seconds})
+
+    finished = wait_for(client, token, job['id'])
+
+    assert finished['status'] == 'timed_out'
+    assert time.monotonic() - started_at < seconds
+
+
+def test_bot_concurrency_limit(client, token, runtime):
+    first = run_bot(client, token, 'slow', {'seconds': 1})
+    second = run_bot(client, token, 'slow', {'seconds': 1})
+
+    wait_for(client, token, first['id'], {'running'})
+    assert read_job(client, token, second['id'])['status'] == 'queued'
+    assert wait_for(client, token, second['id'])['status'] == 'succeeded'
+
+
+def test_bot_concurrency_limit_across_runtimes(
+    client, token, engine, runtime
+):
+    # Dois runtimes no mesmo banco fazem o papel de dois workers da API
+    first = run_bot(client, token, 'slow', {'seconds': 1})
+    app.dependency_overrides[get_bot_runtime] = lambda: make_runtime(engine)
+    second = run_bot(client, token, 'slow', {'seconds': 1})
+
+    wait_for(client, token, first['id'], {'running'})
+    time.sleep(0.2)
+    assert read_job(client, token, second['id'])['status'] == 'queued'
+    assert wait_for(client, token, second['id'])['status'] == 'succeeded'
+
+
+def test_start_fails_stale_jobs(session, user, runtime):
+    job = stale_job(session, user, 'slow')
+
+    asyncio.run(runtime.start())
+
+    session.refresh(job)
+    assert job.status == BotJobStatus.failed
+    assert job.error == LOST_JOB_ERROR
+    assert job.finished_at is not None
+
+
+def test_stale_job_does_not_hold_a_slot(client, token, session, user, runtime):
+    stale = stale_job(session, user, 'slow')
+
+    job = run_bot(client, token, 'slow', {'seconds': 0})
+
+    assert wait_for(client, token, job['id'])['status'] == 'succeeded'
+    session.refresh(stale)
+    assert stale.status == BotJobStatus.failed
+
+
+def test_unknown_bot(client, token, runtime):
+    response = client.post(
+        '/bots/nope/run', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Bot not found.'}
+
+
+def test_job_of_other_user(client, token, other_user, runtime):
+    job = run_bot(client, token, 'echo')
+    wait_for(client, token, job['id'])
+    other_token = client.post(
+        '/auth/token',
+        data={'username': other_user.email, 'password': 'testtest'},
+    ).json()['access_token']
+
+    response = client.get(
+        f'/jobs/{job["id"]}',
+        headers={'Authorization': f'Bearer {other_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_list_bots(client, token):
+    response = client.get(
+        '/bots', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert {
+        'name': 'boas_vindas_pdf',
+        'max_concurrency': 2,
+        'timeout': 120,
+    } in response.json()['bots']
+
+
+def test_welcome_pdf(tmp_path):
+    result = write_welcome_pdf('João Silva', tmp_path)
+
+    pdf = (tmp_path / result['file']).read_bytes()
+    assert result['file'] == 'boas-vindas-joao-silva.pdf'
+    assert result['url'] == '/pdfs/boas-vindas-joao-silva.pdf'
+    assert pdf.startswith(b'%PDF-1.4')
+    assert pdf.endswith(b'%%EOF\n')
@@ -0,0 +1,137 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.control.responses.caching import ResponseCache, get_response_cache
+from tests.factories import TodoFactory
+
+
+@pytest.fixture
+def auth(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def list_queries(queries) -> list[str]:
+    return [query for query in queries if 'FROM todos' in query]
+
+
+def test_list_todos_sends_weak_etag(client, auth):
+    response = client.get('/todos/', headers=auth)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['etag'].startswith('W/"0-')
+    assert response.headers['cache-control'] == 'private, no-cache'
+    assert response.headers['vary'] == 'Authorization'
+
+
+def test_if_none_match_skips_the_list_query(client, auth, queries):
+    etag = client.get('/todos/', headers=auth).headers['etag']
+
+    queries.clear()
+    response = client.get(
+        '/todos/', headers={**auth, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers['etag'] == etag
+    assert not list_queries(queries)
+    assert get_response_cache().stats()['not_modified'] == 1
+
+
+def test_writes_change_the_etag(client, auth):
+    etag = client.get('/todos/', headers=auth).headers['etag']
+
+    created = client.post(
+        '/todos/',
+        headers=auth,
+        json={'title': 'Nova', 'description': 'x', 'state': 'todo'},
+    ).json()
+    response = client.get(
+        '/todos/', headers={**auth, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['etag'] != etag
+    assert response.json()['todos'] == [created]
+
+    client.delete(f'/todos/{created["id"]}', headers=auth)
+    response = client.get('/todos/', headers=auth)
+
+    assert response.json()['todos'] == []
+
+
+def test_etag_depends_on_query_params(client, auth):
+    first = client.get('/todos/?state=todo', headers=auth)
+    second = client.get('/todos/?state=done', headers=auth)
+
+    assert first.headers['etag'] != second.headers['etag']
+
+
+def test_repeated_list_is_served_from_cache(
+    session, client, user, auth, queries
+):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    session.commit()
+    expected = client.get('/todos/', headers=auth).json()
+
+    queries.clear()
+    response = client.get('/todos/', headers=auth)
+
+    assert response.json() == expected
+    assert not list_queries(queries)
+    assert get_response_cache().stats()['hits'] == 1
+
+
+def test_users_list_version_changes_on_create(client):
+    etag = client.get('/users/').headers['etag']
+
+    client.post(
+        '/users/',
+        json={
+            'username': 'alice',
+            'email': 'alice@example.com',
+            'password': 'secret',
+        },
+    )
+    response = client.get('/users/', headers={'If-None-Match': etag})
+
+    assert response.status_code == HTTPStatus.OK
+    assert [user['username'] for user in response.json()['users']] == [
+        'alice'
+    ]
+
+
+def test_cache_with_zero_ttl_stores_nothing():
+    cache = ResponseCache(ttl=0)
+
+    cache.set(('todos:1', 0), b'[]')
+
+    assert cache.get(('todos:1', 0)) is None
+    assert cache.stats() == {
+        'hits': 0,
+        'misses': 1,
+        'not_modified': 0,
+        'size': 0,
+    }
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResponseCache(maxsize=2)
+    cache.set(('a',), b'a')
+    cache.set(('b',), b'b')
+    cache.get(('a',))
+
+    cache.set(('c',), b'c')
+
+    assert cache.get(('b',)) is None
+    assert cache.get(('a',)) == b'a'
+    assert cache.hit_ratio() == pytest.approx(2 / 3)
+
+
+def test_hit_ratio_metric(client, auth):
+    client.get('/todos/', headers=auth)
+    client.get('/todos/', headers=auth)
+
+    response = client.get('/metrics')
+
+    assert 'response_cache_hit_ratio 0.5' in response.text
@@ -0,0 +1,186 @@
+import asyncio
+import os
+from http import HTTPStatus
+
+import anyio
+import pytest
+
+from api.control.documents.documents import (
+    DocumentResponse,
+    DocumentStore,
+    parse_range,
+)
+from api.control.routers import documents
+
+CONTENT = b'%PDF-1.4 ' + bytes(range(256)) * 4
+
+
+@pytest.fixture
+def pdf(tmp_path, monkeypatch):
+    (tmp_path / 'report.pdf').write_bytes(CONTENT)
+    monkeypatch.setattr(documents, 'store', DocumentStore(str(tmp_path)))
+    return tmp_path / 'report.pdf'
+
+
+def test_serves_document_with_cache_headers(client, pdf):
+    response = client.get('/pdfs/report.pdf')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.content == CONTENT
+    assert response.headers['content-type'] == 'application/pdf'
+    assert response.headers['accept-ranges'] == 'bytes'
+    assert response.headers['cache-control'].startswith('public, max-age=')
+    assert response.headers['etag'].startswith('"')
+
+
+def test_if_none_match_returns_not_modified(client, pdf):
+    etag = client.get('/pdfs/report.pdf').headers['etag']
+
+    response = client.get('/pdfs/report.pdf', headers={'If-None-Match': etag})
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b''
+    assert response.headers['etag'] == etag
+
+
+def test_range_returns_partial_content(client, pdf):
+    response = client.get('/pdf/report.pdf', headers={'Range': 'bytes=9-18'})
+
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert response.content == CONTENT[9:19]
+    assert response.headers['content-range'] == f'bytes 9-18/{len(CONTENT)}'
+
+
+def test_unsatisfiable_range(client, pdf):
+    response = client.get(
+        '/pdfs/report.pdf', headers={'Range': f'bytes={len(CONTENT)}-'}
+    )
+
+    assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response.headers['content-range'] == f'bytes */{len(CONTENT)}'
+
+
+def test_stale_if_range_returns_whole_file(client, pdf):
+    response = client.get(
+        '/pdfs/report.pdf',
+        headers={'Range': 'bytes=0-9', 'If-Range': '"old"'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.content == CONTENT
+
+
+@pytest.mark.parametrize('name', ['../secret.pdf', '..%2Fsecret.pdf'])
+def test_paths_outside_the_folder_are_not_served(client, pdf, name):
+    (pdf.parent.parent / 'secret.pdf').write_bytes(b'secret')
+
+    response = client.get(f'/pdfs/{name}')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def rewrite(pdf, content):
+    mtime_ns = pdf.stat().st_mtime_ns
+    pdf.write_bytes(content)
+    # Garante outro mtime mesmo em sistemas de arquivos de baixa resolução
+    os.utime(pdf, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+
+def test_rewritten_document_is_not_served_from_stale_metadata(client, pdf):
+    etag = client.get('/pdfs/report.pdf').headers['etag']
+    rewrite(pdf, b'%PDF-1.4 novo')
+
+    response = client.get('/pdfs/report.pdf', headers={'If-None-Match': etag})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.content == b'%PDF-1.4 novo'
+    assert response.headers['etag'] != etag
+    assert response.headers['content-length'] == str(len(b'%PDF-1.4 novo'))
+    assert documents.store.get('report.pdf').etag == response.headers['etag']
+
+
+def test_range_of_rewritten_document_uses_its_size(client, pdf):
+    client.get('/pdfs/report.pdf')
+    rewrite(pdf, b'%PDF-1.4 novo')
+
+    response = client.get('/pdfs/report.pdf', headers={'Range': 'bytes=9-'})
+
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert response.content == b'novo'
+    assert response.headers['content-range'] == 'bytes 9-12/13'
+
+
+def test_short_read_still_ends_the_body(pdf):
+    async def run():
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        async with await anyio.open_file(pdf, 'rb') as file:
+            await DocumentResponse._send_chunks(
+                send, file, 0, len(CONTENT) + 10
+            )
+        return messages
+
+    messages = asyncio.run(run())
+
+    assert b''.join(message['body'] for message in messages) == CONTENT
+    assert messages[-1].get('more_body', False) is False
+
+
+def test_missing_document(client, pdf):
+    response = client.get('/pdfs/missing.pdf')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Document not found.'}
+
+
+def test_metadata_is_cached(pdf, monkeypatch):
+    store = DocumentStore(str(pdf.parent))
+    first = store.get('report.pdf')
+    monkeypatch.setattr(os, 'stat', None)
+
+    assert store.get('report.pdf') is first
+
+
+def test_zero_copy_send_when_server_supports_it(pdf):
+    offset = 10
+    store = DocumentStore(str(pdf.parent))
+    response = DocumentResponse(
+        store, 'report.pdf', store.get('report.pdf'), 'no-cache'
+    )
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'headers': [(b'range', f'bytes={offset}-'.encode())],
+        'extensions': {'http.response.zerocopysend': {}},
+    }
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(response(scope, None, send))
+
+    assert messages[0]['status'] == HTTPStatus.PARTIAL_CONTENT
+    assert messages[1]['type'] == 'http.response.zerocopysend'
+    assert messages[1]['offset'] == offset
+    assert messages[1]['count'] == len(CONTENT) - offset
+
+
+@pytest.mark.parametrize(
+    ('header', 'expected'),
+    [
+        ('bytes=0-0', (0, 0)),
+        ('bytes=5-', (5, 9)),
+        ('bytes=-3', (7, 9)),
+        ('bytes=2-100', (2, 9)),
+        ('bytes=0-1,4-5', None),
+        ('items=0-1', None),
+        ('bytes=x-1', None),
+    ],
+)
+def test_parse_range(header, expected):
+    size = 10
+    assert parse_range(header, size) == expected
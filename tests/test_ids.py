@@ -0,0 +1,41 @@
+import uuid
+
+import pytest
+
+from api.control.models.ids import (
+    ID_GENERATORS,
+    generate_id,
+    new_ulid,
+    new_uuid7,
+    set_id_generator,
+)
+
+ULID_LENGTH = 26
+UUID_VERSION = 7
+
+
+def test_ulid_is_sortable_and_unique():
+    ids = [new_ulid() for _ in range(1000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert all(len(i) == ULID_LENGTH for i in ids)
+
+
+def test_uuid7_version():
+    value = uuid.UUID(new_uuid7())
+
+    assert value.version == UUID_VERSION
+
+
+def test_set_id_generator():
+    set_id_generator('uuid7')
+    try:
+        assert uuid.UUID(generate_id()).version == UUID_VERSION
+    finally:
+        set_id_generator(ID_GENERATORS['ulid'])
+
+
+def test_set_id_generator_unknown():
+    with pytest.raises(ValueError, match='Unknown ID generator'):
+        set_id_generator('count')
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+from api.control.metrics.instrumentation import instrument_engine
+from api.control.metrics.registry import MetricsRegistry
+
+
+def metric_value(text: str, sample: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(sample + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram(
+        'latency_seconds', 'Latência.', ('route',), buckets=(0.1, 1)
+    )
+
+    histogram.observe(0.05, '/a')
+    histogram.observe(0.1, '/a')
+    histogram.observe(3, '/a')
+
+    assert registry.render().splitlines() == [
+        '# HELP latency_seconds Latência.',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 3.15',
+        'latency_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_counter_escapes_label_values():
+    registry = MetricsRegistry()
+    registry.counter('hits_total', 'Acertos.', ('path',)).inc(2, 'a"b')
+
+    assert 'hits_total{path="a\\"b"} 2' in registry.render()
+
+
+def test_server_timing_header(client):
+    response = client.get('/')
+
+    assert response.status_code == HTTPStatus.OK
+    timing = response.headers['Server-Timing']
+    assert timing.startswith('app;dur=')
+    assert 'db;dur=0.0;desc="0 queries"' in timing
+
+
+def test_server_timing_counts_queries(client, async_engine):
+    instrument_engine(async_engine.sync_engine)
+
+    response = client.get('/users/')
+
+    # Versão da listagem + a página
+    assert 'desc="2 queries"' in response.headers['Server-Timing']
+
+
+def test_metrics_endpoint(client, async_engine):
+    instrument_engine(async_engine.sync_engine)
+    expected_requests = 2
+    sample = (
+        'http_request_duration_seconds_count'
+        '{method="GET",route="/users/",status="200"}'
+    )
+    queries = 'http_request_db_queries_total{method="GET",route="/users/"}'
+    before = client.get('/metrics').text
+
+    client.get('/users/')
+    client.get('/users/')
+    response = client.get('/metrics')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert (
+        metric_value(response.text, sample) - metric_value(before, sample)
+        == expected_requests
+    )
+    assert metric_value(response.text, queries) > metric_value(
+        before, queries
+    )
+    assert '# TYPE identity_cache_hits_total counter' in response.text
+
+
+def test_metrics_use_route_template(client):
+    client.get('/todos/some-id-that-does-not-matter')
+    client.get('/does-not-exist')
+
+    text = client.get('/metrics').text
+
+    assert 'route="unmatched",status="404"' in text
+    assert 'some-id-that-does-not-matter' not in text
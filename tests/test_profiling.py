@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.control.routers import profiling
+
+
+@pytest.fixture
+def profiling_admin(monkeypatch, user):
+    monkeypatch.setattr(profiling.settings, 'PROFILING_ENABLED', True)
+    monkeypatch.setattr(profiling.settings, 'PROFILING_ADMINS', [user.email])
+
+
+def test_profiling_disabled_by_default(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.get('/todos/?profile=1', headers=headers)
+    sampling = client.get('/admin/profiling/sampling', headers=headers)
+
+    assert response.headers['content-type'] == 'application/json'
+    assert sampling.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_profile_report_for_admin(client, token, profiling_admin):
+    response = client.get(
+        '/todos/?profile=1', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert response.text.startswith('# status da rota: 200')
+    assert 'cumulative' in response.text
+
+
+def test_profile_ignored_for_non_admin(
+    client, token, profiling_admin, monkeypatch
+):
+    monkeypatch.setattr(profiling.settings, 'PROFILING_ADMINS', [])
+
+    response = client.get(
+        '/todos/?profile=1', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.json()['todos'] == []
+
+
+def test_sampling_requires_admin(client, other_user, profiling_admin):
+    token = client.post(
+        '/auth/token',
+        data={'username': other_user.email, 'password': 'testtest'},
+    ).json()['access_token']
+
+    response = client.post(
+        '/admin/profiling/sampling',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_sampling_session_writes_collapsed_stacks(
+    client, token, profiling_admin, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(
+        profiling.settings, 'PROFILING_OUTPUT_DIR', str(tmp_path)
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.post(
+        '/admin/profiling/sampling?seconds=0.2&interval_ms=10',
+        headers=headers,
+    )
+    conflict = client.post('/admin/profiling/sampling', headers=headers)
+    profiling.sampler.join()
+    status = client.get('/admin/profiling/sampling', headers=headers).json()
+    download = client.get('/admin/profiling/sampling/file', headers=headers)
+
+    assert response.status_code == HTTPStatus.ACCEPTED
+    assert conflict.status_code == HTTPStatus.CONFLICT
+    assert status['running'] is False
+    assert status['samples'] > 0
+    assert download.status_code == HTTPStatus.OK
+    stack, count = download.text.splitlines()[0].rsplit(' ', 1)
+    assert ';' in stack
+    assert int(count) > 0
@@ -1,8 +1,25 @@
+import threading
 from http import HTTPStatus
 
+import pytest
 from jwt import decode
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from sqlalchemy import select
 
-from api.control.security.security import create_access_token, settings
+from api.control.models.models import User
+from api.control.schemas.auth_schemas import UserIdentity
+from api.control.security.hashing import HashingBusy, PasswordHasher
+from api.control.security.identity_cache import (
+    IdentityCache,
+    TTLIdentityCache,
+    get_identity_cache,
+)
+from api.control.security.security import (
+    create_access_token,
+    password_hasher,
+    settings,
+)
 
 
 def test_jwt():
@@ -24,3 +41,110 @@ def test_jwt_invalid_token(client):
 
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     assert response.json() == {'detail': 'Could not validate credentials'}
+
+
+def test_identity_cache_counts_hits_and_misses(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client.get('/todos/', headers=headers)
+    client.get('/todos/', headers=headers)
+
+    assert get_identity_cache().stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+
+def test_identity_cache_invalidated_on_user_update(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/todos/', headers=headers)
+
+    client.put(
+        f'/users/{user.id}',
+        headers=headers,
+        json={
+            'username': 'bob',
+            'email': 'bob@example.com',
+            'password': 'mynewpassword',
+        },
+    )
+    response = client.get('/todos/', headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_identity_cache_respects_expiration_and_size():
+    cache = TTLIdentityCache(maxsize=1, ttl=60)
+    identity = UserIdentity(id='1', email='a@a.com', username='a')
+
+    cache.set('expired', identity, expires_at=0)
+    cache.set('first', identity, expires_at=float('inf'))
+    cache.set('second', identity, expires_at=float('inf'))
+
+    assert cache.get('expired') is None
+    assert cache.get('first') is None
+    assert cache.get('second') == identity
+
+
+def test_incomplete_identity_cache_fails_on_creation():
+    class GetOnly(IdentityCache):
+        def __init__(self):
+            self.entries = {}
+
+        def get(self, token):
+            return self.entries.get(token)
+
+    with pytest.raises(TypeError, match='abstract'):
+        GetOnly()
+
+
+def test_password_hasher_rejects_when_queue_is_full():
+    release = threading.Event()
+
+    class BlockingContext:
+        @staticmethod
+        def hash(password):
+            release.wait()
+            return password
+
+    hasher = PasswordHasher(BlockingContext(), workers=1, queue_size=0)
+    pending = hasher._submit(hasher.context.hash, 'first')
+
+    with pytest.raises(HashingBusy):
+        hasher.hash('second')
+
+    release.set()
+    assert pending.result() == 'first'
+    assert hasher.hash('third') == 'third'
+    hasher.shutdown()
+
+
+def test_login_returns_429_when_hashing_is_busy(client, user, monkeypatch):
+    async def busy(*args):
+        raise HashingBusy
+
+    monkeypatch.setattr(password_hasher, 'verify_and_update_async', busy)
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_login_rehashes_outdated_password(client, session, user):
+    weak = PasswordHash((Argon2Hasher(time_cost=1, memory_cost=8192),))
+    user.password = weak.hash(user.clean_password)
+    session.commit()
+    old_hash = user.password
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+    new_hash = session.scalar(
+        select(User.password).where(User.id == user.id)
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert new_hash != old_hash
+    assert password_hasher.context.verify(user.clean_password, new_hash)
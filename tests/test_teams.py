@@ -0,0 +1,243 @@
+import json
+from http import HTTPStatus
+
+import httpx
+
+HEADERS = {'Authorization': 'Bearer graph-token'}
+
+
+def test_list_chats(client, graph):
+    graph.add('GET', '/me/chats', httpx.Response(200, json={'value': []}))
+
+    response = client.get('/mc/list-chats', headers=HEADERS)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'value': []}
+    assert graph.requests[0].headers['Authorization'] == 'Bearer graph-token'
+
+
+def test_list_teams_adds_bearer_prefix(client, graph):
+    graph.add('GET', '/me/joinedTeams', httpx.Response(200, json={}))
+
+    client.get('/mc/list-teams', headers={'Authorization': 'raw-token'})
+
+    assert graph.requests[0].headers['Authorization'] == 'Bearer raw-token'
+
+
+def test_list_chats_without_token(client, graph):
+    response = client.get('/mc/list-chats')
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert graph.requests == []
+
+
+def test_list_channels_error(client, graph):
+    graph.add(
+        'GET',
+        '/teams/42/channels',
+        httpx.Response(403, json={'error': 'forbidden'}),
+    )
+
+    response = client.get('/mc/list-channels?team_id=42', headers=HEADERS)
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert response.json() == {
+        'detail': "Erro ao listar canais: {'error': 'forbidden'}"
+    }
+
+
+def test_send_message_retries_on_throttling(client, graph):
+    expected_requests = 3
+    graph.add(
+        'POST',
+        '/chats/1/messages',
+        httpx.Response(429, headers={'Retry-After': '0'}),
+        httpx.Response(503),
+        httpx.Response(201, json={'id': 'msg'}),
+    )
+
+    response = client.post(
+        '/mc/send-message',
+        headers=HEADERS,
+        json={'chat_id': '1', 'message': 'oi'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'message': 'Mensagem enviada com sucesso.'}
+    assert len(graph.requests) == expected_requests
+
+
+def test_send_message_gives_up_after_max_retries(client, graph):
+    graph.add('POST', '/chats/1/messages', httpx.Response(503, json={}))
+
+    response = client.post(
+        '/mc/send-message',
+        headers=HEADERS,
+        json={'chat_id': '1', 'message': 'oi'},
+    )
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+
+
+def batch_responder(throttled=()):
+    """Responde ao $batch ecoando cada item (429 para os `throttled`)."""
+
+    def respond(request: httpx.Request):
+        items = json.loads(request.content)['requests']
+        responses = []
+        for item in items:
+            chat_id = item['url'].split('/')[2]
+            status, headers = HTTPStatus.OK, {}
+            if chat_id in throttled:
+                throttled.remove(chat_id)
+                status = HTTPStatus.TOO_MANY_REQUESTS
+                headers = {'Retry-After': '0'}
+            elif chat_id == 'missing':
+                status = HTTPStatus.NOT_FOUND
+            elif item['method'] == 'POST':
+                status = HTTPStatus.CREATED
+            responses.append({
+                'id': item['id'],
+                'status': status,
+                'headers': headers,
+                'body': {'chat': chat_id},
+            })
+        return httpx.Response(200, json={'responses': responses[::-1]})
+
+    return respond
+
+
+def test_batch_receive_messages_groups_requests(client, graph):
+    expected_batches = 3
+    chat_ids = [str(i) for i in range(45)]
+    graph.add('POST', '/$batch', batch_responder())
+
+    response = client.post(
+        '/mc/batch/receive-messages',
+        headers=HEADERS,
+        json={'chat_ids': chat_ids},
+    )
+    results = response.json()['results']
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(graph.requests) == expected_batches
+    assert [r['chat_id'] for r in results] == chat_ids
+    assert all(r['body'] == {'chat': r['chat_id']} for r in results)
+
+
+def test_batch_send_message_reports_per_item_errors(client, graph):
+    throttled = ['b']
+    graph.add('POST', '/$batch', batch_responder(throttled))
+
+    response = client.post(
+        '/mc/batch/send-message',
+        headers=HEADERS,
+        json={'chat_ids': ['a', 'b', 'missing'], 'message': 'oi'},
+    )
+    results = response.json()['results']
+
+    assert [r['status'] for r in results] == [
+        HTTPStatus.CREATED,
+        HTTPStatus.CREATED,
+        HTTPStatus.NOT_FOUND,
+    ]
+    assert results[2]['error'] == {'chat': 'missing'}
+    assert throttled == []
+
+
+def test_batch_send_message_survives_transport_error(client, graph):
+    expected_batches = 3
+    chat_ids = [str(i) for i in range(60)]
+    respond = batch_responder()
+
+    def flaky(request: httpx.Request):
+        items = json.loads(request.content)['requests']
+        # O segundo lote (chats 20 a 39) cai na rede
+        if items[0]['url'] == '/chats/20/messages':
+            raise httpx.ConnectError('connection reset', request=request)
+        return respond(request)
+
+    graph.add('POST', '/$batch', flaky)
+
+    response = client.post(
+        '/mc/batch/send-message',
+        headers=HEADERS,
+        json={'chat_ids': chat_ids, 'message': 'oi'},
+    )
+    results = response.json()['results']
+    failed = [r for r in results if r['status'] == HTTPStatus.BAD_GATEWAY]
+
+    assert response.status_code == HTTPStatus.OK
+    # Sem reenvio do lote que falhou: nada de mensagem duplicada
+    assert len(graph.requests) == expected_batches
+    assert [r['chat_id'] for r in failed] == chat_ids[20:40]
+    assert failed[0]['error']['error']['code'] == 'transportError'
+    assert all(
+        r['status'] == HTTPStatus.CREATED
+        for r in results[:20] + results[40:]
+    )
+
+
+def test_list_chats_stream_follows_next_link(client, graph):
+    graph.add(
+        'GET',
+        '/me/chats',
+        httpx.Response(
+            200,
+            json={
+                'value': [{'id': 1}, {'id': 2}],
+                '@odata.nextLink': 'https://graph.test/me/chats?page=2',
+            },
+        ),
+        httpx.Response(200, json={'value': [{'id': 3}]}),
+    )
+
+    response = client.get('/mc/list-chats?stream=true', headers=HEADERS)
+    items = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert items == [{'id': 1}, {'id': 2}, {'id': 3}]
+
+
+def test_list_teams_stream_max_items(client, graph):
+    graph.add(
+        'GET',
+        '/me/joinedTeams',
+        httpx.Response(
+            200,
+            json={
+                'value': [{'id': 1}, {'id': 2}],
+                '@odata.nextLink': 'https://graph.test/me/joinedTeams?p=2',
+            },
+        ),
+    )
+
+    response = client.get(
+        '/mc/list-teams?stream=true&max_items=3', headers=HEADERS
+    )
+    items = [json.loads(line) for line in response.text.splitlines()]
+
+    assert items == [{'id': 1}, {'id': 2}, {'id': 1}]
+
+
+def test_list_chats_stream_error_mid_stream(client, graph):
+    graph.add(
+        'GET',
+        '/me/chats',
+        httpx.Response(
+            200,
+            json={
+                'value': [{'id': 1}],
+                '@odata.nextLink': 'https://graph.test/me/chats?page=2',
+            },
+        ),
+        httpx.Response(403, json={'error': 'forbidden'}),
+    )
+
+    response = client.get('/mc/list-chats?stream=true', headers=HEADERS)
+    items = [json.loads(line) for line in response.text.splitlines()]
+
+    assert items == [
+        {'id': 1},
+        {'error': {'status': 403, 'detail': {'error': 'forbidden'}}},
+    ]
@@ -1,10 +1,22 @@
+import csv
+import io
+import json
 from http import HTTPStatus
 
-from api.control.models.models import TodoState
+import pytest
+from sqlalchemy import func, select
+
+from api.control.models.models import Todo, TodoState
+from api.control.routers import todos
+from api.control.settings.settings import get_settings
 from tests.factories import TodoFactory
 
+ULID_LENGTH = 26
+
 
-def test_create_todo(client, token):
+def test_create_todo(client, token, queries):
+    expected_queries = 4
+    queries.clear()
     response = client.post(
         '/todos/',
         headers={'Authorization': f'Bearer {token}'},
@@ -14,12 +26,48 @@ def test_create_todo(client, token):
             'state': 'draft',
         },
     )
-    assert response.json() == {
-        'id': 1,
+    data = response.json()
+    assert len(data.pop('id')) == ULID_LENGTH
+    assert data == {
         'title': 'Test todo',
         'description': 'Test todo description',
         'state': 'draft',
     }
+    # Identidade + INSERT + contagem por estado + versão da listagem; nada
+    # de SELECT depois do commit
+    assert len(queries) == expected_queries
+    assert queries[-3].startswith('INSERT INTO todos')
+    assert queries[-2].startswith('INSERT INTO todo_counts')
+    assert queries[-1].startswith('INSERT INTO change_versions')
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def response_class(request, monkeypatch):
+    monkeypatch.setattr(get_settings(), 'JSON_RESPONSE_CLASS', request.param)
+    return request.param
+
+
+@pytest.mark.usefixtures('response_class')
+def test_list_todos_returns_public_fields(session, client, user, token):
+    todo = TodoFactory(user_id=user.id, state=TodoState.doing)
+    session.add(todo)
+    session.commit()
+
+    response = client.get(
+        '/todos/',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.headers['content-type'] == 'application/json'
+    assert response.json() == {
+        'todos': [{
+            'id': todo.id,
+            'title': todo.title,
+            'description': todo.description,
+            'state': 'doing',
+        }],
+        'next_cursor': None,
+    }
 
 
 def test_list_todos_should_return_5_todos(session, client, user, token):
@@ -50,6 +98,37 @@ def test_list_todos_pagination_should_return_2_todos(
     assert len(response.json()['todos']) == expected_todos
 
 
+def test_list_todos_cursor_should_walk_all_pages(
+    session, user, client, token
+):
+    expected_todos = 5
+    session.bulk_save_objects(TodoFactory.create_batch(5, user_id=user.id))
+    session.commit()
+
+    headers = {'Authorization': f'Bearer {token}'}
+    seen = []
+    url = '/todos/?limit=2'
+    while url:
+        response = client.get(url, headers=headers)
+        data = response.json()
+        seen.extend(todo['id'] for todo in data['todos'])
+        cursor = data['next_cursor']
+        url = f'/todos/?limit=2&after={cursor}' if cursor else None
+
+    assert len(seen) == expected_todos
+    assert seen == sorted(set(seen))
+
+
+def test_list_todos_invalid_cursor(client, token):
+    response = client.get(
+        '/todos/?after=%%%',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor.'}
+
+
 def test_list_todos_filter_title_should_return_5_todos(
     session, user, client, token
 ):
@@ -134,6 +213,39 @@ def test_list_todos_filter_combined_should_return_5_todos(
     assert len(response.json()['todos']) == expected_todos
 
 
+def test_list_todos_full_text_search_should_rank_results(
+    session, user, client, token
+):
+    expected_todos = 2
+    session.bulk_save_objects([
+        TodoFactory(user_id=user.id, title='deploy', description='deploy'),
+        TodoFactory(user_id=user.id, title='deploy', description='review'),
+        TodoFactory(user_id=user.id, title='lunch', description='lunch'),
+    ])
+    session.commit()
+
+    response = client.get(
+        '/todos/?q=deploy',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    todos = response.json()['todos']
+
+    assert len(todos) == expected_todos
+    assert todos[0]['description'] == 'deploy'
+
+
+def test_list_todos_full_text_search_with_cursor(client, token):
+    response = client.get(
+        '/todos/?q=deploy&after=MQ',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {
+        'detail': 'Cursor pagination is not available with q.'
+    }
+
+
 def test_patch_todo_error(client, token):
     response = client.patch(
         '/todos/10',
@@ -144,12 +256,14 @@ def test_patch_todo_error(client, token):
     assert response.json() == {'detail': 'Task not found.'}
 
 
-def test_patch_todo(session, client, user, token):
+def test_patch_todo(session, client, user, token, queries):
+    expected_queries = 4
     todo = TodoFactory(user_id=user.id)
 
     session.add(todo)
     session.commit()
 
+    queries.clear()
     response = client.patch(
         f'/todos/{todo.id}',
         json={'title': 'teste!'},
@@ -157,6 +271,9 @@ def test_patch_todo(session, client, user, token):
     )
     assert response.status_code == HTTPStatus.OK
     assert response.json()['title'] == 'teste!'
+    assert len(queries) == expected_queries
+    assert queries[-2].startswith('UPDATE todos')
+    assert queries[-1].startswith('INSERT INTO change_versions')
 
 
 def test_delete_todo(session, client, user, token):
@@ -182,3 +299,300 @@ def test_delete_todo_error(client, token):
 
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert response.json() == {'detail': 'Task not found.'}
+
+
+def test_bulk_create_todos(session, client, user, token):
+    todos = [
+        {'title': f'todo {i}', 'description': 'bulk', 'state': 'todo'}
+        for i in range(3)
+    ]
+
+    response = client.post(
+        '/todos/bulk',
+        json={'todos': todos},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    results = response.json()['results']
+    assert [item['status'] for item in results] == ['created'] * 3
+    assert [item['todo']['title'] for item in results] == [
+        'todo 0',
+        'todo 1',
+        'todo 2',
+    ]
+    assert all(item['id'] == item['todo']['id'] for item in results)
+
+    count = session.scalar(
+        select(func.count()).select_from(Todo).where(Todo.user_id == user.id)
+    )
+    assert count == len(todos)
+
+
+def test_bulk_create_todos_empty(client, token):
+    response = client.post(
+        '/todos/bulk',
+        json={'todos': []},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_bulk_update_todos(session, client, user, other_user, token):
+    mine = TodoFactory.create_batch(2, user_id=user.id)
+    theirs = TodoFactory(user_id=other_user.id)
+    theirs.state = TodoState.todo
+    session.add_all([*mine, theirs])
+    session.commit()
+    ids = [mine[0].id, theirs.id, 'missing', mine[1].id]
+
+    response = client.patch(
+        '/todos/bulk',
+        json={'ids': ids, 'changes': {'state': 'done'}},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    results = response.json()['results']
+    assert [item['id'] for item in results] == ids
+    assert [item['status'] for item in results] == [
+        'updated',
+        'not_found',
+        'not_found',
+        'updated',
+    ]
+    assert results[0]['todo']['state'] == 'done'
+
+    state = session.scalar(select(Todo.state).where(Todo.id == theirs.id))
+    assert state == TodoState.todo
+
+
+def test_bulk_update_todos_without_changes(client, token):
+    response = client.patch(
+        '/todos/bulk',
+        json={'ids': ['1'], 'changes': {}},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'No changes to apply.'}
+
+
+@pytest.mark.parametrize('field', ['title', 'description', 'state'])
+def test_bulk_update_todos_rejects_null(session, client, user, token, field):
+    todo = TodoFactory(user_id=user.id)
+    session.add(todo)
+    session.commit()
+
+    response = client.patch(
+        '/todos/bulk',
+        json={'ids': [todo.id], 'changes': {field: None}},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    session.refresh(todo)
+    assert getattr(todo, field) is not None
+
+
+def test_patch_todo_rejects_null(session, client, user, token):
+    todo = TodoFactory(user_id=user.id)
+    session.add(todo)
+    session.commit()
+
+    response = client.patch(
+        f'/todos/{todo.id}',
+        json={'state': None},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_bulk_delete_todos(session, client, user, other_user, token):
+    mine = TodoFactory.create_batch(2, user_id=user.id)
+    theirs = TodoFactory(user_id=other_user.id)
+    session.add_all([*mine, theirs])
+    session.commit()
+    ids = [mine[0].id, mine[1].id, theirs.id]
+
+    response = client.request(
+        'DELETE',
+        '/todos/bulk',
+        json={'ids': ids},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['results'] == [
+        {'id': mine[0].id, 'status': 'deleted', 'todo': None},
+        {'id': mine[1].id, 'status': 'deleted', 'todo': None},
+        {'id': theirs.id, 'status': 'not_found', 'todo': None},
+    ]
+
+    remaining = session.scalars(select(Todo.id)).all()
+    assert remaining == [theirs.id]
+
+
+def test_export_todos_ndjson(session, client, user, other_user, token):
+    session.bulk_save_objects(TodoFactory.create_batch(5, user_id=user.id))
+    session.bulk_save_objects(
+        TodoFactory.create_batch(2, user_id=other_user.id)
+    )
+    session.commit()
+    expected_todos = 5
+
+    response = client.get(
+        '/todos/export', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    todos = [json.loads(line) for line in response.text.splitlines()]
+    assert len(todos) == expected_todos
+    assert [todo['id'] for todo in todos] == sorted(
+        todo['id'] for todo in todos
+    )
+    assert set(todos[0]) == {'id', 'title', 'description', 'state'}
+
+
+def test_export_todos_csv_with_filter(session, client, user, token):
+    session.bulk_save_objects(
+        TodoFactory.create_batch(3, user_id=user.id, state=TodoState.done)
+    )
+    session.bulk_save_objects(
+        TodoFactory.create_batch(2, user_id=user.id, state=TodoState.todo)
+    )
+    session.commit()
+    expected_todos = 3
+
+    response = client.get(
+        '/todos/export?format=csv&state=done',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/csv')
+    assert 'todos.csv' in response.headers['content-disposition']
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == expected_todos
+    assert {row['state'] for row in rows} == {'done'}
+
+
+def test_export_todos_streams_in_chunks(
+    session, client, user, token, monkeypatch
+):
+    chunks = []
+    export_lines = todos.export_lines
+
+    def spy(rows, export_format):
+        chunks.append(len(rows))
+        return export_lines(rows, export_format)
+
+    monkeypatch.setattr(todos, 'EXPORT_CHUNK_SIZE', 2)
+    monkeypatch.setattr(todos, 'export_lines', spy)
+    session.bulk_save_objects(TodoFactory.create_batch(5, user_id=user.id))
+    session.commit()
+
+    response = client.get(
+        '/todos/export', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert len(response.text.splitlines()) == sum(chunks)
+    assert chunks == [2, 2, 1]
+
+
+def test_export_todos_invalid_format(client, token):
+    response = client.get(
+        '/todos/export?format=xml',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_export_todos_invalid_state(client, token):
+    response = client.get(
+        '/todos/export?state=foo',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def counts_in_db(session, user_id) -> dict[str, int]:
+    rows = session.execute(
+        select(Todo.state, func.count())
+        .where(Todo.user_id == user_id)
+        .group_by(Todo.state)
+    )
+    counts = dict.fromkeys((state.value for state in TodoState), 0)
+    counts.update({state.value: count for state, count in rows})
+    return counts
+
+
+def test_todo_summary_without_todos(client, token):
+    response = client.get(
+        '/todos/summary', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'counts': {state.value: 0 for state in TodoState},
+        'total': 0,
+    }
+
+
+def test_todo_summary_follows_every_write(session, client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    first = client.post(
+        '/todos/',
+        headers=headers,
+        json={'title': 'a', 'description': 'a', 'state': 'todo'},
+    ).json()
+    bulk = client.post(
+        '/todos/bulk',
+        headers=headers,
+        json={
+            'todos': [
+                {'title': str(i), 'description': 'x', 'state': state}
+                for i, state in enumerate(['todo', 'doing', 'doing', 'done'])
+            ]
+        },
+    ).json()
+    bulk_ids = [item['id'] for item in bulk['results']]
+
+    client.patch(
+        f'/todos/{first["id"]}', headers=headers, json={'state': 'done'}
+    )
+    client.patch(
+        f'/todos/{first["id"]}', headers=headers, json={'title': 'b'}
+    )
+    client.request(
+        'PATCH',
+        '/todos/bulk',
+        headers=headers,
+        json={'ids': bulk_ids[:3], 'changes': {'state': 'trash'}},
+    )
+    client.request(
+        'DELETE',
+        '/todos/bulk',
+        headers=headers,
+        json={'ids': [bulk_ids[0], 'missing']},
+    )
+    client.delete(f'/todos/{bulk_ids[3]}', headers=headers)
+
+    response = client.get('/todos/summary', headers=headers)
+
+    expected = {'draft': 0, 'todo': 0, 'doing': 0, 'done': 1, 'trash': 2}
+    assert counts_in_db(session, user.id) == expected
+    assert response.json() == {'counts': expected, 'total': 3}
+
+
+def test_todo_summary_does_not_scan_todos(client, token, queries):
+    queries.clear()
+    client.get('/todos/summary', headers={'Authorization': f'Bearer {token}'})
+
+    assert not [query for query in queries if 'FROM todos' in query]
+    assert any('FROM todo_counts' in query for query in queries)
@@ -0,0 +1,94 @@
+import threading
+import time
+
+from cryptography.fernet import Fernet
+
+from api.control.graph.token_manager import PersistentTokenCache, TokenManager
+
+
+class FakeMsalApp:
+    def __init__(self, expires_in=3600):
+        self.expires_in = expires_in
+        self.accounts = []
+        self.password_calls = 0
+        self.silent_calls = 0
+
+    def get_accounts(self, username=None):
+        return self.accounts
+
+    def acquire_token_silent(self, scopes, account, force_refresh=False):
+        self.silent_calls += 1
+        return {'access_token': 'silent', 'expires_in': self.expires_in}
+
+    def acquire_token_by_username_password(self, scopes, username, password):
+        self.password_calls += 1
+        time.sleep(0.05)
+        self.accounts = [{'username': username}]
+        return {'access_token': 'password', 'expires_in': self.expires_in}
+
+
+def make_manager(app, cache=None):
+    return TokenManager(
+        app,
+        cache or PersistentTokenCache(),
+        scopes=['User.Read'],
+        username='bot@test.com',
+        password='secret',
+    )
+
+
+def test_token_manager_single_flight():
+    app = FakeMsalApp()
+    manager = make_manager(app)
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(manager.get_token()))
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    manager.close()
+
+    assert app.password_calls == 1
+    assert {r['access_token'] for r in results} == {'password'}
+
+
+def test_token_manager_uses_silent_after_first_login():
+    app = FakeMsalApp(expires_in=0)
+    manager = make_manager(app)
+
+    manager.get_token()
+    token = manager.get_token()
+    manager.close()
+
+    assert token['access_token'] == 'silent'
+    assert app.password_calls == 1
+    assert app.silent_calls == 1
+
+
+def test_token_manager_background_refresh():
+    app = FakeMsalApp(expires_in=1)
+    manager = make_manager(app)
+    manager.refresh_margin = 0
+
+    manager.get_token()
+    time.sleep(1.5)
+    manager.close()
+
+    assert app.silent_calls >= 1
+
+
+def test_persistent_token_cache_encrypted(tmp_path):
+    path = tmp_path / 'msal_cache.bin'
+    key = Fernet.generate_key()
+
+    cache = PersistentTokenCache(str(path), encryption_key=key)
+    cache.has_state_changed = True
+    cache.save()
+
+    assert b'AccessToken' not in path.read_bytes()
+    reloaded = PersistentTokenCache(str(path), encryption_key=key)
+    assert reloaded.serialize() == cache.serialize()
@@ -2,8 +2,11 @@ from http import HTTPStatus
 
 from api.control.schemas.users_schemas import UserPublic
 
+ULID_LENGTH = 26
 
-def test_create_user(client):
+
+def test_create_user(client, queries):
+    expected_queries = 3
     response = client.post(
         '/users/',
         json={
@@ -12,27 +15,48 @@ def test_create_user(client):
             'password': 'secret',
         },
     )
+    data = response.json()
     assert response.status_code == HTTPStatus.CREATED
-    assert response.json() == {
+    assert len(data.pop('id')) == ULID_LENGTH
+    assert data == {
         'username': 'alice',
         'email': 'alice@example.com',
-        'id': 1,
     }
+    # Checagem de duplicados + INSERT ... RETURNING + versão da listagem,
+    # sem refresh
+    assert len(queries) == expected_queries
+    assert queries[-2].startswith('INSERT INTO users')
+    assert 'RETURNING' in queries[-2]
+    assert "nextval('users_version_seq')" in queries[-1]
 
 
 def test_read_users(client):
     response = client.get('/users')
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'users': []}
+    assert response.json() == {'users': [], 'next_cursor': None}
 
 
 def test_read_users_with_users(client, user):
     user_schema = UserPublic.model_validate(user).model_dump()
     response = client.get('/users/')
-    assert response.json() == {'users': [user_schema]}
+    assert response.json() == {'users': [user_schema], 'next_cursor': None}
+
+
+def test_read_users_with_cursor(client, user, other_user):
+    response = client.get('/users/?limit=1')
+    first_page = response.json()
+
+    response = client.get(f'/users/?limit=1&after={first_page["next_cursor"]}')
+    second_page = response.json()
+
+    assert [u['id'] for u in first_page['users']] == [user.id]
+    assert [u['id'] for u in second_page['users']] == [other_user.id]
+    assert second_page['next_cursor'] is None
 
 
-def test_update_user(client, user, token):
+def test_update_user(client, user, token, queries):
+    expected_queries = 3
+    queries.clear()
     response = client.put(
         f'/users/{user.id}',
         headers={'Authorization': f'Bearer {token}'},
@@ -48,6 +72,9 @@ def test_update_user(client, user, token):
         'email': 'bob@example.com',
         'id': user.id,
     }
+    assert len(queries) == expected_queries
+    assert queries[-2].startswith('UPDATE users')
+    assert "nextval('users_version_seq')" in queries[-1]
 
 
 def test_delete_user(client, user, token):
@@ -0,0 +1,200 @@
+import asyncio
+from http import HTTPStatus
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from api.app import app
+from api.control.graph.client import get_graph_client
+from api.control.models.models import WebhookEvent, WebhookStatus
+from api.control.webhooks.queue import WebhookWorkerPool, notification_id
+
+WELCOME = {
+    'id': 'notification-1',
+    'clientState': 'test-client-state',
+    'message': {'body': {'content': 'Ativar Boas Vindas'}},
+    'conversation': {'id': '42'},
+}
+
+
+@pytest.fixture
+def pool(engine, graph):
+    def make_pool(**kwargs):
+        return WebhookWorkerPool(
+            lambda: Session(engine),
+            app.dependency_overrides[get_graph_client],
+            lambda: 'Bearer service-token',
+            backoff=60,
+            **kwargs,
+        )
+
+    return make_pool
+
+
+def events(session):
+    session.expire_all()
+    return session.scalars(select(WebhookEvent)).all()
+
+
+def test_webhook_is_enqueued(client, session):
+    response = client.post('/mc/webhook', json=WELCOME)
+
+    assert response.status_code == HTTPStatus.ACCEPTED
+    assert response.json() == {'status': 'queued'}
+
+    [event] = events(session)
+    assert event.notification_id == 'notification-1'
+    assert event.status == WebhookStatus.pending
+    assert event.payload == WELCOME
+
+
+def test_webhook_duplicate_is_ignored(client, session):
+    client.post('/mc/webhook', json=WELCOME)
+    response = client.post('/mc/webhook', json=WELCOME)
+
+    assert response.status_code == HTTPStatus.ACCEPTED
+    assert response.json() == {'status': 'duplicate'}
+    assert len(events(session)) == 1
+
+
+def test_webhook_without_id_is_deduplicated_by_body():
+    payload = {'b': 1, 'a': [1, 2]}
+
+    assert notification_id(payload) == notification_id({'a': [1, 2], 'b': 1})
+    assert notification_id(payload) != notification_id({'a': [1], 'b': 1})
+
+
+def test_webhook_validation_handshake(client):
+    response = client.post('/mc/webhook?validationToken=abc%20123')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.text == 'abc 123'
+
+
+def test_webhook_empty_payload(client):
+    response = client.post('/mc/webhook', json={})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize(
+    'payload',
+    [
+        {**WELCOME, 'clientState': 'outro'},
+        {**WELCOME, 'clientState': None},
+        {**WELCOME, 'conversation': {}},
+        {**WELCOME, 'conversation': {'id': 42}},
+        {**WELCOME, 'message': 'Ativar Boas Vindas'},
+    ],
+)
+def test_webhook_invalid_payload_is_rejected(client, session, payload):
+    response = client.post('/mc/webhook', json=payload)
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert events(session) == []
+
+
+def test_worker_sends_welcome_message(client, session, graph, pool):
+    graph.add('POST', '/chats/42/messages', httpx.Response(201, json={}))
+    client.post('/mc/webhook', json=WELCOME)
+
+    processed = asyncio.run(pool().run_once())
+
+    assert processed == 1
+    [event] = events(session)
+    assert event.status == WebhookStatus.done
+    assert event.attempts == 1
+    request = graph.requests[0]
+    assert request.headers['Authorization'] == 'Bearer service-token'
+
+
+def test_worker_ignores_other_messages(client, session, graph, pool):
+    client.post(
+        '/mc/webhook',
+        json={'id': 'n2', 'clientState': WELCOME['clientState'], 'value': []},
+    )
+
+    asyncio.run(pool().run_once())
+
+    [event] = events(session)
+    assert event.status == WebhookStatus.done
+    assert graph.requests == []
+
+
+def test_worker_schedules_retry(client, session, graph, pool):
+    graph.add('POST', '/chats/42/messages', httpx.Response(500, json={}))
+    client.post('/mc/webhook', json=WELCOME)
+
+    worker = pool(max_attempts=3)
+    asyncio.run(worker.run_once())
+
+    [event] = events(session)
+    assert event.status == WebhookStatus.pending
+    assert event.attempts == 1
+    assert 'GraphError' in event.last_error
+    assert event.next_attempt_at > event.created_at
+
+    # O backoff adia a próxima tentativa
+    assert asyncio.run(worker.run_once()) == 0
+
+
+def test_worker_moves_to_dead_letter(client, session, graph, pool):
+    graph.add('POST', '/chats/42/messages', httpx.Response(500, json={}))
+    client.post('/mc/webhook', json=WELCOME)
+
+    asyncio.run(pool(max_attempts=1).run_once())
+
+    [event] = events(session)
+    assert event.status == WebhookStatus.dead
+
+
+def test_worker_does_not_retry_client_errors(client, session, graph, pool):
+    graph.add('POST', '/chats/42/messages', httpx.Response(404, json={}))
+    client.post('/mc/webhook', json=WELCOME)
+
+    asyncio.run(pool(max_attempts=3).run_once())
+
+    [event] = events(session)
+    assert event.status == WebhookStatus.dead
+    assert event.attempts == 1
+
+
+def test_worker_does_not_retry_malformed_payloads(session, graph, pool):
+    # Evento gravado antes da validação na entrada
+    session.add(
+        WebhookEvent(
+            notification_id='n3',
+            payload={'message': {'body': {'content': 'Ativar Boas Vindas'}}},
+        )
+    )
+    session.commit()
+
+    asyncio.run(pool(max_attempts=3).run_once())
+
+    [event] = events(session)
+    assert event.status == WebhookStatus.dead
+    assert event.attempts == 1
+    assert 'KeyError' in event.last_error
+    assert graph.requests == []
+
+
+def test_worker_pool_start_and_stop(client, session, graph, pool):
+    graph.add('POST', '/chats/42/messages', httpx.Response(201, json={}))
+    client.post('/mc/webhook', json=WELCOME)
+
+    async def run():
+        worker = pool(workers=2, poll_interval=0.01)
+        worker.start()
+        for _ in range(100):
+            await asyncio.sleep(0.05)
+            if graph.requests:
+                break
+        await worker.stop()
+
+    asyncio.run(run())
+
+    [event] = events(session)
+    assert event.status == WebhookStatus.done
+    assert len(graph.requests) == 1